@@ -0,0 +1,201 @@
+"""Analytics event writing.
+
+`record_event` is the single entry point views use. When
+`settings.ANALYTICS_BUFFER["ENABLED"]` is true, events are queued in-process
+and a background thread `bulk_create`s them once the batch reaches
+`MAX_SIZE` or `FLUSH_INTERVAL` seconds pass; otherwise each event is written
+synchronously, as before. Every written batch is also added to the hourly
+and daily rollups (see `analytics.rollups`).
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from . import rollups
+from .models import AnalyticsRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    "MAX_SIZE": 500,
+    "FLUSH_INTERVAL": 2.0,
+}
+
+
+def get_buffer_settings():
+    return {**DEFAULTS, **getattr(settings, "ANALYTICS_BUFFER", {})}
+
+
+def _bulk_write(records):
+    """Insert a batch; if the batch fails, retry row by row so one bad event doesn't drop the rest.
+
+    Each attempt runs in its own savepoint: on the synchronous path this is
+    called inside the request's transaction (e.g. a bulk task move), which
+    a failed INSERT must not abort.
+    """
+    if not records:
+        return
+    try:
+        with transaction.atomic():
+            AnalyticsRecord.objects.bulk_create(records, batch_size=len(records))
+    except Exception:
+        logger.exception("Bulk analytics insert failed; retrying %d records individually", len(records))
+        for record in records:
+            _save(record)
+    _apply_rollups(records)
+
+
+def _save(record):
+    try:
+        with transaction.atomic():
+            record.save(force_insert=True)
+    except Exception:
+        logger.exception("Dropping analytics record %s", record.action)
+        # Unsaved, so the rollups skip it
+        record.pk = None
+        return False
+    return True
+
+
+def _apply_rollups(records):
+    # Unsaved records are skipped; `rebuild_analytics_rollups` repairs any miss.
+    # apply_records writes inside its own savepoint, so a failure here leaves
+    # the caller's transaction usable.
+    try:
+        rollups.apply_records(records)
+    except Exception:
+        logger.exception("Updating analytics rollups failed for %d records", len(records))
+
+
+class AnalyticsBuffer:
+    """Queue + background flusher for AnalyticsRecord inserts."""
+
+    def __init__(self, max_size=500, flush_interval=2.0):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def put(self, record):
+        self._ensure_started()
+        self._queue.put(record)
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.max_size:
+                _bulk_write(batch)
+                batch = []
+        _bulk_write(batch)
+
+    def stop(self, timeout=5.0):
+        """Stop the flusher thread and write whatever is still queued."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def _ensure_started(self):
+        # Restart after fork (e.g. preloading WSGI servers): threads don't survive it
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="analytics-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch:
+                close_old_connections()
+                _bulk_write(batch)
+        close_old_connections()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Process-wide buffer, or None when buffering is disabled."""
+    global _buffer
+    conf = get_buffer_settings()
+    if not conf["ENABLED"]:
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = AnalyticsBuffer(max_size=conf["MAX_SIZE"], flush_interval=conf["FLUSH_INTERVAL"])
+                atexit.register(_buffer.stop)
+    return _buffer
+
+
+def flush_analytics():
+    """Flush-on-shutdown hook: synchronously write all buffered events."""
+    if _buffer is not None:
+        _buffer.stop()
+
+
+def record_event(user, action, details=None):
+    """Record an analytics event for a UserProfile.
+
+    Buffered events are queued only once the surrounding transaction commits,
+    so rolled-back requests don't leave analytics behind.
+    """
+    if user is None:
+        return
+    record = AnalyticsRecord(user=user, action=action, details=details)
+    buf = get_buffer()
+    if buf is None:
+        if _save(record):
+            _apply_rollups([record])
+        return
+    transaction.on_commit(lambda: buf.put(record))
+
+
+def record_events(user, action, details_list):
+    """Record many events of one action at once (a single INSERT on the synchronous path)."""
+    if user is None or not details_list:
+        return
+    records = [AnalyticsRecord(user=user, action=action, details=details) for details in details_list]
+    buf = get_buffer()
+    if buf is None:
+        _bulk_write(records)
+        return
+
+    def enqueue():
+        for record in records:
+            buf.put(record)
+
+    transaction.on_commit(enqueue)
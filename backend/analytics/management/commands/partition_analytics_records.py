@@ -0,0 +1,27 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics import partitioning
+
+
+class Command(BaseCommand):
+    help = "Range-partition the analytics event table by month (PostgreSQL), or create upcoming partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=3, help="Future monthly partitions to keep created.")
+        parser.add_argument("--ensure-only", action="store_true", help="Only create missing upcoming partitions.")
+        parser.add_argument("--drop-old", action="store_true", help="Drop the unpartitioned copy after converting.")
+
+    def handle(self, *args, **opts):
+        try:
+            partitioning.check_supported()
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc)) from exc
+        if partitioning.is_partitioned():
+            partitioning.ensure_partitions(opts["months_ahead"])
+            self.stdout.write(self.style.SUCCESS(f"Partitions exist through {opts['months_ahead']} months ahead."))
+            return
+        if opts["ensure_only"]:
+            raise CommandError("The analytics table isn't partitioned yet; run without --ensure-only first.")
+        copied = partitioning.partition_table(opts["months_ahead"], drop_old=opts["drop_old"])
+        self.stdout.write(self.style.SUCCESS(f"Partitioned the analytics table by month ({copied} events copied)."))
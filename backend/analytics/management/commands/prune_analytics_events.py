@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from analytics import retention
+
+
+class Command(BaseCommand):
+    help = "Archive raw analytics events past the retention window to gzipped JSONL, then delete them in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help='Override ANALYTICS_RETENTION["DAYS"].')
+        parser.add_argument("--batch-size", type=int, help="Events archived and deleted per transaction.")
+        parser.add_argument("--archive-dir", help='Override ANALYTICS_RETENTION["ARCHIVE_DIR"].')
+        parser.add_argument("--no-archive", action="store_true", help="Delete without writing archive files.")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many events are past retention.")
+
+    def handle(self, *args, **opts):
+        pruned = retention.prune(
+            days=opts["days"],
+            batch_size=opts["batch_size"],
+            archive_dir=opts["archive_dir"],
+            archive=not opts["no_archive"],
+            pause=opts["pause"],
+            dry_run=opts["dry_run"],
+            log=self.stdout.write,
+        )
+        cutoff = retention.cutoff(opts["days"]).isoformat()
+        if opts["dry_run"]:
+            self.stdout.write(f"{pruned} events are older than {cutoff}.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} events older than {cutoff}."))
@@ -0,0 +1,33 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from analytics import rollups
+from analytics.models import AnalyticsRecord, AnalyticsRollup
+
+
+class Command(BaseCommand):
+    help = "Recount the hourly/daily AnalyticsRollup rows from the raw analytics records."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Only rebuild buckets from this date (YYYY-MM-DD) on.")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Records rolled up per write.")
+
+    def handle(self, *args, **opts):
+        since = None
+        if opts["since"]:
+            day = parse_date(opts["since"])
+            if day is None:
+                raise CommandError("--since must be a date (YYYY-MM-DD)")
+            since = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+        records = AnalyticsRecord.objects.all()
+        if since is not None:
+            records = records.filter(timestamp__gte=rollups.bucket_start(since, "day"))
+        count = records.count()
+        # Buckets older than the oldest raw record are left alone (see rollups.rebuild)
+        rollups.rebuild(since=since, batch_size=opts["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up {count} records into {AnalyticsRollup.objects.count()} buckets."
+        ))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+import tasks.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('analytics', '0002_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        tasks.operations.AddIndexConcurrently(
+            model_name='analyticsrecord',
+            index=models.Index(fields=['user', '-timestamp'], name='analytics_user_ts_idx'),
+        ),
+        tasks.operations.AddIndexConcurrently(
+            model_name='analyticsrecord',
+            index=models.Index(fields=['action', '-timestamp'], name='analytics_action_ts_idx'),
+        ),
+    ]
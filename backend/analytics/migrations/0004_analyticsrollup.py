@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_user_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('user', 'User'), ('project', 'Project'), ('sprint', 'Sprint')], max_length=16)),
+                ('key', models.BigIntegerField()),
+                ('action', models.CharField(max_length=255)),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=8)),
+                ('bucket', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key', 'action', 'granularity', 'bucket'), name='analytics_rollup_bucket_uniq')],
+            },
+        ),
+    ]
@@ -9,5 +9,49 @@ class AnalyticsRecord(models.Model):
 	timestamp = models.DateTimeField(auto_now_add=True)
 	details = models.JSONField(blank=True, null=True)
 
+	class Meta:
+		indexes = [
+			# AnalyticsRecordViewSet lists a user's events newest first
+			models.Index(fields=["user", "-timestamp"], name="analytics_user_ts_idx"),
+			models.Index(fields=["action", "-timestamp"], name="analytics_action_ts_idx"),
+		]
+
 	def __str__(self):
 		return f"{self.user} - {self.action} @ {self.timestamp}"
+
+
+class AnalyticsRollup(models.Model):
+	"""Event counts per (dimension, key, action, granularity, bucket), kept current by `analytics.rollups`.
+
+	`dimension` is "user" (key = UserProfile id), "project" or "sprint" (key
+	taken from the event's details), so each chart reads one index range.
+	"""
+
+	GRANULARITY_CHOICES = [
+		("hour", "Hour"),
+		("day", "Day"),
+	]
+	DIMENSION_CHOICES = [
+		("user", "User"),
+		("project", "Project"),
+		("sprint", "Sprint"),
+	]
+
+	dimension = models.CharField(max_length=16, choices=DIMENSION_CHOICES)
+	key = models.BigIntegerField()
+	action = models.CharField(max_length=255)
+	granularity = models.CharField(max_length=8, choices=GRANULARITY_CHOICES)
+	bucket = models.DateTimeField()
+	count = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		constraints = [
+			# Also the index range queries use: equality on the first four, range on bucket
+			models.UniqueConstraint(
+				fields=["dimension", "key", "action", "granularity", "bucket"],
+				name="analytics_rollup_bucket_uniq",
+			),
+		]
+
+	def __str__(self):
+		return f"{self.dimension}:{self.key} {self.action} {self.granularity}@{self.bucket} = {self.count}"
@@ -0,0 +1,220 @@
+"""Optional monthly range partitioning of the analytics event table (PostgreSQL only).
+
+`partition_table` converts `analytics_analyticsrecord` in place into a table
+partitioned by `timestamp`, with one partition per calendar month named
+`<table>_pYYYYMM` plus a `<table>_default` catch-all, and copies the rows
+across. The conversion holds an exclusive lock for the whole copy, so run it
+during a maintenance window; the original table is kept, renamed to
+`<table>_unpartitioned` and without its foreign keys (so deleting a user
+isn't blocked by archived rows), until it is dropped. `ensure_partitions`
+creates the coming months' partitions and should run periodically (the
+`partition_analytics_records --ensure-only` command does this).
+
+The primary key becomes (id, timestamp), since PostgreSQL requires the
+partition key in every unique constraint; ids still come from one sequence.
+Rows outside every monthly range land in the default partition; when
+`ensure_partitions` later creates their month, it moves them across.
+`partition_table` raises `ImproperlyConfigured` on other databases; there,
+and on an unpartitioned table, every other function here is a no-op.
+"""
+
+import datetime
+from collections import namedtuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AnalyticsRecord
+
+Partition = namedtuple("Partition", ["name", "start", "end", "rows"])
+
+
+def _table():
+    return AnalyticsRecord._meta.db_table
+
+
+def check_supported():
+    if connection.vendor != "postgresql":
+        raise ImproperlyConfigured(
+            f"Partitioning the analytics table needs PostgreSQL; the default database is {connection.vendor}."
+        )
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [_table()]
+        )
+        return cursor.fetchone() is not None
+
+
+def _month_start(value):
+    local = timezone.localtime(value, timezone.get_default_timezone())
+    return local.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(start):
+    # Day 1 + 32 days is always in the next month
+    return _month_start(start + datetime.timedelta(days=32))
+
+
+def _partition_name(start):
+    return f"{_table()}_p{start:%Y%m}"
+
+
+def _create_partition(cursor, start):
+    qn = connection.ops.quote_name
+    end = _next_month(start)
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {qn(_partition_name(start))} PARTITION OF {qn(_table())} "
+        "FOR VALUES FROM (%s) TO (%s)",
+        [start, end],
+    )
+
+
+def _add_partition(cursor, start):
+    """Create the month's partition unless it exists, moving its rows out of the default partition.
+
+    PostgreSQL refuses to create a partition while the default one holds rows
+    in its range, so the default partition is detached around the move.
+    Returns whether a partition was created.
+    """
+    qn = connection.ops.quote_name
+    table, default = _table(), f"{_table()}_default"
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL, to_regclass(%s) IS NOT NULL", [_partition_name(start), default])
+    exists, has_default = cursor.fetchone()
+    if exists:
+        return False
+    end = _next_month(start)
+    stray = False
+    if has_default:
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {qn(default)} WHERE "timestamp" >= %s AND "timestamp" < %s)', [start, end]
+        )
+        (stray,) = cursor.fetchone()
+    if not stray:
+        _create_partition(cursor, start)
+        return True
+    cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(default)}")
+    _create_partition(cursor, start)
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {qn(default)} WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+        f"INSERT INTO {qn(table)} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(default)} DEFAULT")
+    return True
+
+
+def ensure_partitions(months_ahead=3, since=None):
+    """Create the missing monthly partitions from `since` (default: this month) through `months_ahead` months on."""
+    if not is_partitioned():
+        return 0
+    start = _month_start(since or timezone.now())
+    last = _month_start(timezone.now())
+    for _ in range(months_ahead):
+        last = _next_month(last)
+    created = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        while start <= last:
+            created += _add_partition(cursor, start)
+            start = _next_month(start)
+    return created
+
+
+def list_partitions():
+    """Monthly partitions, oldest first (the default partition is not included)."""
+    if not is_partitioned():
+        return []
+    prefix = f"{_table()}_p"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname",
+            [_table()],
+        )
+        names = [name for (name,) in cursor.fetchall() if name.startswith(prefix)]
+    partitions = []
+    tz = timezone.get_default_timezone()
+    for name in names:
+        suffix = name[len(prefix):]
+        if len(suffix) != 6 or not suffix.isdigit():
+            continue
+        start = timezone.make_aware(datetime.datetime(int(suffix[:4]), int(suffix[4:]), 1), tz)
+        partitions.append(Partition(name, start, _next_month(start), None))
+    return partitions
+
+
+def expired_partitions(before):
+    """Partitions whose every row is older than `before`, with their row counts."""
+    expired = []
+    for partition in list_partitions():
+        if partition.end > before:
+            break
+        rows = AnalyticsRecord.objects.filter(timestamp__gte=partition.start, timestamp__lt=partition.end).count()
+        expired.append(partition._replace(rows=rows))
+    return expired
+
+
+def drop_partition(partition):
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(_table())} DETACH PARTITION {qn(partition.name)}")
+        cursor.execute(f"DROP TABLE {qn(partition.name)}")
+
+
+def partition_table(months_ahead=3, drop_old=False):
+    """Convert the event table to monthly range partitions and copy its rows; returns rows copied."""
+    check_supported()
+    if is_partitioned():
+        ensure_partitions(months_ahead)
+        return 0
+
+    qn = connection.ops.quote_name
+    table = _table()
+    old = f"{table}_unpartitioned"
+    sequence = f"{table}_part_id_seq"
+    profile_table = AnalyticsRecord._meta.get_field("user").related_model._meta.db_table
+    with connection.schema_editor() as editor, connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+        # Index names are schema-wide: move the old ones aside so the new table can reuse them
+        cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [table])
+        for (index,) in cursor.fetchall():
+            cursor.execute(f"ALTER INDEX {qn(index)} RENAME TO {qn((index + '_old')[:63])}")
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old)}")
+        # The kept copy must not reference profiles: deletes cascade only to the new table
+        cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'f'", [old])
+        for (constraint,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {qn(old)} DROP CONSTRAINT {qn(constraint)}")
+
+        cursor.execute(f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS) PARTITION BY RANGE ("timestamp")')
+        cursor.execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id")
+        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval(%s)", [sequence])
+        cursor.execute(f'ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, "timestamp")')
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_user_id_fk')} FOREIGN KEY (user_id) "
+            f"REFERENCES {qn(profile_table)} (id) DEFERRABLE INITIALLY DEFERRED"
+        )
+        for index in AnalyticsRecord._meta.indexes:
+            editor.execute(index.create_sql(AnalyticsRecord, editor))
+
+        cursor.execute(f"SELECT MIN(\"timestamp\") FROM {qn(old)}")
+        (oldest,) = cursor.fetchone()
+        start = _month_start(oldest or timezone.now())
+        last = _month_start(timezone.now())
+        for _ in range(months_ahead):
+            last = _next_month(last)
+        while start <= last:
+            _create_partition(cursor, start)
+            start = _next_month(start)
+        cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")
+        copied = cursor.rowcount
+        cursor.execute(f"SELECT setval(%s, COALESCE((SELECT MAX(id) FROM {qn(table)}), 0) + 1, false)", [sequence])
+        if drop_old:
+            cursor.execute(f"DROP TABLE {qn(old)}")
+    return copied
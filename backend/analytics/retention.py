@@ -0,0 +1,135 @@
+"""Retention for raw analytics events: verify rollups, archive, then delete.
+
+Events older than `settings.ANALYTICS_RETENTION["DAYS"]` (cut at a day
+boundary) are pruned oldest first in batches, each in its own short
+transaction, so no lock is held on the table for long. Before anything is
+deleted, the day's rollups are checked against the raw rows and buckets
+that lost increments are topped up, so charts keep the full history;
+counts of events pruned earlier are never taken back. Each batch is
+appended to a gzipped JSONL file per day under `ARCHIVE_DIR` before its
+rows are deleted; a run interrupted between the two can archive a few
+records twice (`id` is unique, so readers can drop duplicates).
+
+On a table partitioned by `analytics.partitioning`, monthly partitions
+that lie wholly before the cutoff are archived and dropped outright.
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from . import partitioning, rollups
+from .models import AnalyticsRecord
+
+DEFAULTS = {
+    "DAYS": 90,
+    "BATCH_SIZE": 5000,
+    "ARCHIVE_DIR": None,
+}
+
+ARCHIVE_FIELDS = ("id", "user_id", "action", "timestamp", "details")
+
+
+def get_retention_settings():
+    return {**DEFAULTS, **getattr(settings, "ANALYTICS_RETENTION", {})}
+
+
+def cutoff(days=None):
+    """Start of the oldest day that is kept."""
+    days = get_retention_settings()["DAYS"] if days is None else days
+    return rollups.bucket_start(timezone.now() - timedelta(days=days), "day")
+
+
+def ensure_rollups(before):
+    """Top up any day before `before` whose rollups are missing events; returns the days repaired."""
+    oldest = AnalyticsRecord.objects.order_by("timestamp").values_list("timestamp", flat=True).first()
+    if oldest is None or oldest >= before:
+        return []
+    raw, rolled = rollups.day_totals(rollups.bucket_start(oldest, "day"), before)
+    # More rolled up than raw is expected on a day that is already partly pruned
+    repaired = sorted(day for day, n in raw.items() if rolled.get(day, 0) < n)
+    for day in repaired:
+        rollups.top_up(day, rollups.bucket_start(day + timedelta(hours=36), "day"))
+    return repaired
+
+
+class Archive:
+    """Appends records to `<dir>/analytics-YYYY-MM-DD.jsonl.gz`, one gzip member per batch."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, day):
+        return os.path.join(self.directory, f"analytics-{day.isoformat()}.jsonl.gz")
+
+    def write(self, rows):
+        tz = timezone.get_default_timezone()
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(timezone.localdate(row["timestamp"], timezone=tz), []).append(row)
+        for day, day_rows in by_day.items():
+            lines = "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in day_rows)
+            with open(self.path(day), "ab") as fh:
+                fh.write(gzip.compress(lines.encode()))
+                fh.flush()
+                os.fsync(fh.fileno())
+
+
+def _batches(queryset, batch_size):
+    """Archive rows in pk order, each batch resuming after the last pk seen."""
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        rows = list(page.order_by("pk").values(*ARCHIVE_FIELDS)[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]["id"]
+
+
+def prune(days=None, batch_size=None, archive_dir=None, archive=True, pause=0.0, dry_run=False, log=None):
+    """Archive and delete events older than the cutoff; returns the number of events pruned."""
+    conf = get_retention_settings()
+    batch_size = batch_size or conf["BATCH_SIZE"]
+    before = cutoff(days)
+    log = log or (lambda message: None)
+    expired = AnalyticsRecord.objects.filter(timestamp__lt=before)
+    if dry_run:
+        return expired.count()
+
+    repaired = ensure_rollups(before)
+    if repaired:
+        log(f"Topped up rollups for {len(repaired)} days before pruning.")
+    store = None
+    if archive:
+        store = Archive(archive_dir or conf["ARCHIVE_DIR"] or os.path.join(settings.BASE_DIR, "analytics_archive"))
+
+    pruned = 0
+    for partition in partitioning.expired_partitions(before):
+        # Whole months: read them out for the archive, then drop the partition in one step
+        if store is not None:
+            month = AnalyticsRecord.objects.filter(timestamp__gte=partition.start, timestamp__lt=partition.end)
+            for rows in _batches(month, batch_size):
+                store.write(rows)
+        partitioning.drop_partition(partition)
+        pruned += partition.rows
+        log(f"Dropped partition {partition.name} ({partition.rows} events).")
+
+    for rows in _batches(expired, batch_size):
+        if store is not None:
+            store.write(rows)
+        with transaction.atomic():
+            AnalyticsRecord.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+        pruned += len(rows)
+        if pause:
+            # Give replicas and autovacuum room between batches
+            time.sleep(pause)
+    return pruned
@@ -0,0 +1,175 @@
+"""Incremental hourly and daily rollups of AnalyticsRecord counts.
+
+`analytics.events` calls `apply_records` right after it writes records.
+Each record is added to its hour and day bucket once per dimension it
+belongs to: always its user, plus the project and sprint named in its
+details (`project_id` / `sprint_id`). Hour buckets are UTC hours; day
+buckets are midnights in `settings.TIME_ZONE`.
+"""
+
+from collections import Counter, defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+from .models import AnalyticsRecord, AnalyticsRollup
+
+GRANULARITIES = ("hour", "day")
+DETAIL_DIMENSIONS = {"project": "project_id", "sprint": "sprint_id"}
+# Bucket keys matched per UPDATE; keeps the OR-ed WHERE clause a sane size
+UPDATE_CHUNK = 200
+
+
+def bucket_start(ts, granularity):
+    if granularity == "hour":
+        return ts.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    local = timezone.localtime(ts, timezone.get_default_timezone())
+    return local.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_range(start, end, granularity):
+    """Bucket starts from the one containing `start` through the one containing `end`."""
+    buckets = []
+    current = bucket_start(start, granularity)
+    while current <= end:
+        buckets.append(current)
+        # 36h from a local midnight always lands in the next day, DST or not
+        step = timedelta(hours=1) if granularity == "hour" else timedelta(hours=36)
+        current = bucket_start(current + step, granularity)
+    return buckets
+
+
+def _dimensions(record):
+    yield "user", record.user_id
+    details = record.details if isinstance(record.details, dict) else {}
+    for dimension, field in DETAIL_DIMENSIONS.items():
+        key = details.get(field)
+        if isinstance(key, int) and not isinstance(key, bool):
+            yield dimension, key
+
+
+def _deltas(records):
+    """Counter of (dimension, key, action, granularity, bucket) -> records falling in it."""
+    deltas = Counter()
+    for record in records:
+        if record.pk is None or record.timestamp is None:
+            continue
+        for granularity in GRANULARITIES:
+            bucket = bucket_start(record.timestamp, granularity)
+            for dimension, key in _dimensions(record):
+                deltas[(dimension, key, record.action, granularity, bucket)] += 1
+    return deltas
+
+
+def _increment(deltas):
+    fields = ("dimension", "key", "action", "granularity", "bucket")
+    by_amount = defaultdict(list)
+    for row_key, amount in deltas.items():
+        by_amount[amount].append(Q(**dict(zip(fields, row_key))))
+    with transaction.atomic():
+        # Create missing rows at zero first, so concurrent writers only ever increment
+        AnalyticsRollup.objects.bulk_create(
+            [AnalyticsRollup(**dict(zip(fields, row_key))) for row_key in deltas],
+            ignore_conflicts=True,
+        )
+        for amount, matches in by_amount.items():
+            for i in range(0, len(matches), UPDATE_CHUNK):
+                rows = AnalyticsRollup.objects.filter(reduce(or_, matches[i:i + UPDATE_CHUNK]))
+                rows.update(count=F("count") + amount)
+
+
+def apply_records(records):
+    """Add saved records to their rollup buckets (two queries for a typical batch)."""
+    deltas = _deltas(records)
+    if deltas:
+        _increment(deltas)
+
+
+def rebuild(since=None, until=None, batch_size=2000):
+    """Recount rollups from the raw records in [since, until), widened to whole days.
+
+    Never starts before the day of the oldest raw record: older buckets
+    summarise events the retention job has already archived and deleted.
+    """
+    oldest = AnalyticsRecord.objects.order_by("timestamp").values_list("timestamp", flat=True).first()
+    if oldest is None:
+        return
+    since = bucket_start(max(since, oldest) if since is not None else oldest, "day")
+    records = AnalyticsRecord.objects.filter(timestamp__gte=since).order_by("pk")
+    rollups = AnalyticsRollup.objects.filter(bucket__gte=since)
+    if until is not None:
+        until = bucket_start(until, "day")
+        records = records.filter(timestamp__lt=until)
+        rollups = rollups.filter(bucket__lt=until)
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for record in records.iterator(chunk_size=batch_size):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                apply_records(batch)
+                batch = []
+        apply_records(batch)
+
+
+def top_up(since, until, batch_size=2000):
+    """Raise every bucket in [since, until) that counts fewer than its raw records to that count.
+
+    Unlike `rebuild`, never lowers a count: buckets of a partly pruned day
+    also hold events that were archived and deleted. Returns the number of
+    buckets raised.
+    """
+    records = AnalyticsRecord.objects.filter(timestamp__gte=since, timestamp__lt=until).order_by("pk")
+    raw = Counter()
+    batch = []
+    for record in records.iterator(chunk_size=batch_size):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            raw.update(_deltas(batch))
+            batch = []
+    raw.update(_deltas(batch))
+    if not raw:
+        return 0
+    # Hour buckets of the first records can start before `since` when it isn't a UTC hour
+    rolled = {
+        (row.dimension, row.key, row.action, row.granularity, row.bucket): row.count
+        for row in AnalyticsRollup.objects.filter(
+            bucket__gte=min(bucket for *_, bucket in raw), bucket__lt=until,
+        )
+    }
+    missing = Counter({row_key: n - rolled.get(row_key, 0) for row_key, n in raw.items() if n > rolled.get(row_key, 0)})
+    if missing:
+        _increment(missing)
+    return len(missing)
+
+
+def day_totals(start, end):
+    """({day bucket: raw record count}, {day bucket: rolled-up count}) for [start, end)."""
+    tz = timezone.get_default_timezone()
+    raw = dict(
+        AnalyticsRecord.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .annotate(day=TruncDay("timestamp", tzinfo=tz)).values("day")
+        .annotate(n=Count("pk")).order_by().values_list("day", "n")
+    )
+    # Every record is counted exactly once in its user's day bucket
+    rolled = dict(
+        AnalyticsRollup.objects.filter(dimension="user", granularity="day", bucket__gte=start, bucket__lt=end)
+        .values("bucket").annotate(n=Sum("count")).order_by().values_list("bucket", "n")
+    )
+    return raw, rolled
+
+
+def series(dimension, key, action, granularity, start, end):
+    """[(bucket, count), ...] for every bucket in [start, end], zero-filled, from one range query."""
+    counts = dict(
+        AnalyticsRollup.objects.filter(
+            dimension=dimension, key=key, action=action, granularity=granularity,
+            bucket__gte=bucket_start(start, granularity), bucket__lte=end,
+        ).values_list("bucket", "count")
+    )
+    return [(bucket, counts.get(bucket, 0)) for bucket in bucket_range(start, end, granularity)]
@@ -1,3 +1,191 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
+import threading
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from analytics import events, partitioning, retention, rollups
+from analytics.events import AnalyticsBuffer, record_event, record_events
+from analytics.models import AnalyticsRecord, AnalyticsRollup
+from users.models import User, UserProfile
+
+
+class RecordingWriter:
+    """Stands in for `events._bulk_write` in buffer tests: the flusher thread can't see test data."""
+
+    def __init__(self):
+        self.batches = []
+        self.written = threading.Event()
+
+    def __call__(self, records):
+        if records:
+            self.batches.append(list(records))
+            self.written.set()
+
+
+class AnalyticsBufferTests(TestCase):
+    def setUp(self):
+        self.writer = RecordingWriter()
+        patcher = mock.patch.object(events, "_bulk_write", self.writer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start_buffer(self, **kwargs):
+        buf = AnalyticsBuffer(**kwargs)
+        self.addCleanup(buf.stop, timeout=1.0)
+        return buf
+
+    def test_flushes_when_batch_is_full(self):
+        buf = self.start_buffer(max_size=3, flush_interval=30)
+        for n in range(3):
+            buf.put(AnalyticsRecord(action=f"a{n}"))
+        self.assertTrue(self.writer.written.wait(5))
+        self.assertEqual([len(batch) for batch in self.writer.batches], [3])
+
+    def test_flushes_after_interval(self):
+        buf = self.start_buffer(max_size=100, flush_interval=0.05)
+        buf.put(AnalyticsRecord(action="a"))
+        self.assertTrue(self.writer.written.wait(5))
+        self.assertEqual([len(batch) for batch in self.writer.batches], [1])
+
+    def test_stop_writes_what_is_queued(self):
+        buf = AnalyticsBuffer(max_size=100, flush_interval=30)
+        with mock.patch.object(buf, "_ensure_started"):
+            buf.put(AnalyticsRecord(action="a"))
+            buf.put(AnalyticsRecord(action="b"))
+        buf.stop()
+        self.assertEqual([len(batch) for batch in self.writer.batches], [2])
+
+    def test_enqueues_only_on_commit(self):
+        profile = UserProfile.objects.create(user=User.objects.create_user("u"))
+        buf = AnalyticsBuffer()
+        with mock.patch.object(events, "get_buffer", return_value=buf), mock.patch.object(buf, "_ensure_started"):
+            with self.captureOnCommitCallbacks() as callbacks:
+                record_event(profile, "task_completed")
+                record_events(profile, "task_completed", [{"n": 1}, {"n": 2}])
+            self.assertEqual(buf._queue.qsize(), 0)
+            for callback in callbacks:
+                callback()
+        self.assertEqual(buf._queue.qsize(), 3)
+
+
+@override_settings(ANALYTICS_BUFFER={"ENABLED": False})
+class SynchronousAnalyticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = UserProfile.objects.create(user=User.objects.create_user("u"))
+
+    def test_writes_immediately_with_rollups(self):
+        record_event(self.profile, "task_completed", {"project_id": 1})
+        record_events(self.profile, "task_completed", [{"project_id": 1}, {"project_id": 2}])
+        self.assertEqual(AnalyticsRecord.objects.count(), 3)
+        day = AnalyticsRollup.objects.get(dimension="user", key=self.profile.id, granularity="day")
+        self.assertEqual(day.count, 3)
+
+    def test_failed_insert_keeps_the_outer_transaction(self):
+        existing = AnalyticsRecord.objects.create(user=self.profile, action="seen")
+        with transaction.atomic(), self.assertLogs("analytics.events", "ERROR"):
+            events._bulk_write([
+                AnalyticsRecord(pk=existing.pk, user=self.profile, action="duplicate"),
+                AnalyticsRecord(user=self.profile, action="task_completed"),
+            ])
+            # The caller's transaction is still usable after the failed INSERT
+            self.assertFalse(connection.needs_rollback)
+            actions = sorted(AnalyticsRecord.objects.values_list("action", flat=True))
+        self.assertEqual(actions, ["seen", "task_completed"])
+        self.assertEqual(
+            AnalyticsRollup.objects.get(dimension="user", action="task_completed", granularity="day").count, 1
+        )
+
+
+class RetentionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = UserProfile.objects.create(user=User.objects.create_user("u"))
+        # A day well past the default 90-day window
+        cls.old_day = rollups.bucket_start(timezone.now() - timedelta(days=100), "day")
+
+    def add_events(self, count, timestamp, rolled_up=True, **details):
+        ids = [
+            AnalyticsRecord.objects.create(user=self.profile, action="task_completed", details=details).pk
+            for _ in range(count)
+        ]
+        AnalyticsRecord.objects.filter(pk__in=ids).update(timestamp=timestamp)
+        if rolled_up:
+            rollups.apply_records(AnalyticsRecord.objects.filter(pk__in=ids))
+        return ids
+
+    def rolled(self, dimension, key, granularity, bucket):
+        row = AnalyticsRollup.objects.filter(
+            dimension=dimension, key=key, granularity=granularity, bucket=bucket,
+        ).first()
+        return row and row.count
+
+    def test_archives_then_deletes_in_batches(self):
+        old = self.add_events(5, self.old_day + timedelta(hours=2))
+        kept = self.add_events(2, timezone.now())
+        write = retention.Archive.write
+        with tempfile.TemporaryDirectory() as archive_dir, \
+                mock.patch.object(retention.Archive, "write", autospec=True, side_effect=write) as spy:
+            self.assertEqual(retention.prune(batch_size=2, archive_dir=archive_dir), 5)
+            path = retention.Archive(archive_dir).path(timezone.localdate(self.old_day))
+            with gzip.open(path, "rt") as fh:
+                archived = [json.loads(line)["id"] for line in fh]
+        self.assertEqual([len(call.args[1]) for call in spy.call_args_list], [2, 2, 1])
+        self.assertEqual(archived, old)
+        self.assertEqual(sorted(AnalyticsRecord.objects.values_list("pk", flat=True)), kept)
+
+    def test_dry_run_only_counts(self):
+        self.add_events(3, self.old_day)
+        self.assertEqual(retention.prune(dry_run=True), 3)
+        self.assertEqual(AnalyticsRecord.objects.count(), 3)
+
+    def test_rollups_keep_their_counts_across_a_prune(self):
+        self.add_events(3, self.old_day + timedelta(hours=2), project_id=7)
+        retention.prune(archive=False)
+        self.assertFalse(AnalyticsRecord.objects.exists())
+        self.assertEqual(self.rolled("user", self.profile.id, "day", self.old_day), 3)
+        self.assertEqual(self.rolled("project", 7, "day", self.old_day), 3)
+
+    def test_top_up_keeps_counts_of_pruned_events(self):
+        early = self.old_day + timedelta(hours=1)
+        late = self.old_day + timedelta(hours=5)
+        # An earlier prune already removed this event's row; only its rollups are left
+        AnalyticsRecord.objects.filter(pk__in=self.add_events(1, early, project_id=7)).delete()
+        # Two events whose increments were lost
+        self.add_events(2, late, rolled_up=False)
+        self.assertEqual(retention.ensure_rollups(retention.cutoff()), [self.old_day])
+        self.assertEqual(self.rolled("user", self.profile.id, "day", self.old_day), 2)
+        self.assertEqual(self.rolled("user", self.profile.id, "hour", rollups.bucket_start(late, "hour")), 2)
+        # Buckets of the pruned event are left alone
+        self.assertEqual(self.rolled("user", self.profile.id, "hour", rollups.bucket_start(early, "hour")), 1)
+        self.assertEqual(self.rolled("project", 7, "day", self.old_day), 1)
+
+    @unittest.skipIf(connection.vendor == "postgresql", "partitioning is supported on PostgreSQL")
+    def test_partitioning_needs_postgresql(self):
+        with self.assertRaises(ImproperlyConfigured):
+            partitioning.partition_table()
+        with self.assertRaisesMessage(CommandError, "needs PostgreSQL"):
+            call_command("partition_analytics_records")
+        self.assertEqual(partitioning.ensure_partitions(), 0)
+        self.assertEqual(partitioning.expired_partitions(timezone.now()), [])
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "partitioning needs PostgreSQL")
+    def test_kept_table_does_not_block_user_deletes(self):
+        self.add_events(2, self.old_day)
+        self.assertEqual(partitioning.partition_table(months_ahead=1), 2)
+        self.profile.user.delete()
+        # Deferred foreign keys are checked here, as at commit
+        connection.check_constraints()
+        self.assertFalse(AnalyticsRecord.objects.exists())
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {AnalyticsRecord._meta.db_table}_unpartitioned")
+            self.assertEqual(cursor.fetchone(), (2,))
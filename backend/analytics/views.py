@@ -1,9 +1,40 @@
 
 # Create your views here.
 
-from rest_framework import viewsets, permissions
+import datetime
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from . import rollups
 from .models import AnalyticsRecord
 from .serializers import AnalyticsRecordSerializer
+from tasks import counters
+from tasks.export import CSVRenderer, JSONLinesRenderer, stream_export, wants_gzip
+from tasks.models import Project, Sprint
+
+# Longest series one request may ask for (about 41 days of hours, 2.7 years of days)
+MAX_BUCKETS = 1000
+BUCKET_WIDTH = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+DEFAULT_SPAN = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+EXPORT_COLUMNS = ["id", "action", "timestamp", "details"]
+
+
+def _parse_bound(value, end=False):
+    """Aware datetime from an ISO date or datetime; a bare end date covers that whole day."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.datetime.combine(day, datetime.time.max if end else datetime.time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.get_default_timezone())
+    return parsed
+
 
 class AnalyticsRecordViewSet(viewsets.ModelViewSet):
     serializer_class = AnalyticsRecordSerializer
@@ -12,3 +43,122 @@ class AnalyticsRecordViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # Limit analytics to the current user for privacy; adjust as needed for admin reports
         return AnalyticsRecord.objects.filter(user__user=self.request.user).order_by('-timestamp')
+
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=[CSVRenderer, JSONLinesRenderer])
+    def export(self, request):
+        """Stream the user's events as CSV or JSON Lines, oldest first.
+
+        Optional `action`, `start` and `end` filters; `?gzip=1` compresses on the fly.
+        """
+        records = AnalyticsRecord.objects.filter(user__user=request.user)
+        try:
+            if request.query_params.get("start"):
+                records = records.filter(timestamp__gte=_parse_bound(request.query_params["start"]))
+            if request.query_params.get("end"):
+                records = records.filter(timestamp__lte=_parse_bound(request.query_params["end"], end=True))
+        except ValueError:
+            return Response({"detail": "start and end must be ISO dates or datetimes"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.query_params.get("action"):
+            records = records.filter(action=request.query_params["action"])
+        return stream_export(
+            records.order_by("pk"), EXPORT_COLUMNS, request.accepted_renderer.format,
+            filename="analytics", gzip=wants_gzip(request), request=request,
+        )
+
+    @action(detail=False, methods=["get"], url_path="series")
+    def series(self, request):
+        """Bucketed event counts read from the rollup tables, never the raw events.
+
+        `?metric=completions` (default) counts `action` events (default
+        `task_completed`) per `granularity` (`day` or `hour`) between `start`
+        and `end` for the current user, or for one of their projects or
+        sprints with `project=<id>` / `sprint=<id>`.
+        `?metric=burndown&sprint=<id>` returns the sprint's remaining tasks per day.
+        """
+        params = request.query_params
+        metric = params.get("metric", "completions")
+        if metric not in ("completions", "burndown"):
+            return Response({"detail": "metric must be completions or burndown"}, status=status.HTTP_400_BAD_REQUEST)
+        for name in ("project", "sprint"):
+            if params.get(name) and not params[name].isdigit():
+                return Response({"detail": f"{name} must be an id"}, status=status.HTTP_400_BAD_REQUEST)
+        sprint = None
+        if params.get("sprint"):
+            sprint = Sprint.objects.filter(id=params["sprint"], project__owner=request.user).first()
+            if sprint is None:
+                return Response({"detail": "Sprint not found"}, status=404)
+        if metric == "burndown":
+            if sprint is None:
+                return Response({"detail": "burndown needs a sprint"}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(self._burndown(sprint))
+
+        granularity = params.get("granularity", "day")
+        if granularity not in rollups.GRANULARITIES:
+            return Response({"detail": "granularity must be day or hour"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            end = _parse_bound(params["end"], end=True) if params.get("end") else timezone.now()
+            start = _parse_bound(params["start"]) if params.get("start") else end - DEFAULT_SPAN[granularity]
+        except ValueError:
+            return Response({"detail": "start and end must be ISO dates or datetimes"}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({"detail": "start must not be after end"}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start) / BUCKET_WIDTH[granularity] > MAX_BUCKETS:
+            return Response({"detail": f"At most {MAX_BUCKETS} buckets per request"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if sprint is not None:
+            dimension, key = "sprint", sprint.id
+        elif params.get("project"):
+            if not Project.objects.filter(id=params["project"], owner=request.user).exists():
+                return Response({"detail": "Project not found"}, status=404)
+            dimension, key = "project", int(params["project"])
+        else:
+            profile = getattr(request.user, "userprofile", None)
+            if profile is None:
+                return Response({"detail": "User profile not found"}, status=404)
+            dimension, key = "user", profile.id
+
+        event = params.get("action", "task_completed")
+        points = rollups.series(dimension, key, event, granularity, start, end)
+        return Response({
+            "metric": metric,
+            "action": event,
+            "granularity": granularity,
+            dimension: key,
+            "total": sum(count for _, count in points),
+            "series": [{"bucket": bucket.isoformat(), "count": count} for bucket, count in points],
+        })
+
+    def _burndown(self, sprint):
+        """Remaining tasks at the end of each sprint day, anchored on today's done count.
+
+        Walking backwards from the current counters means tasks finished
+        before the sprint started or moved between sprints don't skew it.
+        """
+        tz = timezone.get_default_timezone()
+        today = timezone.localdate(timezone=tz)
+        first = sprint.start_date or timezone.localdate(sprint.created_at, timezone=tz)
+        last = max(sprint.end_date or today, first)
+        start = timezone.make_aware(datetime.datetime.combine(first, datetime.time.min), tz)
+        end = timezone.make_aware(datetime.datetime.combine(min(last, today), datetime.time.max), tz)
+        points = rollups.series("sprint", sprint.id, "task_completed", "day", start, end) if first <= today else []
+
+        row = counters.sprint_counter(sprint)
+        remaining = row.total - row.status_done
+        completed = {bucket.date(): count for bucket, count in points}
+        # remaining[d] = remaining today + completions after day d
+        after = 0
+        by_day = {}
+        for day in sorted(completed, reverse=True):
+            by_day[day] = remaining + after
+            after += completed[day]
+        days = (last - first).days
+        series = []
+        for offset in range(days + 1):
+            day = first + timedelta(days=offset)
+            series.append({
+                "bucket": day.isoformat(),
+                "remaining": by_day.get(day),
+                "ideal": round(row.total * (1 - offset / days), 2) if days else 0,
+                "completed": completed.get(day),
+            })
+        return {"metric": "burndown", "sprint": sprint.id, "total": row.total, "series": series}
@@ -13,4 +13,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up: the websocket app uses models
+from backend import pool  # noqa: E402
+from tasks.websocket import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """Websockets (live board updates) go to the task event stream; lifespan events open and
+    close the connection pools; everything else goes to Django."""
+    if scope["type"] == "lifespan":
+        await pool.lifespan(receive, send)
+    elif scope["type"] == "websocket":
+        await websocket_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,66 @@
+"""`DATABASES["default"]` built from the environment.
+
+PostgreSQL connections come from a psycopg 3 pool (Django's `OPTIONS["pool"]`)
+when `psycopg_pool` is installed, or always/never with `DB_POOL=1` / `DB_POOL=0`.
+Without a pool, connections persist for `DB_CONN_MAX_AGE` seconds instead of
+being opened per request. Either way `CONN_HEALTH_CHECKS` is on: the pool
+checks each connection as it is handed out, persistent connections are
+pinged before reuse.
+
+Pool sizes are per process: keep `workers x DB_POOL_MAX_SIZE` (plus other
+clients) below the server's `max_connections`.
+
+Environment variables (defaults in brackets):
+
+    DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT   connection parameters (no default password)
+    DB_POOL [auto]                 auto, 1 or 0
+    DB_POOL_MIN_SIZE [2]           connections kept open
+    DB_POOL_MAX_SIZE [10]          upper bound; further requests wait
+    DB_POOL_TIMEOUT [10]           seconds a request waits for a connection
+    DB_POOL_MAX_WAITING [0]        waiting requests before new ones fail fast (0: unbounded)
+    DB_POOL_MAX_IDLE [300]         seconds before an idle extra connection is closed
+    DB_POOL_MAX_LIFETIME [1800]    seconds before a connection is recycled
+    DB_CONN_MAX_AGE [60]           persistent connection lifetime without a pool
+"""
+
+import importlib.util
+import os
+
+
+def _flag(value):
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def pool_available():
+    return importlib.util.find_spec("psycopg") is not None and importlib.util.find_spec("psycopg_pool") is not None
+
+
+def database_config(environ=None):
+    env = os.environ if environ is None else environ
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": env.get("DB_NAME", "taskflow_db"),
+        "USER": env.get("DB_USER", "postgres"),
+        # No default: unset, libpq falls back to PGPASSWORD or ~/.pgpass
+        "PASSWORD": env.get("DB_PASSWORD", ""),
+        "HOST": env.get("DB_HOST", "localhost"),
+        "PORT": env.get("DB_PORT", "5432"),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
+    }
+    use_pool = env.get("DB_POOL", "auto").strip().lower()
+    if use_pool == "auto" and pool_available() or use_pool != "auto" and _flag(use_pool):
+        # Django requires CONN_MAX_AGE = 0 with a pool: "closing" returns the connection
+        config["CONN_MAX_AGE"] = 0
+        config["OPTIONS"]["pool"] = {
+            "name": "taskflow-default",
+            "min_size": int(env.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(env.get("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(env.get("DB_POOL_TIMEOUT", 10)),
+            "max_waiting": int(env.get("DB_POOL_MAX_WAITING", 0)),
+            "max_idle": float(env.get("DB_POOL_MAX_IDLE", 300)),
+            "max_lifetime": float(env.get("DB_POOL_MAX_LIFETIME", 1800)),
+        }
+    else:
+        config["CONN_MAX_AGE"] = int(env.get("DB_CONN_MAX_AGE", 60))
+    return config
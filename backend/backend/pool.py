@@ -0,0 +1,135 @@
+"""Lifecycle, health check and metrics for the database connection pools.
+
+Django creates one psycopg pool per pooled alias on first use (see
+`backend.database`). The WSGI and ASGI entry points call `open_pools()` so
+a worker fills its `min_size` connections at startup instead of during its
+first requests, and close them on exit (ASGI: on lifespan shutdown). Under
+ASGI the pool matters most: each request's sync ORM work runs in its own
+thread, so per-thread persistent connections would not be reused.
+
+With gunicorn `--preload`, open pools in a `post_fork` hook rather than at
+import, so forked workers don't share the parent's sockets
+(`DB_POOL_OPEN_AT_STARTUP=0` turns the entry point call off).
+
+`/healthz` runs `SELECT 1` on every configured database and answers only
+ok or 503, since it is unauthenticated (load balancers, orchestrators); a
+failing alias is logged. Pool size, usage, waiting requests and wait time
+go to the authenticated /metrics.
+"""
+
+import atexit
+import logging
+import os
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
+
+from tasks.instrumentation import registry
+
+logger = logging.getLogger(__name__)
+
+
+def pools():
+    """{alias: psycopg ConnectionPool} for the pooled aliases."""
+    found = {}
+    for alias in settings.DATABASES:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            found[alias] = pool
+    return found
+
+
+def open_pools(wait=False):
+    """Open every pool; with `wait`, block until `min_size` connections are ready."""
+    for pool in pools().values():
+        pool.open(wait=wait)
+
+
+def close_pools():
+    for alias in pools():
+        connections[alias].close_pool()
+
+
+def start():
+    """Entry point hook: open the pools now and close them at interpreter exit."""
+    if os.environ.get("DB_POOL_OPEN_AT_STARTUP", "1").lower() in ("0", "false", "no", "off"):
+        return
+    open_pools()
+    atexit.register(close_pools)
+
+
+async def lifespan(receive, send):
+    """ASGI lifespan protocol: open the pools on startup, close them on shutdown."""
+    from asgiref.sync import sync_to_async
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await sync_to_async(open_pools)()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await sync_to_async(close_pools)()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+def pool_stats():
+    """{alias: stats} with psycopg's pool counters plus `in_use` and `saturation` (in_use / max)."""
+    stats = {}
+    for alias, pool in pools().items():
+        raw = pool.get_stats()
+        size = raw.get("pool_size", 0)
+        in_use = size - raw.get("pool_available", 0)
+        maximum = raw.get("pool_max") or pool.max_size
+        stats[alias] = {
+            **raw,
+            "in_use": in_use,
+            "saturation": round(in_use / maximum, 3) if maximum else 0.0,
+        }
+    return stats
+
+
+# psycopg stat -> (metric, type, help); wait times are reported in seconds
+POOL_METRICS = {
+    "pool_max": ("db_pool_max_connections", "gauge", "Configured pool max_size."),
+    "pool_size": ("db_pool_connections", "gauge", "Connections currently open, idle or in use."),
+    "in_use": ("db_pool_connections_in_use", "gauge", "Connections handed out to requests."),
+    "requests_waiting": ("db_pool_requests_waiting", "gauge", "Requests waiting for a connection now."),
+    "requests_num": ("db_pool_requests_total", "counter", "Connection requests."),
+    "requests_queued": ("db_pool_requests_queued_total", "counter", "Connection requests that had to wait."),
+    "requests_wait_ms": ("db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection."),
+    "requests_errors": ("db_pool_request_errors_total", "counter", "Connection requests that timed out or were refused."),
+    "connections_lost": ("db_pool_connections_lost_total", "counter", "Connections found broken by health checks."),
+}
+
+
+def collect_metrics():
+    """Gauges and counters for /metrics, read from the pools at scrape time."""
+    samples = []
+    for alias, stats in pool_stats().items():
+        for key, (name, kind, help_text) in POOL_METRICS.items():
+            value = stats.get(key, 0)
+            if key == "requests_wait_ms":
+                value = value / 1000
+            samples.append((name, kind, help_text, {"alias": alias}, value))
+    return samples
+
+
+registry.add_collector(collect_metrics)
+
+
+def health(request):
+    """Liveness of every configured database: {"status": "ok"}, or 503 if any check fails."""
+    healthy = True
+    for alias in settings.DATABASES:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            healthy = False
+            logger.exception("Health check failed for database %r", alias)
+    return JsonResponse(
+        {"status": "ok" if healthy else "unavailable"},
+        status=200 if healthy else 503,
+    )
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from backend.database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -37,6 +40,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "tasks",
     "users",
     "analytics",
@@ -46,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tasks.instrumentation.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -79,16 +84,9 @@ WSGI_APPLICATION = "backend.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "taskflow_db",
-        "USER": "postgres",
-        "PASSWORD": "SADHVIKA@13#",
-        "HOST": "localhost",
-        "PORT": "5432",
-    }
-}
+# Connection parameters, pooling and health checks come from the environment;
+# see backend/database.py
+DATABASES = {"default": database_config()}
 
 
 # Password validation
@@ -140,10 +138,83 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "users.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
 }
+
+# Token -> user resolution cache used by CachedTokenAuthentication. Process-local
+# LRU by default; set CACHE_ALIAS to a shared Django cache when running several
+# worker processes so logout/deactivation invalidates everywhere.
+TOKEN_AUTH_CACHE = {
+    "MAX_SIZE": 10000,
+    "TTL": 300,
+    "CACHE_ALIAS": None,
+}
+
+# Serialized assignee profiles, shared the same way as the token cache above.
+PROFILE_CACHE = {
+    "MAX_SIZE": 10000,
+    "TTL": 60,
+    "CACHE_ALIAS": None,
+}
+
+# Analytics events are queued in-process and bulk-inserted by a background
+# thread; set ENABLED to False to write each event synchronously instead.
+ANALYTICS_BUFFER = {
+    "ENABLED": True,
+    "MAX_SIZE": 500,
+    "FLUSH_INTERVAL": 2.0,
+}
+
+# Delta sync (/api/tasks/changes/) keeps deletion tombstones this long; clients
+# with an older watermark get a full reset instead.
+TASK_TOMBSTONE_RETENTION_DAYS = 30
+
+# Raw analytics events older than DAYS are archived to gzipped JSONL under
+# ARCHIVE_DIR (default BASE_DIR/analytics_archive) and deleted by
+# `manage.py prune_analytics_events`; the rollups keep their counts.
+ANALYTICS_RETENTION = {
+    "DAYS": 90,
+    "BATCH_SIZE": 5000,
+    "ARCHIVE_DIR": None,
+}
+
+# Pub/sub layer for live board websockets (/ws/projects/<id>/ under ASGI).
+# The in-memory broker only fans out within one process.
+REALTIME_BROKER = "tasks.realtime.InMemoryBroker"
+
+# Sampled per-endpoint timings (tasks.instrumentation): SAMPLE_RATE of requests
+# get DB/view/render timings and a Server-Timing header; /metrics serves the
+# per-process aggregates in Prometheus format to staff users, or to scrapers
+# sending "Authorization: Bearer <METRICS_TOKEN>".
+PERF_INSTRUMENTATION = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 0.05,
+    "SERVER_TIMING": True,
+    "METRICS_TOKEN": os.environ.get("METRICS_TOKEN") or None,
+}
+
+# Versioned per-user cache for project/sprint lists and task stats
+# (tasks.response_cache). Point CACHE_ALIAS at a shared cache (e.g.
+# django.core.cache.backends.redis.RedisCache) when running several workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "responses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "responses",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+RESPONSE_CACHE = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "responses",
+    "TTL": 300,
+    "KEY_PREFIX": "respcache",
+}
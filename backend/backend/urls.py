@@ -24,6 +24,9 @@ from rest_framework import routers
 from tasks.views import TaskViewSet, ProjectViewSet, SprintViewSet
 from users.views import UserProfileViewSet, AuthViewSet
 from analytics.views import AnalyticsRecordViewSet
+from tasks.instrumentation import metrics
+from backend.pool import health
+from tasks import async_views
 
 router = routers.DefaultRouter()
 router.register(r'projects', ProjectViewSet, basename='project')
@@ -35,6 +38,11 @@ router.register(r'auth', AuthViewSet, basename='auth')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/async/projects/', async_views.project_list, name='project.list.async'),
+    path('api/async/tasks/', async_views.task_list, name='task.list.async'),
+    path('api/async/tasks/stats/', async_views.task_stats, name='task.stats.async'),
     path('api/', include(router.urls)),
+    path('metrics', metrics, name='metrics'),
+    path('healthz', health, name='health'),
     path('', lambda request: HttpResponse('TaskFlow Management API is running.'), name='home'),
 ]
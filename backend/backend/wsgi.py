@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 
 application = get_wsgi_application()
+
+# Imported after Django is set up; fills the connection pools before the first request
+from backend import pool  # noqa: E402
+
+pool.start()
@@ -0,0 +1,166 @@
+"""Async-native versions of the hot read endpoints, for the ASGI stack.
+
+DRF views are synchronous, so under `asgi.py` Django runs each one in a
+thread that stays taken for the whole request. These are plain Django
+`async def` views over the async ORM returning the same JSON as their DRF
+counterparts:
+
+- `/api/async/projects/`: `ProjectViewSet.list`
+- `/api/async/tasks/`: `TaskViewSet.list` (`project`, `sprint`, `fields`; no pagination)
+- `/api/async/tasks/stats/`: `TaskViewSet.stats`
+
+Django's database backends are still synchronous: each async ORM call runs
+in a thread for the length of the query. Everything else (waiting for the
+next query, serialization, sending the body to a slow client) happens on
+the event loop, so a worker holds many more requests in flight than it has
+threads. Authentication (the REST_FRAMEWORK classes), ETags and the
+response cache behave as on the sync endpoints. Served from WSGI they still
+work, at the cost of an event loop per request.
+"""
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.http import HttpResponse, JsonResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from users.profiles import profile_generation, profile_payloads
+
+from . import counters
+from .conditional import _etag, _not_modified, conditional_headers
+from .models import Project, Sprint, Task
+from .response_cache import get_response_cache, lookup
+from .serializers import ProjectSerializer, TaskRowSerializer
+
+
+def _json(data, status=200, headers=None):
+    # Same bytes as DRF's JSONRenderer
+    return JsonResponse(
+        data, status=status, headers=headers, safe=False, encoder=JSONEncoder,
+        json_dumps_params={"separators": (",", ":"), "ensure_ascii": False},
+    )
+
+
+@sync_to_async
+def _authenticate(request):
+    """Set `request.user` from the REST_FRAMEWORK authentication classes; an error response on failure."""
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = drf_request.user
+    except exceptions.AuthenticationFailed as exc:
+        return _json({"detail": exc.detail}, status=exc.status_code)
+    if not user.is_authenticated:
+        return _json({"detail": exceptions.NotAuthenticated.default_detail}, status=401)
+    request.user = user
+    return None
+
+
+async def _respond(request, endpoint, build, project_ids=None, cached=True):
+    """Authenticate, then render `await build()` -> (status, data, headers), through the response cache."""
+    error = await _authenticate(request)
+    if error is not None:
+        return error
+    cache = get_response_cache() if cached else None
+    if cache is None:
+        return _render(request, *await build())
+    key, entry = await sync_to_async(lookup)(cache, endpoint, request, project_ids)
+    if entry is not None:
+        response = _render(request, 200, *entry)
+        if response.status_code == 200:
+            response["X-Cache"] = "hit"
+        return response
+    status, data, headers = await build()
+    if status == 200:
+        await sync_to_async(cache.store)(key, data, headers)
+    response = _render(request, status, data, headers)
+    response["X-Cache"] = "miss"
+    return response
+
+
+def _render(request, status, data, headers):
+    if status == 304 or status == 200 and headers.get("ETag") and _not_modified(request, headers["ETag"]):
+        return HttpResponse(status=304, headers=headers)
+    return _json(data, status=status, headers=headers)
+
+
+async def _collection_etag(endpoint, request, queryset, *extra):
+    summary = await queryset.aaggregate(latest=Max("updated_at"), count=Count("pk"))
+    latest = summary["latest"] and summary["latest"].isoformat()
+    return _etag(endpoint, request.user.pk, request.get_full_path(), summary["count"], latest, *extra)
+
+
+async def project_list(request):
+    async def build():
+        queryset = Project.objects.filter(owner=request.user).order_by("-created_at")
+        headers = conditional_headers(await _collection_etag("project", request, queryset))
+        if _not_modified(request, headers["ETag"]):
+            return 304, None, headers
+        projects = [project async for project in queryset]
+        return 200, ProjectSerializer(projects, many=True).data, headers
+
+    # Project rows only; their writes bump the owner's generation
+    return await _respond(request, "project.list.async", build, project_ids=[])
+
+
+async def task_list(request):
+    async def build():
+        raw = request.GET.get("fields")
+        fields = None
+        if raw:
+            fields = {name.strip() for name in raw.split(",") if name.strip()} | {"id"}
+        queryset = Task.objects.filter(project__owner=request.user)
+        if request.GET.get("project"):
+            queryset = queryset.filter(project_id=request.GET["project"])
+        if request.GET.get("sprint"):
+            queryset = queryset.filter(sprint_id=request.GET["sprint"])
+        # Rows embed assignee profiles, which change without touching the tasks
+        generation = await sync_to_async(profile_generation)()
+        headers = conditional_headers(await _collection_etag("task", request, queryset, generation))
+        if _not_modified(request, headers["ETag"]):
+            return 304, None, headers
+        rows = [row async for row in queryset.values(*TaskRowSerializer.columns(fields))]
+        if fields is None or "assigned_to" in fields:
+            # Loads assignee profiles into the request's memo, so serializing runs no queries
+            await sync_to_async(profile_payloads)({row["assigned_to"] for row in rows}, request)
+        return 200, TaskRowSerializer(rows, fields=fields, context={"request": request}).data, headers
+
+    # Payload changes with every task write, and the ETag already saves the body
+    return await _respond(request, "task.list.async", build, cached=False)
+
+
+async def task_stats(request):
+    project_id = request.GET.get("project", "")
+    sprint_id = request.GET.get("sprint", "")
+
+    async def build():
+        if sprint_id:
+            sprint = None
+            if sprint_id.isdigit():
+                sprint = await Sprint.objects.filter(id=sprint_id, project__owner=request.user).afirst()
+            if sprint is None:
+                return 404, {"detail": "Sprint not found"}, {}
+            return 200, counters.counts_payload(await counters.asprint_counter(sprint)), {}
+        owned = Project.objects.filter(owner=request.user)
+        if project_id:
+            ids = []
+            if project_id.isdigit():
+                ids = [pk async for pk in owned.filter(id=project_id).values_list("id", flat=True)]
+            if not ids:
+                return 404, {"detail": "Project not found"}, {}
+            rows = await counters.aproject_counters(ids)
+            return 200, counters.counts_payload(rows[ids[0]]), {}
+        requested = request.GET.get("projects")
+        if requested:
+            try:
+                owned = owned.filter(id__in=[int(pk) for pk in requested.split(",") if pk.strip()])
+            except ValueError:
+                return 400, {"detail": "projects must be a comma-separated list of ids"}, {}
+        ids = [pk async for pk in owned.order_by("-created_at").values_list("id", flat=True)]
+        rows = await counters.aproject_counters(ids)
+        return 200, {str(pid): counters.counts_payload(rows[pid]) for pid in ids}, {}
+
+    # stats?project=<id> only depends on that project, as in TaskViewSet.cache_projects
+    project_ids = [int(project_id)] if project_id.isdigit() and not sprint_id else None
+    return await _respond(request, "task.stats.async", build, project_ids=project_ids)
@@ -0,0 +1,365 @@
+"""Seeded API benchmark: data generator, scripted scenarios and baselines.
+
+`seed()` builds a deterministic data set (owners with projects, sprints,
+tasks and analytics events) with bulk inserts, so millions of tasks take
+minutes, not hours. Scenarios replay what the board UI does:
+
+- `board`: open a project board (projects, sprints, the project's tasks)
+- `move`: drag cards (a single-task PATCH and a multi-card bulk move)
+- `stats`: the dashboard (task stats, completion series, sprint burndown)
+- `search`: the search box
+
+Requests go through the DRF test client in-process (`ClientDriver`, kept
+in the bench_api command so django.test stays out of the app), where every
+request's SQL is captured, or over HTTP to a running server (`HttpDriver`),
+where query counts come from the `Server-Timing` header when the server samples
+every request (`PERF_INSTRUMENTATION["SAMPLE_RATE"] = 1.0`).
+
+`throughput()` drives a live server with many concurrent clients instead,
+to compare requests per second of the sync and async read endpoints
+(`bench_async`).
+
+Results are per endpoint (`<basename>.<action>` as in tasks.instrumentation,
+plus a suffix where one action serves two kinds of call): p50/p99 latency and
+the worst queries-per-request. `check()` compares them
+with a baseline file: any query count above its baseline fails, and
+latencies fail when above baseline times the tolerance. Latency baselines
+are machine specific; record them with `bench_api --update-baseline`.
+"""
+
+import gc
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from datetime import timedelta
+
+from django.utils import timezone
+
+from analytics import rollups
+from analytics.models import AnalyticsRecord
+from users.models import User, UserProfile
+
+from . import counters
+from .models import Project, Sprint, Task
+
+SCALES = {
+    "small": {"owners": 5, "projects": 4, "sprints": 3, "tasks": 10_000, "events": 20_000},
+    "medium": {"owners": 20, "projects": 5, "sprints": 4, "tasks": 200_000, "events": 500_000},
+    "large": {"owners": 50, "projects": 10, "sprints": 6, "tasks": 2_000_000, "events": 5_000_000},
+}
+SCENARIOS = ("board", "move", "stats", "search")
+STATUSES = [choice for choice, _ in Task.STATUS_CHOICES]
+PRIORITIES = [choice for choice, _ in Task.PRIORITY_CHOICES]
+WORDS = (
+    "login page api bug fix refactor deploy search board sprint review cache export import "
+    "chart mobile layout payment email signup report migrate timeout crash docs test"
+).split()
+USERNAME_PREFIX = "bench-api-"
+BATCH_SIZE = 5000
+
+Dataset = namedtuple("Dataset", ["owner", "projects", "sprints", "tasks"])
+Result = namedtuple("Result", ["endpoint", "count", "p50_ms", "p99_ms", "queries"])
+Throughput = namedtuple("Throughput", ["label", "requests", "errors", "rps", "p50_ms", "p99_ms"])
+
+
+def _title(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).capitalize()
+
+
+def seed(owners=5, projects=4, sprints=3, tasks=10_000, events=20_000, days=30, seed=13, log=None):
+    """Create the benchmark data set and return the first owner's `Dataset`.
+
+    Tasks and events are spread evenly over all projects; event timestamps
+    over the last `days` days. Counters and rollups are rebuilt at the end so
+    the stats endpoints read warm rows.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    users = User.objects.bulk_create([
+        User(username=f"{USERNAME_PREFIX}{n}", password="!") for n in range(owners)
+    ])
+    profiles = UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+    project_rows = Project.objects.bulk_create([
+        Project(name=f"Bench {user.username} {n}", owner=user) for user in users for n in range(projects)
+    ])
+    today = timezone.localdate()
+    sprint_rows = Sprint.objects.bulk_create([
+        Sprint(
+            name=f"Sprint {n + 1}", project=project,
+            start_date=today - timedelta(days=14 * (sprints - n)),
+            end_date=today - timedelta(days=14 * (sprints - n - 1)),
+        )
+        for project in project_rows for n in range(sprints)
+    ])
+    sprints_by_project = {}
+    for sprint in sprint_rows:
+        sprints_by_project.setdefault(sprint.project_id, []).append(sprint.id)
+    profile_by_owner = {profile.user_id: profile.id for profile in profiles}
+    log(f"Seeded {owners} owners, {len(project_rows)} projects, {len(sprint_rows)} sprints.")
+
+    now = timezone.now()
+    for start in range(0, tasks, BATCH_SIZE):
+        batch = []
+        for n in range(start, min(start + BATCH_SIZE, tasks)):
+            project = project_rows[n % len(project_rows)]
+            status = rng.choice(STATUSES)
+            done = status == "done"
+            batch.append(Task(
+                title=_title(rng),
+                description=" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 30))),
+                status=status,
+                completed=done,
+                completed_at=now - timedelta(days=rng.randint(0, days - 1)) if done else None,
+                priority=rng.choice(PRIORITIES),
+                due_date=today + timedelta(days=rng.randint(-days, days)) if rng.random() < 0.5 else None,
+                project=project,
+                sprint_id=rng.choice(sprints_by_project[project.id]) if rng.random() < 0.7 else None,
+                assigned_to_id=rng.choice(profiles).id if rng.random() < 0.8 else None,
+            ))
+        Task.objects.bulk_create(batch)
+        if (start // BATCH_SIZE) % 20 == 19:
+            log(f"  {start + len(batch)} tasks")
+    counters.rebuild([project.id for project in project_rows])
+    log(f"Seeded {tasks} tasks.")
+
+    for start in range(0, events, BATCH_SIZE):
+        batch = []
+        for n in range(start, min(start + BATCH_SIZE, events)):
+            project = project_rows[n % len(project_rows)]
+            batch.append(AnalyticsRecord(
+                user_id=profile_by_owner[project.owner_id],
+                action=rng.choice(("task_completed", "task_created", "task_moved")),
+                details={"project_id": project.id, "sprint_id": rng.choice(sprints_by_project[project.id])},
+            ))
+        created = AnalyticsRecord.objects.bulk_create(batch)
+        # timestamp is auto_now_add; shift each batch back to its own day
+        AnalyticsRecord.objects.filter(pk__gte=created[0].pk, pk__lte=created[-1].pk).update(
+            timestamp=now - timedelta(days=(start // BATCH_SIZE) % days, minutes=rng.randint(0, 1439))
+        )
+    if events:
+        rollups.rebuild(since=now - timedelta(days=days + 1))
+    log(f"Seeded {events} analytics events.")
+    return load_dataset(users[0])
+
+
+def load_dataset(owner):
+    """Ids the scenarios pick from, for data created by an earlier `seed()`."""
+    projects = list(Project.objects.filter(owner=owner).order_by("id").values_list("id", flat=True))
+    sprints = {}
+    for sprint_id, project_id in Sprint.objects.filter(project__in=projects).order_by("id").values_list("id", "project_id"):
+        sprints.setdefault(project_id, []).append(sprint_id)
+    # A sample of task ids per project is enough for moves; loading millions is not
+    tasks = {
+        project_id: list(Task.objects.filter(project_id=project_id).order_by("id").values_list("id", flat=True)[:500])
+        for project_id in projects
+    }
+    return Dataset(owner, projects, sprints, tasks)
+
+
+def board(data, rng):
+    project = rng.choice(data.projects)
+    return [
+        ("project.list", "get", "/api/projects/", None),
+        ("sprint.list", "get", "/api/sprints/", None),
+        ("task.list", "get", f"/api/tasks/?project={project}", None),
+    ]
+
+
+def move(data, rng):
+    project = rng.choice(data.projects)
+    task_ids = rng.sample(data.tasks[project], min(5, len(data.tasks[project])))
+    sprint_ids = data.sprints.get(project, [])
+    changes = [
+        {"id": task_id, "status": rng.choice(STATUSES), "sprint": rng.choice(sprint_ids) if sprint_ids else None}
+        for task_id in task_ids
+    ]
+    return [
+        ("task.partial_update", "patch", f"/api/tasks/{task_ids[0]}/", {"status": rng.choice(STATUSES)}),
+        ("task.bulk", "post", "/api/tasks/bulk/", changes),
+    ]
+
+
+def stats(data, rng):
+    project = rng.choice(data.projects)
+    steps = [
+        ("task.stats", "get", f"/api/tasks/stats/?project={project}", None),
+        ("task.stats.all", "get", "/api/tasks/stats/", None),
+        ("analytics.series", "get", f"/api/analytics/series/?project={project}", None),
+    ]
+    if data.sprints.get(project):
+        sprint = rng.choice(data.sprints[project])
+        steps.append(("analytics.series.burndown", "get", f"/api/analytics/series/?metric=burndown&sprint={sprint}", None))
+    return steps
+
+
+def search(data, rng):
+    project = rng.choice(data.projects)
+    query = " ".join(rng.sample(WORDS, 2))
+    return [("task.search", "get", f"/api/tasks/search/?project={project}&q={query.replace(' ', '+')}", None)]
+
+
+SCENARIO_STEPS = {"board": board, "move": move, "stats": stats, "search": search}
+
+
+class HttpDriver:
+    """Runs requests against a live server with token auth."""
+
+    def __init__(self, base_url, token):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+
+    def request(self, method, url, data):
+        body = None if data is None else json.dumps(data).encode()
+        request = urllib.request.Request(self.base_url + url, data=body, method=method.upper())
+        request.add_header("Authorization", f"Token {self.token}")
+        if body is not None:
+            request.add_header("Content-Type", "application/json")
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status, timing = response.status, response.headers.get("Server-Timing", "")
+        except urllib.error.HTTPError as exc:
+            status, timing = exc.code, exc.headers.get("Server-Timing", "")
+        elapsed = time.perf_counter() - started
+        return status, elapsed, _queries_from_timing(timing)
+
+
+def _queries_from_timing(header):
+    # db;dur=1.23;desc="4 queries"
+    for part in header.split(","):
+        if part.strip().startswith("db;"):
+            desc = part.split('desc="', 1)[-1]
+            number = desc.split(" ", 1)[0]
+            return int(number) if number.isdigit() else None
+    return None
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * fraction // 1))
+    return ordered[int(rank) - 1]
+
+
+def run(driver, data, scenarios=SCENARIOS, iterations=100, warmup=5, seed=13):
+    """Replay `iterations` rounds of each scenario; returns Results sorted by endpoint."""
+    rng = random.Random(seed)
+    timings, queries = {}, {}
+    for round_number in range(warmup + iterations):
+        # Collect between rounds so one request doesn't pay for the garbage of many
+        gc.collect()
+        for name in scenarios:
+            for endpoint, method, url, payload in SCENARIO_STEPS[name](data, rng):
+                status, elapsed, count = driver.request(method, url, payload)
+                if status >= 400:
+                    raise RuntimeError(f"{method.upper()} {url} returned {status}")
+                if round_number < warmup:
+                    continue
+                timings.setdefault(endpoint, []).append(elapsed)
+                if count is not None:
+                    queries[endpoint] = max(queries.get(endpoint, 0), count)
+    return [
+        Result(
+            endpoint, len(values),
+            round(percentile(values, 0.5) * 1000, 2), round(percentile(values, 0.99) * 1000, 2),
+            queries.get(endpoint),
+        )
+        for endpoint, values in sorted(timings.items())
+    ]
+
+
+def read_mix(data, rng, prefix="/api/"):
+    """One board load's reads (projects, a project's and a sprint's tasks, stats) under `prefix`.
+
+    `/api/async/` serves the same reads from tasks.async_views.
+    """
+    project = rng.choice(data.projects)
+    urls = [
+        f"{prefix}projects/",
+        f"{prefix}tasks/?project={project}",
+        f"{prefix}tasks/stats/?project={project}",
+        f"{prefix}tasks/stats/",
+    ]
+    if data.sprints.get(project):
+        urls.append(f"{prefix}tasks/?sprint={rng.choice(data.sprints[project])}")
+    return urls
+
+
+def throughput(driver, data, label, prefix="/api/", concurrency=32, duration=10.0, seed=13):
+    """Requests per second of `read_mix` with `concurrency` clients looping for `duration` seconds.
+
+    Each client is a thread making blocking HTTP requests, so the figure is
+    what the server sustains with that many requests in flight.
+    """
+    lock = threading.Lock()
+    timings, errors = [], [0]
+    deadline = time.perf_counter() + duration
+
+    def client(number):
+        rng = random.Random(seed + number)
+        mine, failed = [], 0
+        while time.perf_counter() < deadline:
+            for url in read_mix(data, rng, prefix):
+                try:
+                    status, elapsed, _ = driver.request("get", url, None)
+                except OSError:
+                    # Refused or reset connections count as errors, not as a crashed client
+                    status = None
+                if status is None or status >= 400:
+                    failed += 1
+                else:
+                    mine.append(elapsed)
+        with lock:
+            timings.extend(mine)
+            errors[0] += failed
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(number,)) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if not timings:
+        raise RuntimeError(f"{label}: no successful requests ({errors[0]} errors)")
+    return Throughput(
+        label, len(timings), errors[0], round(len(timings) / elapsed, 1),
+        round(percentile(timings, 0.5) * 1000, 2), round(percentile(timings, 0.99) * 1000, 2),
+    )
+
+
+def load_baseline(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def to_baseline(results):
+    return {
+        result.endpoint: {"p50_ms": result.p50_ms, "p99_ms": result.p99_ms, "queries": result.queries}
+        for result in results
+    }
+
+
+def check(results, baseline, tolerance=2.0, latency=True):
+    """Regressions against `baseline` as human-readable strings; empty when within budget."""
+    failures = []
+    for result in results:
+        limits = baseline.get(result.endpoint)
+        if limits is None:
+            continue
+        if result.queries is not None and limits.get("queries") is not None and result.queries > limits["queries"]:
+            failures.append(f"{result.endpoint}: {result.queries} queries per request (baseline {limits['queries']})")
+        if not latency:
+            continue
+        for key in ("p50_ms", "p99_ms"):
+            allowed = limits.get(key)
+            if allowed is not None and getattr(result, key) > allowed * tolerance:
+                failures.append(
+                    f"{result.endpoint}: {key} {getattr(result, key)} > {allowed} x {tolerance}"
+                )
+    return failures
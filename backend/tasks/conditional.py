@@ -0,0 +1,69 @@
+"""Conditional GET support (ETag / If-None-Match) for the task app viewsets."""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def _etag(*parts):
+    return quote_etag(hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest())
+
+
+def _not_modified(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = {tag.removeprefix("W/") for tag in parse_etags(header)}
+    return "*" in candidates or etag in candidates
+
+
+def conditional_headers(etag):
+    # no-cache makes browsers revalidate every time instead of guessing freshness
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+class ConditionalGetMixin:
+    """Strong ETags for list/retrieve computed without serializing anything.
+
+    A collection's tag comes from `max(updated_at)` and the row count of the
+    filtered queryset (one aggregate query), salted with the user and query
+    string. A single object's tag comes from its pk and `updated_at`. When
+    the request's `If-None-Match` matches, a bodyless 304 is returned.
+    Viewsets whose payload embeds other rows override `collection_version`
+    and `object_version` to fold those rows in.
+    """
+
+    etag_timestamp_field = "updated_at"
+
+    def _conditional_headers(self, etag):
+        return conditional_headers(etag)
+
+    def collection_version(self, queryset):
+        """Values that change whenever the collection does, from one aggregate query."""
+        summary = queryset.aggregate(latest=Max(self.etag_timestamp_field), count=Count("pk"))
+        return summary["count"], summary["latest"] and summary["latest"].isoformat()
+
+    def object_version(self, instance):
+        return instance.pk, getattr(instance, self.etag_timestamp_field).isoformat()
+
+    def list(self, request, *args, **kwargs):
+        version = self.collection_version(self.filter_queryset(self.get_queryset()))
+        etag = _etag(self.basename, request.user.pk, request.get_full_path(), *version)
+        if _not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=self._conditional_headers(etag))
+        response = super().list(request, *args, **kwargs)
+        for header, value in self._conditional_headers(etag).items():
+            response[header] = value
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = _etag(self.basename, request.user.pk, request.get_full_path(), *self.object_version(instance))
+        if _not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=self._conditional_headers(etag))
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers=self._conditional_headers(etag))
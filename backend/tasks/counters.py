@@ -0,0 +1,323 @@
+"""Incremental maintenance of TaskCounter rows.
+
+Every task write snapshots the task's counted state before and after the
+change and calls `apply_task_changes`, which turns the difference into
+`F()` increments on the affected project and sprint rows inside the caller's
+transaction. Rows that don't exist yet (or projects seeded with bulk inserts)
+are rebuilt from the task table on demand, so reads never return wrong
+counts for a missing row.
+
+Both paths first take a row lock on the projects involved, so a rebuild
+never recounts while another transaction holds an uncommitted increment
+for the same project, and two writers never both create a missing row.
+Where the database has no row locks (SQLite) writers are serialized by the
+database lock anyway and the lock is skipped.
+"""
+
+from collections import Counter, defaultdict, namedtuple
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from . import response_cache
+from .models import Project, Sprint, Task, TaskCounter
+
+TaskState = namedtuple("TaskState", ["project_id", "sprint_id", "status", "priority", "due_date"])
+
+STATUS_FIELDS = {key: f"status_{key}" for key, _ in Task.STATUS_CHOICES}
+PRIORITY_FIELDS = {key: f"priority_{key}" for key, _ in Task.PRIORITY_CHOICES}
+COUNT_FIELDS = ["total", *STATUS_FIELDS.values(), *PRIORITY_FIELDS.values(), "overdue"]
+
+
+def snapshot(task):
+    """The part of a task that the counters depend on (None for unsaved tasks)."""
+    if task is None or task.pk is None:
+        return None
+    return TaskState(task.project_id, task.sprint_id, task.status, task.priority, task.due_date)
+
+
+def _is_overdue(status, due_date, today):
+    return status != "done" and due_date is not None and due_date < today
+
+
+def _contributions(state, today):
+    """{scope: {field: 1}} for the rows a task in `state` is counted in."""
+    if state is None or state.project_id is None:
+        return {}
+    values = {"total": 1}
+    if state.status in STATUS_FIELDS:
+        values[STATUS_FIELDS[state.status]] = 1
+    if state.priority in PRIORITY_FIELDS:
+        values[PRIORITY_FIELDS[state.priority]] = 1
+    if _is_overdue(state.status, state.due_date, today):
+        values["overdue"] = 1
+    scopes = {("project", state.project_id): values}
+    if state.sprint_id:
+        scopes[("sprint", state.sprint_id)] = values
+    return scopes
+
+
+def _lock_projects(project_ids):
+    """Lock the project rows until the end of the transaction, in id order so writers can't deadlock."""
+    if project_ids and connection.features.has_select_for_update:
+        list(Project.objects.select_for_update().filter(id__in=project_ids).order_by("id").values_list("id", flat=True))
+
+
+def apply_task_changes(changes):
+    """Apply [(old_state, new_state), ...] to the counters; call after the task rows are written."""
+    today = timezone.now().date()
+    deltas = defaultdict(Counter)
+    projects_by_scope = {}
+    changes = list(changes)
+    response_cache.bump_projects(
+        {state.project_id for change in changes for state in change if state is not None}
+    )
+    for old, new in changes:
+        for sign, state in ((-1, old), (1, new)):
+            for scope, values in _contributions(state, today).items():
+                projects_by_scope[scope] = state.project_id
+                for field, value in values.items():
+                    deltas[scope][field] += sign * value
+
+    deltas = {
+        scope: {field: value for field, value in delta.items() if value} for scope, delta in deltas.items()
+    }
+    deltas = {scope: delta for scope, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    rebuild_projects = set()
+    with transaction.atomic():
+        _lock_projects({projects_by_scope[scope] for scope in deltas})
+        for scope, delta in deltas.items():
+            kind, pk = scope
+            rows = TaskCounter.objects.filter(sprint_id=pk) if kind == "sprint" else \
+                TaskCounter.objects.filter(project_id=pk, sprint__isnull=True)
+            if not rows.update(**{field: F(field) + value for field, value in delta.items()}):
+                # No row yet: build it from the (already updated) task table instead
+                rebuild_projects.add(projects_by_scope[scope])
+        if rebuild_projects:
+            rebuild(rebuild_projects)
+
+
+def apply_task_change(old, new):
+    apply_task_changes([(old, new)])
+
+
+def _aggregates(today):
+    aggregates = {"total": Count("id")}
+    for key, field in STATUS_FIELDS.items():
+        aggregates[field] = Count("id", filter=Q(status=key))
+    for key, field in PRIORITY_FIELDS.items():
+        aggregates[field] = Count("id", filter=Q(priority=key))
+    aggregates["overdue"] = Count("id", filter=Q(due_date__lt=today) & ~Q(status="done"))
+    return aggregates
+
+
+def sprint_annotations():
+    """`Sprint.objects.annotate(**...)` kwargs: per-status task counts and the latest task change."""
+    annotations = {"tasks_total": Count("tasks")}
+    for key, field in STATUS_FIELDS.items():
+        annotations[f"tasks_{field}"] = Count("tasks", filter=Q(tasks__status=key))
+    annotations["tasks_updated_at"] = Max("tasks__updated_at")
+    return annotations
+
+
+def grouped_counts(project_ids, today):
+    """One row per (project, sprint) with every counter field, in a single GROUP BY."""
+    return (
+        Task.objects.filter(project_id__in=project_ids)
+        .values("project_id", "sprint_id")
+        .annotate(**_aggregates(today))
+        .order_by()
+    )
+
+
+def compute(project_ids, today=None):
+    """Recount from the task table: {scope: {field: n}} for the projects and all of their sprints."""
+    today = today or timezone.now().date()
+    computed = {("project", pid): dict.fromkeys(COUNT_FIELDS, 0) for pid in project_ids}
+    for sid in Sprint.objects.filter(project_id__in=project_ids).values_list("id", flat=True):
+        computed[("sprint", sid)] = dict.fromkeys(COUNT_FIELDS, 0)
+    for group in grouped_counts(project_ids, today):
+        scopes = [("project", group["project_id"])]
+        if group["sprint_id"] is not None:
+            scopes.append(("sprint", group["sprint_id"]))
+        for scope in scopes:
+            counts = computed.setdefault(scope, dict.fromkeys(COUNT_FIELDS, 0))
+            for field in COUNT_FIELDS:
+                counts[field] += group[field]
+    return computed
+
+
+def rebuild(project_ids, check_only=False):
+    """Recompute the counters for `project_ids` and return the drift found.
+
+    Drift is a list of (scope, field, stored, actual) tuples for existing
+    rows; missing rows are not drift since reads build them on demand. With
+    `check_only` nothing is written.
+    """
+    project_ids = list(project_ids)
+    if check_only:
+        return _recount(project_ids, write=False)
+    with transaction.atomic():
+        _lock_projects(project_ids)
+        drift = _recount(project_ids, write=True)
+    if drift:
+        # Tasks were written without going through apply_task_changes (imports, repairs)
+        response_cache.bump_projects(project_ids)
+    return drift
+
+
+def _recount(project_ids, write):
+    today = timezone.now().date()
+    computed = compute(project_ids, today)
+    sprint_projects = dict(
+        Sprint.objects.filter(id__in=[pk for kind, pk in computed if kind == "sprint"]).values_list("id", "project_id")
+    )
+    existing = {}
+    for row in TaskCounter.objects.filter(Q(project_id__in=project_ids) | Q(sprint_id__in=sprint_projects)):
+        existing[("sprint", row.sprint_id) if row.sprint_id else ("project", row.project_id)] = row
+
+    drift, to_update, to_create = [], [], []
+    for scope, counts in computed.items():
+        row = existing.get(scope)
+        if row is None:
+            kind, pk = scope
+            row = TaskCounter(
+                project_id=sprint_projects[pk] if kind == "sprint" else pk,
+                sprint_id=pk if kind == "sprint" else None,
+            )
+            to_create.append(row)
+        else:
+            to_update.append(row)
+        for field in COUNT_FIELDS:
+            stored = getattr(row, field)
+            # A stale overdue count is expected, not drift: reads refresh it
+            stale = field == "overdue" and row.overdue_as_of != today
+            if row.pk and stored != counts[field] and not stale:
+                drift.append((scope, field, stored, counts[field]))
+            setattr(row, field, counts[field])
+        row.overdue_as_of = today
+
+    if write:
+        TaskCounter.objects.bulk_update(to_update, [*COUNT_FIELDS, "overdue_as_of"])
+        # No conflicts to ignore: rows are only created here, under the project lock
+        TaskCounter.objects.bulk_create(to_create)
+    return drift
+
+
+def _refresh_overdue(rows, today):
+    """Recount `overdue` for rows whose as-of date has passed (uses the open-task partial index).
+
+    Runs under the project lock like any other counter write, so it never
+    overwrites an increment that was uncommitted when the rows were read.
+    The rows are reloaded under the lock and only those still stale are
+    recounted; the given objects are updated in place either way.
+    """
+    with transaction.atomic():
+        _lock_projects({r.project_id for r in rows})
+        current = {r.pk: r for r in TaskCounter.objects.filter(pk__in=[r.pk for r in rows])}
+        stale = [r for r in current.values() if r.overdue_as_of != today]
+        if stale:
+            _recount_overdue(stale, today)
+    for row in rows:
+        fresh = current.get(row.pk)
+        if fresh is not None:
+            for field in [*COUNT_FIELDS, "overdue_as_of"]:
+                setattr(row, field, getattr(fresh, field))
+
+
+def _recount_overdue(rows, today):
+    project_rows = {r.project_id: r for r in rows if r.sprint_id is None}
+    sprint_rows = {r.sprint_id: r for r in rows if r.sprint_id is not None}
+    open_overdue = Task.objects.filter(due_date__lt=today).exclude(status="done")
+    counts = {}
+    if project_rows:
+        counts.update({
+            ("project", g["project_id"]): g["n"]
+            for g in open_overdue.filter(project_id__in=project_rows)
+            .values("project_id").annotate(n=Count("id")).order_by()
+        })
+    if sprint_rows:
+        counts.update({
+            ("sprint", g["sprint_id"]): g["n"]
+            for g in open_overdue.filter(sprint_id__in=sprint_rows)
+            .values("sprint_id").annotate(n=Count("id")).order_by()
+        })
+    for row in rows:
+        scope = ("sprint", row.sprint_id) if row.sprint_id else ("project", row.project_id)
+        row.overdue = counts.get(scope, 0)
+        row.overdue_as_of = today
+    TaskCounter.objects.bulk_update(rows, ["overdue", "overdue_as_of"])
+
+
+def project_counters(project_ids):
+    """{project_id: TaskCounter} for the project-wide rows, building missing ones on demand."""
+    project_ids = set(project_ids)
+    rows = {r.project_id: r for r in TaskCounter.objects.filter(project_id__in=project_ids, sprint__isnull=True)}
+    missing = project_ids - set(rows)
+    if missing:
+        rebuild(missing)
+        rows.update({r.project_id: r for r in TaskCounter.objects.filter(project_id__in=missing, sprint__isnull=True)})
+    _refresh_stale(rows.values())
+    return rows
+
+
+def sprint_counter(sprint):
+    row = TaskCounter.objects.filter(sprint=sprint).first()
+    if row is None:
+        rebuild([sprint.project_id])
+        row = TaskCounter.objects.get(sprint=sprint)
+    _refresh_stale([row])
+    return row
+
+
+async def aproject_counters(project_ids):
+    """`project_counters()` for async views: one async query when every row exists and is current.
+
+    Building missing rows or recounting `overdue` writes, so that rare case
+    runs the sync version in a thread.
+    """
+    project_ids = set(project_ids)
+    today = timezone.now().date()
+    rows = {
+        r.project_id: r
+        async for r in TaskCounter.objects.filter(project_id__in=project_ids, sprint__isnull=True)
+    }
+    if project_ids - set(rows) or any(r.overdue_as_of != today for r in rows.values()):
+        return await sync_to_async(project_counters)(project_ids)
+    return rows
+
+
+async def asprint_counter(sprint):
+    row = await TaskCounter.objects.filter(sprint=sprint).afirst()
+    if row is None or row.overdue_as_of != timezone.now().date():
+        return await sync_to_async(sprint_counter)(sprint)
+    return row
+
+
+def _refresh_stale(rows):
+    today = timezone.now().date()
+    stale = [r for r in rows if r.overdue_as_of != today]
+    if stale:
+        _refresh_overdue(stale, today)
+
+
+def counts_payload(row):
+    """Stats response body for one counter row."""
+    total = row.total
+    completed = row.status_done
+    return {
+        "total": total,
+        "completed": completed,
+        "in_progress": row.status_progress + row.status_review,
+        "progress": int(round((completed / total) * 100)) if total else 0,
+        # Team members count: default 4 as provided
+        "team_members": 4,
+        "overdue": row.overdue,
+        "by_status": {key: getattr(row, field) for key, field in STATUS_FIELDS.items()},
+        "by_priority": {key: getattr(row, field) for key, field in PRIORITY_FIELDS.items()},
+    }
@@ -0,0 +1,148 @@
+"""Bulk task import from CSV, JSON or JSON Lines into one project.
+
+Every row is validated first (`TaskImportRowSerializer`, reused for all
+rows), then sprints and assignees are checked for the whole file with one
+query each. Valid rows are inserted with `bulk_create` in chunks inside one
+transaction and the project's counters are recounted once at the end, and
+its cached responses invalidated. No
+per-task realtime events are published; clients pick imported tasks up
+through `/api/tasks/changes/`.
+
+Columns match the export (`tasks.export`), so an exported file imports as
+is: unknown columns such as `id` or `created_at` are ignored, and the
+assignee is taken from `assigned_to` (profile id) or `assignee` (username).
+"""
+
+import csv
+import io
+import json
+from collections import namedtuple
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from users.models import UserProfile
+
+from . import counters, response_cache
+from .models import Sprint, Task
+from .serializers import TaskImportRowSerializer
+
+# Per-row errors beyond this many are counted but not listed
+MAX_REPORTED_ERRORS = 1000
+
+ImportResult = namedtuple("ImportResult", ["total", "created", "errors", "error_count"])
+
+
+def read_rows(stream, filename=""):
+    """Row dicts from a binary file object; the format comes from the extension, else the first byte."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return _csv_rows(text)
+    if name.endswith((".jsonl", ".ndjson")):
+        return _jsonl_rows(text)
+    if name.endswith(".json"):
+        return _json_rows(text)
+    head = text.read(1)
+    rest = io.StringIO(head + text.read())
+    if head == "[":
+        return _json_rows(rest)
+    if head == "{":
+        return _jsonl_rows(rest)
+    return _csv_rows(rest)
+
+
+def _csv_rows(text):
+    # Blank cells mean "not given", so defaults apply as they would for JSON
+    for row in csv.DictReader(text):
+        yield {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def _json_rows(text):
+    data = json.load(text)
+    if isinstance(data, dict):
+        data = data.get("tasks", [])
+    yield from data
+
+
+def _jsonl_rows(text):
+    for line in text:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _row_errors(errors):
+    return errors if isinstance(errors, dict) else {"non_field_errors": errors}
+
+
+def import_tasks(project, rows, skip_invalid=False, dry_run=False, batch_size=2000):
+    """Validate and insert `rows` into `project`.
+
+    With invalid rows present nothing is inserted unless `skip_invalid`;
+    `dry_run` validates only. Row numbers in errors are 1-based data rows.
+    """
+    validator = TaskImportRowSerializer()
+    valid, errors, total = [], [], 0
+    for number, row in enumerate(rows, start=1):
+        total = number
+        if not isinstance(row, dict):
+            errors.append((number, {"non_field_errors": ["Expected an object"]}))
+            continue
+        try:
+            valid.append((number, validator.run_validation(row)))
+        except serializers.ValidationError as exc:
+            errors.append((number, _row_errors(exc.detail)))
+
+    # Set-based checks: one query per kind of reference for the whole file
+    sprint_ids = {data["sprint"] for _, data in valid if data.get("sprint") is not None}
+    known_sprints = set(Sprint.objects.filter(project=project, id__in=sprint_ids).values_list("id", flat=True))
+    profile_ids = {data["assigned_to"] for _, data in valid if data.get("assigned_to") is not None}
+    known_profiles = set(UserProfile.objects.filter(id__in=profile_ids).values_list("id", flat=True))
+    usernames = {data["assignee"] for _, data in valid if data.get("assignee") and data.get("assigned_to") is None}
+    profiles_by_name = dict(
+        UserProfile.objects.filter(user__username__in=usernames).values_list("user__username", "id")
+    )
+
+    now = timezone.now()
+    tasks = []
+    for number, data in valid:
+        row_errors = {}
+        sprint_id = data.get("sprint")
+        if sprint_id is not None and sprint_id not in known_sprints:
+            row_errors["sprint"] = ["Sprint not found in this project."]
+        assignee_id = data.get("assigned_to")
+        if assignee_id is not None and assignee_id not in known_profiles:
+            row_errors["assigned_to"] = ["Invalid user profile id"]
+        elif assignee_id is None and data.get("assignee"):
+            assignee_id = profiles_by_name.get(data["assignee"])
+            if assignee_id is None:
+                row_errors["assignee"] = ["Unknown username"]
+        if row_errors:
+            errors.append((number, row_errors))
+            continue
+        done = data["status"] == "done"
+        tasks.append(Task(
+            title=data["title"],
+            description=data["description"],
+            status=data["status"],
+            priority=data["priority"],
+            due_date=data.get("due_date"),
+            completed=done,
+            completed_at=(data.get("completed_at") or now) if done else None,
+            project=project,
+            sprint_id=sprint_id,
+            assigned_to_id=assignee_id,
+        ))
+
+    errors.sort()
+    reported = [{"row": number, "errors": row_errors} for number, row_errors in errors[:MAX_REPORTED_ERRORS]]
+    if dry_run or (errors and not skip_invalid) or not tasks:
+        return ImportResult(total, 0, reported, len(errors))
+    with transaction.atomic():
+        for start in range(0, len(tasks), batch_size):
+            Task.objects.bulk_create(tasks[start:start + batch_size])
+        counters.rebuild([project.id])
+        # rebuild() only bumps on drift, and the sprint list's embedded counts don't read the counters
+        response_cache.bump_projects([project.id])
+    return ImportResult(total, len(tasks), reported, len(errors))
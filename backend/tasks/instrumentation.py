@@ -0,0 +1,357 @@
+"""Sampled per-endpoint performance metrics.
+
+`PerformanceMiddleware` times a random `SAMPLE_RATE` share of requests and
+records, per endpoint (router basename and viewset action, e.g. `task.list`;
+the URL name for other views): wall time, DB query count and time (through
+`connection.execute_wrapper`), view time, render time (the DRF renderer)
+and response size. View time runs from the middleware's `process_view` hook
+to the view's return (`process_template_response` for DRF responses) minus
+the SQL run in between, so for the read endpoints it is mostly
+serialization. Sampled responses carry the same figures in a
+`Server-Timing` header, so browser dev tools show them. Unsampled requests
+are only counted; they pay for one random draw.
+
+`metrics` serves everything recorded in the Prometheus text format to
+scrapers presenting `Authorization: Bearer <METRICS_TOKEN>`, and to staff
+users signed in through the API's authentication classes. Figures are per
+process: with several workers, scrape each one or use one worker per port.
+"""
+
+import bisect
+import contextvars
+import hmac
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+DEFAULTS = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 0.05,
+    "SERVER_TIMING": True,
+    # Bearer token for Prometheus scrapes; unset, only staff users can read /metrics
+    "METRICS_TOKEN": None,
+}
+
+# Upper bounds (seconds) of the request duration histogram
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_sample = contextvars.ContextVar("perf_sample", default=None)
+
+
+def get_instrumentation_settings():
+    return {**DEFAULTS, **getattr(settings, "PERF_INSTRUMENTATION", {})}
+
+
+class Sample:
+    """Timings collected for one sampled request."""
+
+    __slots__ = ("queries", "db", "view", "render", "view_mark")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.view = 0.0
+        self.render = 0.0
+        # (start, db time so far) while the view runs
+        self.view_mark = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+    def start_view(self):
+        self.view_mark = (time.perf_counter(), self.db)
+
+    def end_view(self):
+        if self.view_mark is not None:
+            started, db = self.view_mark
+            self.view += max(0.0, time.perf_counter() - started - (self.db - db))
+            self.view_mark = None
+
+
+class Registry:
+    """Thread-safe per-process aggregates, keyed by endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.collectors = []
+        self.reset()
+
+    def add_collector(self, collect):
+        """Register `collect()`, called at scrape time; it returns (name, type, help, labels, value) tuples."""
+        if collect not in self.collectors:
+            self.collectors.append(collect)
+
+    def reset(self):
+        with self._lock:
+            self.seen = {}
+            self.sampled = {}
+            self.durations = {}
+            self.counters = {}
+
+    def inc(self, name, help_text, **labels):
+        """Add one to a labelled counter exported as `taskflow_<name>`; for other modules' metrics."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            values = self.counters.setdefault(name, (help_text, {}))[1]
+            values[key] = values.get(key, 0) + 1
+
+    def count(self, endpoint, method):
+        key = (endpoint, method)
+        with self._lock:
+            self.seen[key] = self.seen.get(key, 0) + 1
+
+    def record(self, endpoint, method, status, wall, sample, size):
+        with self._lock:
+            key = (endpoint, method, str(status))
+            row = self.sampled.get(key)
+            if row is None:
+                row = self.sampled[key] = {
+                    "requests": 0, "queries": 0, "db": 0.0, "view": 0.0, "render": 0.0, "bytes": 0,
+                }
+            row["requests"] += 1
+            row["queries"] += sample.queries
+            row["db"] += sample.db
+            row["view"] += sample.view
+            row["render"] += sample.render
+            row["bytes"] += size or 0
+            hist = self.durations.get(endpoint)
+            if hist is None:
+                hist = self.durations[endpoint] = [[0] * (len(BUCKETS) + 1), 0.0]
+            hist[0][bisect.bisect_left(BUCKETS, wall)] += 1
+            hist[1] += wall
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            seen = dict(self.seen)
+            sampled = {key: dict(row) for key, row in self.sampled.items()}
+            durations = {key: (list(hist[0]), hist[1]) for key, hist in self.durations.items()}
+            extra = {name: (help_text, dict(values)) for name, (help_text, values) in self.counters.items()}
+
+        def labels(**values):
+            return ",".join(f'{name}="{_escape(value)}"' for name, value in values.items())
+
+        lines = [
+            "# HELP taskflow_requests_total Requests handled, sampled or not.",
+            "# TYPE taskflow_requests_total counter",
+        ]
+        for (endpoint, method), n in sorted(seen.items()):
+            lines.append(f"taskflow_requests_total{{{labels(endpoint=endpoint, method=method)}}} {n}")
+
+        sums = [
+            ("sampled_requests_total", "requests", "Requests that were sampled for timing."),
+            ("db_queries_total", "queries", "SQL queries run by sampled requests."),
+            ("db_seconds_total", "db", "Time spent in SQL by sampled requests."),
+            ("view_seconds_total", "view", "Time spent in view code outside SQL (mostly serialization) by sampled requests."),
+            ("render_seconds_total", "render", "Time spent in the response renderer by sampled requests."),
+            ("response_bytes_total", "bytes", "Body bytes of sampled, non-streaming responses."),
+        ]
+        for name, field, help_text in sums:
+            lines.append(f"# HELP taskflow_{name} {help_text}")
+            lines.append(f"# TYPE taskflow_{name} counter")
+            for (endpoint, method, status), row in sorted(sampled.items()):
+                value = labels(endpoint=endpoint, method=method, status=status)
+                lines.append(f"taskflow_{name}{{{value}}} {_number(row[field])}")
+
+        lines.append("# HELP taskflow_request_duration_seconds Wall time of sampled requests.")
+        lines.append("# TYPE taskflow_request_duration_seconds histogram")
+        for endpoint, (counts, total) in sorted(durations.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(
+                    f"taskflow_request_duration_seconds_bucket{{{labels(endpoint=endpoint, le=le)}}} {cumulative}"
+                )
+            lines.append(f"taskflow_request_duration_seconds_sum{{{labels(endpoint=endpoint)}}} {_number(total)}")
+            lines.append(f"taskflow_request_duration_seconds_count{{{labels(endpoint=endpoint)}}} {cumulative}")
+        for name, (help_text, values) in sorted(extra.items()):
+            lines.append(f"# HELP taskflow_{name} {help_text}")
+            lines.append(f"# TYPE taskflow_{name} counter")
+            for key, n in sorted(values.items()):
+                lines.append(f"taskflow_{name}{{{labels(**dict(key))}}} {n}")
+
+        declared = set()
+        for collect in self.collectors:
+            for name, kind, help_text, values, value in collect():
+                if name not in declared:
+                    declared.add(name)
+                    lines.append(f"# HELP taskflow_{name} {help_text}")
+                    lines.append(f"# TYPE taskflow_{name} {kind}")
+                lines.append(f"taskflow_{name}{{{labels(**values)}}} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+
+def endpoint_name(request, view_func):
+    """`<basename>.<action>` for router viewsets, else the URL name."""
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        basename = getattr(view_func, "initkwargs", {}).get("basename") or view_func.cls.__name__
+        return f"{basename}.{actions.get(request.method.lower(), request.method.lower())}"
+    match = request.resolver_match
+    return (match and match.view_name) or "unnamed"
+
+
+def _timed_execute(execute, sql, params, many, context):
+    """Execute wrapper on every connection; times queries run on behalf of a sampled request.
+
+    The sample travels in a context variable, which asgiref copies into
+    `sync_to_async` threads, so queries an async view runs through the async
+    ORM (or a sync view run from ASGI) count toward their request.
+    """
+    sample = _sample.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    return sample(execute, sql, params, many, context)
+
+
+def _install_query_timing(connection, **kwargs):
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+def install_query_timing():
+    """Add `_timed_execute` to this thread's connections and every connection opened later."""
+    connection_created.connect(_install_query_timing, dispatch_uid="perf_query_timing")
+    for connection in connections.all(initialized_only=True):
+        _install_query_timing(connection)
+
+
+def _endpoint(request):
+    match = request.resolver_match
+    return endpoint_name(request, match.func) if match else "unmatched"
+
+
+class PerformanceMiddleware:
+    """Samples requests for the per-endpoint metrics above; place it first in MIDDLEWARE.
+
+    Works in both sync and async chains, so it doesn't push async views
+    under ASGI back onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        conf = get_instrumentation_settings()
+        self.enabled = conf["ENABLED"]
+        self.sample_rate = conf["SAMPLE_RATE"]
+        self.server_timing = conf["SERVER_TIMING"]
+        if self.enabled:
+            install_query_timing()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled or random.random() >= self.sample_rate:
+            response = self.get_response(request)
+            if self.enabled:
+                registry.count(_endpoint(request), request.method)
+            return response
+        sample = Sample()
+        token = _sample.set(sample)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _sample.reset(token)
+        return self._finish(request, response, sample, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self.enabled or random.random() >= self.sample_rate:
+            response = await self.get_response(request)
+            if self.enabled:
+                registry.count(_endpoint(request), request.method)
+            return response
+        sample = Sample()
+        token = _sample.set(sample)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _sample.reset(token)
+        return self._finish(request, response, sample, time.perf_counter() - start)
+
+    def _finish(self, request, response, sample, wall):
+        # Views that don't return a template response end here
+        sample.end_view()
+        endpoint = _endpoint(request)
+        size = None if response.streaming else len(response.content)
+        registry.count(endpoint, request.method)
+        registry.record(endpoint, request.method, response.status_code, wall, sample, size)
+        if self.server_timing:
+            response["Server-Timing"] = ", ".join([
+                f'db;dur={sample.db * 1000:.2f};desc="{sample.queries} queries"',
+                f"view;dur={sample.view * 1000:.2f}",
+                f"render;dur={sample.render * 1000:.2f}",
+                f"total;dur={wall * 1000:.2f}",
+            ])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        sample = _sample.get()
+        if sample is not None:
+            sample.start_view()
+        return None
+
+    def process_template_response(self, request, response):
+        # DRF responses render right after the last of these hooks; time the render
+        sample = _sample.get()
+        if sample is not None:
+            sample.end_view()
+            started = time.perf_counter()
+
+            def rendered(response):
+                sample.render += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+def _metrics_allowed(request):
+    token = get_instrumentation_settings()["METRICS_TOKEN"]
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if token and scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode()):
+        return True
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        return drf_request.user.is_staff
+    except exceptions.AuthenticationFailed:
+        return False
+
+
+def metrics(request):
+    """Prometheus scrape target; needs the METRICS_TOKEN bearer token or a staff user."""
+    if not _metrics_allowed(request):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": 'Bearer realm="metrics"'})
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,149 @@
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from tasks import benchmark
+from users.models import User
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(benchmark.__file__), "bench_baseline.json")
+
+
+class Rollback(Exception):
+    pass
+
+
+class ClientDriver:
+    """Runs requests through the DRF test client and counts their SQL.
+
+    Use as a context manager: while open it admits the test client's host
+    and writes analytics events synchronously. Requests run inside the
+    seeding transaction, so on-commit callbacks run after each request as if
+    it had committed.
+    """
+
+    def __init__(self, user):
+        from rest_framework.test import APIClient
+
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self._settings = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            # The buffer's writer thread can't see the uncommitted seed data
+            ANALYTICS_BUFFER={**getattr(settings, "ANALYTICS_BUFFER", {}), "ENABLED": False},
+        )
+
+    def __enter__(self):
+        self._settings.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._settings.disable()
+
+    def request(self, method, url, data):
+        # The seed data lives in an uncommitted transaction; run each request's
+        # on-commit work (cache invalidation, realtime events) as a commit would
+        with TestCase.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = getattr(self.client, method)(url, data, format="json")
+            elapsed = time.perf_counter() - started
+        return response.status_code, elapsed, len(ctx.captured_queries)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a deterministic data set, replay board/move/stats/search scenarios against the API "
+        "and report per-endpoint p50/p99 latency and queries per request. Fails when a baseline "
+        "is exceeded. In-process runs seed inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(benchmark.SCALES), default="small")
+        parser.add_argument("--tasks", type=int, help="Override the scale's task count.")
+        parser.add_argument("--events", type=int, help="Override the scale's analytics event count.")
+        parser.add_argument("--scenario", action="append", choices=benchmark.SCENARIOS,
+                            help="Scenario to run (repeatable; default all).")
+        parser.add_argument("--iterations", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=13)
+        parser.add_argument("--baseline", help=(
+            "Baseline JSON (default: tasks/bench_baseline.json in-process; none over HTTP, "
+            "whose latencies include the network)."
+        ))
+        parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline.")
+        parser.add_argument("--tolerance", type=float, default=2.0, help="Allowed latency factor over the baseline.")
+        parser.add_argument("--queries-only", action="store_true", help="Only check queries per request.")
+        parser.add_argument("--seed-only", action="store_true", help="Seed and keep the data, run nothing.")
+        parser.add_argument("--base-url", help="Benchmark a running server (data from an earlier --seed-only).")
+
+    def handle(self, *args, **opts):
+        if opts["baseline"] is None and not opts["base_url"]:
+            opts["baseline"] = DEFAULT_BASELINE
+        if opts["base_url"]:
+            owner = User.objects.filter(username=f"{benchmark.USERNAME_PREFIX}0").first()
+            if owner is None:
+                raise CommandError("No benchmark data; run bench_api --seed-only against the server's database first.")
+            token, _ = Token.objects.get_or_create(user=owner)
+            driver = benchmark.HttpDriver(opts["base_url"], token.key)
+            self._report(benchmark.run(
+                driver, benchmark.load_dataset(owner), opts["scenario"] or benchmark.SCENARIOS,
+                iterations=opts["iterations"], seed=opts["seed"],
+            ), opts)
+            return
+        if opts["seed_only"]:
+            with transaction.atomic():
+                self._seed(opts)
+            return
+        results = None
+        try:
+            with transaction.atomic():
+                data = self._seed(opts)
+                with ClientDriver(data.owner) as driver:
+                    results = benchmark.run(
+                        driver, data, opts["scenario"] or benchmark.SCENARIOS,
+                        iterations=opts["iterations"], seed=opts["seed"],
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+        self._report(results, opts)
+
+    def _seed(self, opts):
+        if User.objects.filter(username__startswith=benchmark.USERNAME_PREFIX).exists():
+            raise CommandError("Benchmark users already exist in this database.")
+        scale = dict(benchmark.SCALES[opts["scale"]])
+        for name in ("tasks", "events"):
+            if opts[name] is not None:
+                scale[name] = opts[name]
+        return benchmark.seed(**scale, seed=opts["seed"], log=self.stdout.write)
+
+    def _report(self, results, opts):
+        self.stdout.write(f"{'endpoint':<28} {'n':>5} {'p50 ms':>9} {'p99 ms':>9} {'queries':>8}")
+        for result in results:
+            queries = "-" if result.queries is None else result.queries
+            self.stdout.write(
+                f"{result.endpoint:<28} {result.count:>5} {result.p50_ms:>9.2f} {result.p99_ms:>9.2f} {queries:>8}"
+            )
+        if opts["baseline"] is None:
+            return
+        if opts["update_baseline"]:
+            with open(opts["baseline"], "w") as fh:
+                json.dump(benchmark.to_baseline(results), fh, indent=2, sort_keys=True)
+                fh.write("\n")
+            self.stdout.write(f"Baseline written to {opts['baseline']}")
+            return
+        if not os.path.exists(opts["baseline"]):
+            self.stdout.write("No baseline file; nothing checked.")
+            return
+        failures = benchmark.check(
+            results, benchmark.load_baseline(opts["baseline"]),
+            tolerance=opts["tolerance"], latency=not opts["queries_only"],
+        )
+        if failures:
+            raise CommandError("Benchmark regressions:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("Within baseline."))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from tasks import benchmark
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second of the sync read endpoints (/api/) on a WSGI server with the "
+        "async ones (/api/async/) on an ASGI server, under the same concurrent read load. "
+        "Uses the data of an earlier `bench_api --seed-only`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync-url", required=True, help="WSGI server, e.g. gunicorn backend.wsgi.")
+        parser.add_argument("--async-url", required=True, help="ASGI server, e.g. uvicorn backend.asgi:application.")
+        parser.add_argument("--concurrency", type=int, action="append",
+                            help="Concurrent clients (repeatable; default 8, 32 and 128).")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run.")
+        parser.add_argument("--seed", type=int, default=13)
+
+    def handle(self, *args, **opts):
+        owner = User.objects.filter(username=f"{benchmark.USERNAME_PREFIX}0").first()
+        if owner is None:
+            raise CommandError("No benchmark data; run bench_api --seed-only against the servers' database first.")
+        token, _ = Token.objects.get_or_create(user=owner)
+        data = benchmark.load_dataset(owner)
+        sides = [
+            ("sync", benchmark.HttpDriver(opts["sync_url"], token.key), "/api/"),
+            ("async", benchmark.HttpDriver(opts["async_url"], token.key), "/api/async/"),
+        ]
+        self.stdout.write(f"{'clients':>7} {'side':<6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for concurrency in opts["concurrency"] or [8, 32, 128]:
+            for label, driver, prefix in sides:
+                result = benchmark.throughput(
+                    driver, data, label, prefix,
+                    concurrency=concurrency, duration=opts["duration"], seed=opts["seed"],
+                )
+                self.stdout.write(
+                    f"{concurrency:>7} {result.label:<6} {result.requests:>9} {result.errors:>7} "
+                    f"{result.rps:>9.1f} {result.p50_ms:>9.2f} {result.p99_ms:>9.2f}"
+                )
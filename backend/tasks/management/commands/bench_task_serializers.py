@@ -0,0 +1,98 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from tasks.models import Project, Sprint, Task
+from tasks.serializers import TaskRowSerializer, TaskSerializer
+from users.models import User, UserProfile
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare TaskSerializer with the TaskRowSerializer list fast path on seeded tasks: "
+        "checks the rendered JSON is byte-identical and reports timings. "
+        "Seed data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("sizes", nargs="*", type=int, default=[10_000, 100_000])
+        parser.add_argument("--assignees", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing.")
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                self._run(opts)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, opts):
+        rng = random.Random(13)
+        owner = User.objects.create_user("bench-serializer-owner")
+        users = User.objects.bulk_create([User(username=f"bench-serializer-{i}", password="!") for i in range(opts["assignees"])])
+        profiles = UserProfile.objects.bulk_create([UserProfile(user=u, bio=f"bio {u.username}") for u in users])
+        request = Request(RequestFactory().get("/api/tasks/"))
+        context = {"request": request}
+        renderer = JSONRenderer()
+        now = timezone.now()
+
+        for size in sorted(opts["sizes"]):
+            project = Project.objects.create(name=f"bench {size}", owner=owner)
+            sprint = Sprint.objects.create(name="bench", project=project)
+            Task.objects.bulk_create(
+                [
+                    Task(
+                        title=f"Task {n}",
+                        description="x" * rng.randint(0, 200),
+                        status=rng.choice(["todo", "progress", "review", "done"]),
+                        priority=rng.choice(["highest", "high", "medium", "low", "lowest"]),
+                        due_date=(now + timedelta(days=rng.randint(-30, 30))).date() if rng.random() < 0.5 else None,
+                        completed_at=now if rng.random() < 0.3 else None,
+                        project=project,
+                        sprint=sprint if rng.random() < 0.5 else None,
+                        assigned_to=rng.choice(profiles) if rng.random() < 0.7 else None,
+                    )
+                    for n in range(size)
+                ],
+                batch_size=5000,
+            )
+            tasks = Task.objects.filter(project=project).order_by("id")
+
+            def full():
+                qs = tasks.select_related("project", "assigned_to__user", "sprint")
+                return renderer.render(TaskSerializer(qs, many=True, context=context).data)
+
+            def fast():
+                rows = tasks.values(*TaskRowSerializer.columns())
+                return renderer.render(TaskRowSerializer(rows, context=context).data)
+
+            full_time, full_body = self._best_of(full, opts["repeat"])
+            fast_time, fast_body = self._best_of(fast, opts["repeat"])
+            if full_body != fast_body:
+                raise CommandError(f"Fast path output differs from TaskSerializer at {size} tasks")
+            self.stdout.write(
+                f"{size:>8} tasks: TaskSerializer {full_time * 1000:8.1f} ms | "
+                f"fast path {fast_time * 1000:8.1f} ms | {full_time / fast_time:4.1f}x | "
+                f"{len(fast_body) / 1e6:.1f} MB, identical"
+            )
+
+    def _best_of(self, fn, repeat):
+        best, body = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = fn()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
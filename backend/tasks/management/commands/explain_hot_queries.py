@@ -0,0 +1,76 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from analytics.models import AnalyticsRecord
+from tasks.models import Project, Task, TaskCounter
+from tasks.counters import grouped_counts
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Print query plans for the hot task/sprint/analytics queries. "
+        "With --compare, also plan them with the composite indexes temporarily "
+        "dropped (inside a rolled-back transaction) to show the difference. "
+        "Intended for a seeded benchmark database (see seed_tasks)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username to plan queries for (default: owner of the most tasks).")
+        parser.add_argument("--analyze", action="store_true", help="Run EXPLAIN ANALYZE (PostgreSQL only).")
+        parser.add_argument("--compare", action="store_true", help="Also plan without the custom indexes.")
+
+    def handle(self, *args, **opts):
+        user = self._pick_user(opts["user"])
+        queries = self._queries(user)
+        explain_opts = {"analyze": True} if opts["analyze"] and connection.vendor == "postgresql" else {}
+
+        if opts["compare"]:
+            self.stdout.write(self.style.MIGRATE_HEADING("=== Without composite indexes ==="))
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for index in self._custom_indexes():
+                        cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+                self._explain(queries, explain_opts)
+                transaction.set_rollback(True)
+            self.stdout.write(self.style.MIGRATE_HEADING("=== With composite indexes ==="))
+        self._explain(queries, explain_opts)
+
+    def _pick_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User {username!r} not found")
+        busiest = Task.objects.values("project__owner").annotate(n=Count("id")).order_by("-n").first()
+        if busiest is None:
+            raise CommandError("No tasks found; run seed_tasks first")
+        return User.objects.get(id=busiest["project__owner"])
+
+    def _queries(self, user):
+        project = Project.objects.filter(owner=user).first()
+        sprint = project.sprints.first() if project else None
+        today = timezone.now().date()
+        return {
+            "project list": Project.objects.filter(owner=user).order_by("-created_at"),
+            "board column": Task.objects.filter(project=project, project__owner=user, status="todo"),
+            "project stats": TaskCounter.objects.filter(project__owner=user, sprint__isnull=True),
+            "project stats recount": grouped_counts(Project.objects.filter(owner=user).values("id"), today),
+            "sprint tasks": Task.objects.filter(sprint=sprint, project__owner=user),
+            "overdue open tasks": Task.objects.filter(project=project, due_date__lt=today).exclude(status="done"),
+            "analytics feed": AnalyticsRecord.objects.filter(user__user=user).order_by("-timestamp")[:50],
+        }
+
+    def _custom_indexes(self):
+        for label in ("tasks", "analytics"):
+            for model in apps.get_app_config(label).get_models():
+                yield from model._meta.indexes
+
+    def _explain(self, queries, explain_opts):
+        for name, qs in queries.items():
+            self.stdout.write(self.style.SQL_KEYWORD(f"-- {name}"))
+            self.stdout.write(qs.explain(**explain_opts))
+            self.stdout.write("")
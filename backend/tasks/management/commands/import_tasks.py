@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import importer
+from tasks.models import Project
+
+
+class Command(BaseCommand):
+    help = "Import tasks into a project from a CSV, JSON or JSON Lines file (validated, then bulk inserted)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import; the format comes from the extension.")
+        parser.add_argument("--project", type=int, required=True, help="Project id to import into.")
+        parser.add_argument("--skip-invalid", action="store_true", help="Import valid rows even if some fail.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only.")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Tasks per INSERT.")
+
+    def handle(self, *args, **opts):
+        try:
+            project = Project.objects.get(id=opts["project"])
+        except Project.DoesNotExist:
+            raise CommandError(f"Project {opts['project']} does not exist")
+        started = time.perf_counter()
+        try:
+            with open(opts["path"], "rb") as fh:
+                result = importer.import_tasks(
+                    project,
+                    importer.read_rows(fh, opts["path"]),
+                    skip_invalid=opts["skip_invalid"],
+                    dry_run=opts["dry_run"],
+                    batch_size=opts["batch_size"],
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {opts['path']}: {exc}")
+        elapsed = time.perf_counter() - started
+
+        for error in result.errors:
+            self.stdout.write(f"row {error['row']}: {error['errors']}")
+        if result.error_count > len(result.errors):
+            self.stdout.write(f"... and {result.error_count - len(result.errors)} more invalid rows")
+        summary = f"{result.created} of {result.total} rows imported into project {project.id} in {elapsed:.1f}s"
+        if result.error_count and not result.created and not opts["dry_run"]:
+            raise CommandError(f"{summary}; {result.error_count} invalid rows (use --skip-invalid to import the rest)")
+        self.stdout.write(self.style.SUCCESS(f"{summary} ({result.error_count} invalid)."))
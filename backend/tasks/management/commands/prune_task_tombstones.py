@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tasks import sync
+
+
+class Command(BaseCommand):
+    help = "Delete delta-sync task tombstones older than the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Override TASK_TOMBSTONE_RETENTION_DAYS.")
+
+    def handle(self, *args, **opts):
+        older_than = timedelta(days=opts["days"]) if opts["days"] is not None else None
+        deleted = sync.prune_tombstones(older_than)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones."))
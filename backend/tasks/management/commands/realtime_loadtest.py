@@ -0,0 +1,95 @@
+import asyncio
+import json
+import statistics
+import time
+
+from asgiref.testing import ApplicationCommunicator
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from tasks.models import Project
+from tasks.realtime import get_broker, project_channel
+from tasks.websocket import websocket_application
+
+
+class Command(BaseCommand):
+    help = (
+        "Fan-out load test for live board updates: open N websocket subscribers on one "
+        "project through the real ASGI websocket app (in-process), publish events from a "
+        "worker thread as the views do, and report delivery latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, required=True, help="Project to subscribe to (its owner's token is used).")
+        parser.add_argument("--subscribers", type=int, default=1000)
+        parser.add_argument("--events", type=int, default=50)
+        parser.add_argument("--interval", type=float, default=0.05, help="Seconds between events (0 for one burst).")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each delivery.")
+
+    def handle(self, *args, **opts):
+        try:
+            project = Project.objects.select_related("owner").get(id=opts["project"])
+        except Project.DoesNotExist:
+            raise CommandError(f"Project {opts['project']} not found")
+        token, _ = Token.objects.get_or_create(user=project.owner)
+        asyncio.run(self._run(project.id, token.key, opts["subscribers"], opts["events"], opts["interval"], opts["timeout"]))
+
+    async def _run(self, project_id, token, subscribers, events, interval, timeout):
+        scope = {
+            "type": "websocket",
+            "path": f"/ws/projects/{project_id}/",
+            "query_string": f"token={token}".encode(),
+        }
+        started = time.perf_counter()
+        clients = []
+        for _ in range(subscribers):
+            client = ApplicationCommunicator(websocket_application, dict(scope))
+            await client.send_input({"type": "websocket.connect"})
+            reply = await client.receive_output(timeout)
+            if reply["type"] != "websocket.accept":
+                raise CommandError(f"Connection rejected: {reply}")
+            clients.append(client)
+        connect_time = time.perf_counter() - started
+        self.stdout.write(f"Connected {subscribers} subscribers in {connect_time:.2f}s")
+
+        broker = get_broker()
+        channel = project_channel(project_id)
+        loop = asyncio.get_running_loop()
+        latencies = []
+
+        async def drain(client):
+            for _ in range(events):
+                message = await client.receive_output(timeout)
+                received = time.perf_counter()
+                latencies.append(received - json.loads(message["text"])["task"]["sent_at"])
+
+        def publish_all():
+            for n in range(events):
+                broker.publish(channel, {
+                    "type": "task.updated",
+                    "project": project_id,
+                    "task": {"id": n, "sent_at": time.perf_counter()},
+                })
+                if interval:
+                    time.sleep(interval)
+
+        started = time.perf_counter()
+        await asyncio.gather(loop.run_in_executor(None, publish_all), *(drain(c) for c in clients))
+        elapsed = time.perf_counter() - started
+
+        for client in clients:
+            await client.send_input({"type": "websocket.disconnect", "code": 1000})
+            await client.wait(timeout)
+
+        latencies.sort()
+        deliveries = len(latencies)
+        self.stdout.write(f"Delivered {deliveries} messages ({events} events x {subscribers} subscribers) in {elapsed:.2f}s")
+        self.stdout.write(f"Throughput: {deliveries / elapsed:,.0f} messages/s")
+        self.stdout.write(
+            "Latency ms: p50={:.2f} p99={:.2f} max={:.2f} mean={:.2f}".format(
+                latencies[deliveries // 2] * 1000,
+                latencies[min(deliveries - 1, int(deliveries * 0.99))] * 1000,
+                latencies[-1] * 1000,
+                statistics.fmean(latencies) * 1000,
+            )
+        )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import counters
+from tasks.models import Project
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalised TaskCounter rows from the task table, or check them for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, action="append", dest="projects", help="Limit to these project ids.")
+        parser.add_argument("--check", action="store_true", help="Only report drift; exit non-zero if any is found.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Projects recounted per query.")
+
+    def handle(self, *args, **opts):
+        qs = Project.objects.order_by("id")
+        if opts["projects"]:
+            qs = qs.filter(id__in=opts["projects"])
+        project_ids = list(qs.values_list("id", flat=True))
+        batch_size = opts["batch_size"]
+
+        drift = []
+        for start in range(0, len(project_ids), batch_size):
+            drift.extend(counters.rebuild(project_ids[start:start + batch_size], check_only=opts["check"]))
+
+        for (kind, pk), field, stored, actual in drift:
+            self.stdout.write(f"{kind} {pk}: {field} stored={stored} actual={actual}")
+        if opts["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} drifted counter values across {len(project_ids)} projects")
+            self.stdout.write(self.style.SUCCESS(f"No drift across {len(project_ids)} projects."))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt counters for {len(project_ids)} projects ({len(drift)} values corrected)."
+            ))
@@ -0,0 +1,100 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.models import Project, Sprint, Task
+from users.models import User, UserProfile
+
+
+STATUSES = [choice for choice, _ in Task.STATUS_CHOICES]
+PRIORITIES = [choice for choice, _ in Task.PRIORITY_CHOICES]
+
+
+class Command(BaseCommand):
+    help = "Seed a benchmark database with users, projects, sprints and tasks (bulk inserts)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--projects-per-user", type=int, default=20)
+        parser.add_argument("--sprints-per-project", type=int, default=5)
+        parser.add_argument("--tasks", type=int, default=1_000_000, help="Total number of tasks to create.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, so runs are reproducible.")
+        parser.add_argument("--prefix", default="bench", help="Username prefix for seeded users.")
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        batch_size = opts["batch_size"]
+        prefix = opts["prefix"]
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [User(username=f"{prefix}-{i}", password="!") for i in range(opts["users"])],
+                batch_size=batch_size,
+            )
+            UserProfile.objects.bulk_create([UserProfile(user=u) for u in users], batch_size=batch_size)
+            users = list(User.objects.filter(username__startswith=f"{prefix}-"))
+            profile_ids = list(UserProfile.objects.filter(user__in=users).values_list("id", flat=True))
+
+            Project.objects.bulk_create(
+                [
+                    Project(name=f"{u.username} project {i}", owner=u)
+                    for u in users
+                    for i in range(opts["projects_per_user"])
+                ],
+                batch_size=batch_size,
+            )
+            project_ids = list(Project.objects.filter(owner__in=users).values_list("id", flat=True))
+
+            today = timezone.now().date()
+            Sprint.objects.bulk_create(
+                [
+                    Sprint(
+                        name=f"Sprint {i + 1}",
+                        project_id=pid,
+                        status=rng.choice(["planned", "active", "completed"]),
+                        start_date=today - timedelta(days=14 * (i + 1)),
+                        end_date=today - timedelta(days=14 * i),
+                    )
+                    for pid in project_ids
+                    for i in range(opts["sprints_per_project"])
+                ],
+                batch_size=batch_size,
+            )
+            sprints_by_project = {}
+            for sid, pid in Sprint.objects.filter(project_id__in=project_ids).values_list("id", "project_id"):
+                sprints_by_project.setdefault(pid, []).append(sid)
+
+        total = opts["tasks"]
+        created = 0
+        now = timezone.now()
+        # Each chunk commits on its own so memory stays flat for millions of rows
+        while created < total:
+            chunk = []
+            for n in range(created, min(created + batch_size, total)):
+                pid = rng.choice(project_ids)
+                status = rng.choice(STATUSES)
+                sprint_ids = sprints_by_project.get(pid)
+                chunk.append(Task(
+                    title=f"Task {n}",
+                    status=status,
+                    completed=status == "done",
+                    completed_at=now if status == "done" else None,
+                    priority=rng.choice(PRIORITIES),
+                    due_date=today + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.5 else None,
+                    project_id=pid,
+                    sprint_id=rng.choice(sprint_ids) if sprint_ids and rng.random() < 0.6 else None,
+                    assigned_to_id=rng.choice(profile_ids) if profile_ids and rng.random() < 0.7 else None,
+                ))
+            Task.objects.bulk_create(chunk, batch_size=batch_size)
+            created += len(chunk)
+            self.stdout.write(f"\r{created}/{total} tasks", ending="")
+            self.stdout.flush()
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users, {len(project_ids)} projects and {total} tasks."
+        ))
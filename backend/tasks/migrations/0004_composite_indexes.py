@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+import tasks.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0003_sprint_task_sprint'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        tasks.operations.AddIndexConcurrently(
+            model_name='project',
+            index=models.Index(fields=['owner', '-created_at'], name='project_owner_created_idx'),
+        ),
+        tasks.operations.AddIndexConcurrently(
+            model_name='sprint',
+            index=models.Index(fields=['project', '-created_at'], name='sprint_project_created_idx'),
+        ),
+        tasks.operations.AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+        ),
+        tasks.operations.AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['sprint', 'status'], name='task_sprint_status_idx'),
+        ),
+        tasks.operations.AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'done'), _negated=True), fields=['project', 'due_date'], name='task_open_project_due_idx'),
+        ),
+    ]
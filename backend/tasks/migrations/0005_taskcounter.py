@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.IntegerField(default=0)),
+                ('status_todo', models.IntegerField(default=0)),
+                ('status_progress', models.IntegerField(default=0)),
+                ('status_review', models.IntegerField(default=0)),
+                ('status_done', models.IntegerField(default=0)),
+                ('priority_highest', models.IntegerField(default=0)),
+                ('priority_high', models.IntegerField(default=0)),
+                ('priority_medium', models.IntegerField(default=0)),
+                ('priority_low', models.IntegerField(default=0)),
+                ('priority_lowest', models.IntegerField(default=0)),
+                ('overdue', models.IntegerField(default=0)),
+                ('overdue_as_of', models.DateField(blank=True, null=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='tasks.project')),
+                ('sprint', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='tasks.sprint')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('sprint__isnull', True)), fields=('project',), name='taskcounter_unique_project'), models.UniqueConstraint(condition=models.Q(('sprint__isnull', False)), fields=('sprint',), name='taskcounter_unique_sprint')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:06
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+import tasks.operations
+
+BACKFILL_BATCH = 10000
+
+BACKFILL_SQL = """
+    UPDATE tasks_task SET search_vector =
+        setweight(to_tsvector('pg_catalog.english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(description, '')), 'B')
+    WHERE id >= %s AND id < %s AND search_vector IS NULL
+"""
+
+
+def backfill_search_vector(apps, schema_editor):
+    """Fill search_vector for rows written before the trigger, one id range per transaction.
+
+    Runs before the GIN indexes exist, and commits every batch (the migration
+    isn't atomic), so no row stays locked for more than one batch.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM tasks_task")
+        lowest, highest = cursor.fetchone()
+        if lowest is None:
+            return
+        for start in range(lowest, highest + 1, BACKFILL_BATCH):
+            cursor.execute(BACKFILL_SQL, [start, start + BACKFILL_BATCH])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0009_task_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+        tasks.operations.AddPostgreSQLIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+        ),
+        tasks.operations.AddPostgreSQLIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='task_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
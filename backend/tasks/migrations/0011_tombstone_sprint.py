@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='sprint_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
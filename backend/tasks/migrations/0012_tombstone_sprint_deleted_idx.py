@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:43
+
+from django.db import migrations, models
+
+import tasks.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0011_tombstone_sprint'),
+    ]
+
+    operations = [
+        tasks.operations.AddIndexConcurrently(
+            model_name='tasktombstone',
+            index=models.Index(fields=['sprint_id', 'deleted_at'], name='tombstone_sprint_deleted_idx'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -8,6 +10,13 @@ class Project(models.Model):
     color = models.CharField(max_length=64, default="bg-primary")
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="projects")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # ProjectViewSet lists a user's projects newest first
+            models.Index(fields=["owner", "-created_at"], name="project_owner_created_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -27,6 +36,12 @@ class Sprint(models.Model):
     end_date = models.DateField(null=True, blank=True)
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="sprints")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "-created_at"], name="sprint_project_created_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -63,6 +78,27 @@ class Task(models.Model):
     assigned_to = models.ForeignKey('users.UserProfile', on_delete=models.SET_NULL, null=True, blank=True)
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="tasks", null=True, blank=True)
     sprint = models.ForeignKey('Sprint', on_delete=models.SET_NULL, null=True, blank=True, related_name="tasks")
+    # Weighted title (A) + description (B) tsvector, kept current by a PostgreSQL
+    # trigger (migration 0008); stays NULL on other databases. Not serialized.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Board columns and per-project stats filter on (project, status)
+            models.Index(fields=["project", "status"], name="task_project_status_idx"),
+            models.Index(fields=["sprint", "status"], name="task_sprint_status_idx"),
+            # Collection ETags take max(updated_at) per project
+            models.Index(fields=["project", "updated_at"], name="task_project_updated_idx"),
+            # Open work only: due-date / overdue lookups never need finished tasks
+            models.Index(
+                fields=["project", "due_date"],
+                condition=~models.Q(status="done"),
+                name="task_open_project_due_idx",
+            ),
+            # tasks.search: full-text and trigram title matching (PostgreSQL only, see migration 0008)
+            GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+            GinIndex(fields=["title"], name="task_title_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return self.title
@@ -72,4 +108,66 @@ class Task(models.Model):
         self.status = "done"
         self.completed = True
         if not self.completed_at:
-            self.completed_at = timezone.now()
\ No newline at end of file
+            self.completed_at = timezone.now()
+
+
+class TaskTombstone(models.Model):
+    """Records a task leaving a project or sprint (deleted or moved) so delta sync can report it.
+
+    `sprint_id` is the sprint the task left, kept as a plain id so the
+    tombstone outlives a deleted sprint.
+    """
+
+    task_id = models.BigIntegerField()
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="task_tombstones")
+    sprint_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "deleted_at"], name="tombstone_project_deleted_idx"),
+            models.Index(fields=["sprint_id", "deleted_at"], name="tombstone_sprint_deleted_idx"),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} removed from project {self.project_id}"
+
+
+class TaskCounter(models.Model):
+    """Denormalised task counts for a project (sprint is NULL) or one of its sprints.
+
+    Maintained incrementally by `tasks.counters` on every task write; rebuild
+    or check for drift with `manage.py rebuild_task_counters`. `overdue` is
+    relative to `overdue_as_of` and refreshed on read once that date passes.
+    """
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="task_counters")
+    sprint = models.ForeignKey(Sprint, on_delete=models.CASCADE, null=True, blank=True, related_name="task_counters")
+
+    total = models.IntegerField(default=0)
+    status_todo = models.IntegerField(default=0)
+    status_progress = models.IntegerField(default=0)
+    status_review = models.IntegerField(default=0)
+    status_done = models.IntegerField(default=0)
+    priority_highest = models.IntegerField(default=0)
+    priority_high = models.IntegerField(default=0)
+    priority_medium = models.IntegerField(default=0)
+    priority_low = models.IntegerField(default=0)
+    priority_lowest = models.IntegerField(default=0)
+    overdue = models.IntegerField(default=0)
+    overdue_as_of = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project"], condition=models.Q(sprint__isnull=True), name="taskcounter_unique_project"
+            ),
+            models.UniqueConstraint(
+                fields=["sprint"], condition=models.Q(sprint__isnull=False), name="taskcounter_unique_sprint"
+            ),
+        ]
+
+    def __str__(self):
+        scope = f"sprint {self.sprint_id}" if self.sprint_id else f"project {self.project_id}"
+        return f"Task counts for {scope}"
@@ -0,0 +1,62 @@
+"""Migration operations for PostgreSQL-specific schema changes.
+
+Production runs on PostgreSQL; SQLite (development and tests) applies the
+same migrations and ends up with the same migration state, minus the GIN
+indexes and triggers it has no equivalent for. `tasks.search` falls back
+accordingly.
+
+Indexes on existing tables are built with CREATE INDEX CONCURRENTLY so
+writes to the table carry on while they build (`AddIndexConcurrently`).
+Such migrations set `atomic = False` and hold nothing but the index, so a
+failed build can't leave other schema changes half-applied; the fields an
+index needs come in an atomic migration before it. Other databases get a
+plain CREATE INDEX.
+
+The GIN indexes are declared in `Task.Meta` like any other, so a future
+migration that makes SQLite rebuild the task table (it does so for most
+`AlterField`s) would try to create them there too; give such a migration
+a PostgreSQL-only path for SQLite development databases.
+"""
+
+from django.contrib.postgres import operations
+from django.db import migrations
+
+
+class PostgreSQLOnly:
+    """Mixin for a migration operation: changes the state everywhere, the schema only on PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddIndexConcurrently(operations.AddIndexConcurrently):
+    """Django's AddIndexConcurrently, falling back to AddIndex off PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class AddPostgreSQLIndex(PostgreSQLOnly, operations.AddIndexConcurrently):
+    """Concurrent AddIndex for `django.contrib.postgres.indexes` types (GinIndex, GistIndex, ...)."""
+
+
+class RunPostgreSQL(PostgreSQLOnly, migrations.RunSQL):
+    """RunSQL for PostgreSQL dialect (functions, triggers); give it `reverse_sql` as usual."""
+
+
+class TrigramExtension(PostgreSQLOnly, operations.TrigramExtension):
+    """pg_trgm; Django's own operation skips other databases when applied but not when unapplied."""
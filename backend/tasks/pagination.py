@@ -0,0 +1,28 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class TaskCursorPagination(CursorPagination):
+    """Keyset pagination over the primary key.
+
+    Opt-in: only applies when the client sends `cursor` or `page_size`, so
+    existing callers that expect a plain list keep working.
+    """
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class TaskSearchPagination(PageNumberPagination):
+    """Numbered pages for ranked search results, which have no stable key to page on."""
+
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,102 @@
+"""Publish/subscribe for live board updates.
+
+Views publish task events per project; websocket connections (see
+`tasks.websocket`) subscribe to them. The broker class comes from
+`settings.REALTIME_BROKER` so the in-process default can be swapped for one
+backed by a local message broker when running several ASGI workers.
+"""
+
+import asyncio
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """One subscriber's bounded queue, owned by the event loop that created it."""
+
+    def __init__(self, channel, loop, max_queue):
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        # Set when the subscriber fell too far behind and missed events
+        self.overflowed = asyncio.Event()
+
+    def _deliver(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed.set()
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InMemoryBroker:
+    """Process-local fan-out; publish() is safe to call from any thread."""
+
+    def __init__(self, max_queue=1000):
+        self.max_queue = max_queue
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        sub = Subscription(channel, asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.channel]
+
+    def has_subscribers(self, channel):
+        return bool(self._subscribers.get(channel))
+
+    def publish(self, channel, message):
+        with self._lock:
+            subs = list(self._subscribers.get(channel, ()))
+        for sub in subs:
+            sub.loop.call_soon_threadsafe(sub._deliver, message)
+        return len(subs)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "REALTIME_BROKER", "tasks.realtime.InMemoryBroker")
+                _broker = import_string(path)()
+    return _broker
+
+
+def project_channel(project_id):
+    return f"project.{project_id}"
+
+
+def publish_task_event(event, project_id, payload):
+    """Broadcast `task.<event>` to the project's subscribers once the transaction commits.
+
+    `payload` is a callable so tasks are only serialized when someone is listening.
+    """
+    if project_id is None:
+        return
+    channel = project_channel(project_id)
+
+    def send():
+        broker = get_broker()
+        if broker.has_subscribers(channel):
+            broker.publish(channel, {"type": f"task.{event}", "project": project_id, "task": payload()})
+
+    transaction.on_commit(send)
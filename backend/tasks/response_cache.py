@@ -0,0 +1,210 @@
+"""Versioned per-user response cache for read-heavy endpoints.
+
+Cached responses are keyed by endpoint, user, full path, today's date and
+the *generations* of the user and of every project the response depends on.
+A generation is a random token kept in the cache; a write drops it after
+commit and the next read mints a new one, so entries built from older data
+are never looked up again and age out by TTL or eviction. Nothing is deleted
+by pattern, which keeps this working on any Django cache backend: locmem for
+one process, or a shared file/Redis/Memcached cache
+(`RESPONSE_CACHE["CACHE_ALIAS"]`) when several workers must see each
+other's writes.
+
+Task writes bump their projects through `tasks.counters`, which every task
+write that can change a cached payload (create, delete, status, sprint or
+project moves, imports) goes through; Task signals would miss the bulk paths
+and make project deletes fetch every task. Project and sprint rows bump
+through signals. A user's owned project ids are cached the same way, under
+a per-user generation bumped when one of their projects is saved or
+deleted, so a cache hit runs no SQL at all.
+
+Hits and misses are counted per endpoint in the /metrics output.
+"""
+
+import hashlib
+import secrets
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .conditional import _not_modified
+from .instrumentation import registry
+from .models import Project, Sprint
+
+DEFAULTS = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "default",
+    "TTL": 300,
+    "KEY_PREFIX": "respcache",
+}
+
+# Response headers stored with the body and replayed on a hit
+STORED_HEADERS = ("ETag", "Cache-Control")
+
+
+def get_response_cache_settings():
+    return {**DEFAULTS, **getattr(settings, "RESPONSE_CACHE", {})}
+
+
+class ResponseCache:
+    def __init__(self, cache_alias="default", ttl=300, key_prefix="respcache"):
+        self.cache_alias = cache_alias
+        self.ttl = ttl
+        self.prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def _generation_key(self, scope, pk):
+        return f"{self.prefix}:gen:{scope}:{pk}"
+
+    def generations(self, scope, pks):
+        """{pk: token}; pks without a token get a fresh one, which no existing entry uses."""
+        keys = {self._generation_key(scope, pk): pk for pk in pks}
+        found = self.cache.get_many(list(keys))
+        tokens = {keys[key]: token for key, token in found.items()}
+        for key, pk in keys.items():
+            if pk not in tokens:
+                token = secrets.token_hex(8)
+                # Another request may have minted one first; use the winner's
+                if not self.cache.add(key, token, timeout=None):
+                    token = self.cache.get(key) or token
+                tokens[pk] = token
+        return tokens
+
+    def bump(self, scope, pks):
+        """Invalidate everything cached under these generations once the transaction commits."""
+        keys = [self._generation_key(scope, pk) for pk in set(pks) if pk is not None]
+        if keys:
+            transaction.on_commit(partial(self.cache.delete_many, keys))
+
+    def user_generation(self, user):
+        return self.generations("user", [user.pk])[user.pk]
+
+    def owned_project_ids(self, user, token):
+        key = f"{self.prefix}:projects:{user.pk}:{token}"
+        ids = self.cache.get(key)
+        if ids is None:
+            ids = list(Project.objects.filter(owner=user).order_by("id").values_list("id", flat=True))
+            self.cache.set(key, ids, self.ttl)
+        return ids
+
+    def entry_key(self, endpoint, request, user_token, project_ids):
+        tokens = self.generations("project", project_ids)
+        parts = [
+            endpoint, request.user.pk, user_token, request.get_full_path(), timezone.localdate().isoformat(),
+            *(f"{pk}={tokens[pk]}" for pk in sorted(tokens)),
+        ]
+        digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+        return f"{self.prefix}:resp:{digest}"
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def clear(self):
+        self.cache.clear()
+
+    def set(self, key, response):
+        self.store(key, response.data, {name: response[name] for name in STORED_HEADERS if response.has_header(name)})
+
+    def store(self, key, data, headers):
+        self.cache.set(key, (data, headers), self.ttl)
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """The configured ResponseCache, or None when disabled."""
+    global _response_cache
+    conf = get_response_cache_settings()
+    if not conf["ENABLED"]:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(conf["CACHE_ALIAS"], conf["TTL"], conf["KEY_PREFIX"])
+    return _response_cache
+
+
+def lookup(cache, endpoint, request, project_ids=None):
+    """(entry key, stored (data, headers) or None) for `request.user`; counts the hit or miss.
+
+    `project_ids` are the projects the response depends on besides the
+    user's own project rows; None means all the user owns.
+    """
+    user_token = cache.user_generation(request.user)
+    if project_ids is None:
+        project_ids = cache.owned_project_ids(request.user, user_token)
+    key = cache.entry_key(endpoint, request, user_token, project_ids)
+    entry = cache.get(key)
+    result = "miss" if entry is None else "hit"
+    registry.inc("response_cache_requests_total", "Response cache lookups.", endpoint=endpoint, result=result)
+    return key, entry
+
+
+def bump_projects(project_ids):
+    cache = get_response_cache()
+    if cache is not None:
+        cache.bump("project", project_ids)
+
+
+def bump_users(user_ids):
+    cache = get_response_cache()
+    if cache is not None:
+        cache.bump("user", user_ids)
+
+
+class CachedResponseMixin:
+    """`cached_response()` for viewset actions whose payload depends only on the user's projects.
+
+    Entries always depend on the user's generation (their project rows).
+    `cache_projects()` names the projects whose tasks and sprints a request
+    also depends on; the default, None, means all the user owns, which costs
+    one query when that list isn't cached yet. Only 200 responses are stored; a hit replays the stored ETag,
+    so If-None-Match still gets a 304.
+    """
+
+    def cache_projects(self, request):
+        return None
+
+    def cached_response(self, request, build):
+        cache = get_response_cache()
+        if cache is None or not request.user.is_authenticated:
+            return build()
+        key, entry = lookup(cache, f"{self.basename}.{self.action}", request, self.cache_projects(request))
+        if entry is not None:
+            data, headers = entry
+            if headers.get("ETag") and _not_modified(request, headers["ETag"]):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            response = Response(data, headers=headers)
+            response["X-Cache"] = "hit"
+            return response
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response)
+        response["X-Cache"] = "miss"
+        return response
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def _project_changed(sender, instance, **kwargs):
+    bump_projects([instance.pk])
+    bump_users([instance.owner_id])
+
+
+@receiver(post_save, sender=Sprint)
+@receiver(post_delete, sender=Sprint)
+def _sprint_changed(sender, instance, **kwargs):
+    bump_projects([instance.project_id])
@@ -0,0 +1,59 @@
+"""Ranked task search over title and description.
+
+On PostgreSQL this reads the weighted `search_vector` column (title "A",
+description "B"; kept current by the trigger from migration 0008) through its
+GIN index, parsed with `websearch_to_tsquery`, so quoted phrases, `or` and
+`-word` work. Titles within trigram distance of the query also match, which
+catches typos and partial words that stemming misses; results are ordered by
+text rank, then title similarity.
+
+Other databases (SQLite in development and tests) fall back to a
+case-insensitive substring match where every word must appear in the title
+or description, ranking title hits first.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+CONFIG = "english"
+# Longest query accepted; longer input is cut rather than rejected
+MAX_QUERY_LENGTH = 200
+
+
+def normalize(query):
+    return " ".join((query or "").split())[:MAX_QUERY_LENGTH]
+
+
+def search_tasks(queryset, query):
+    """`queryset` filtered to tasks matching `query`, best matches first."""
+    query = normalize(query)
+    if connection.vendor == "postgresql":
+        return _postgres(queryset, query)
+    return _fallback(queryset, query)
+
+
+def _postgres(queryset, query):
+    search = SearchQuery(query, config=CONFIG, search_type="websearch")
+    return (
+        queryset.annotate(
+            rank=SearchRank(F("search_vector"), search),
+            similarity=TrigramSimilarity("title", query),
+        )
+        .filter(Q(search_vector=search) | Q(title__trigram_similar=query))
+        .order_by("-rank", "-similarity", "-id")
+    )
+
+
+def _fallback(queryset, query):
+    words = query.split()
+    for word in words:
+        queryset = queryset.filter(Q(title__icontains=word) | Q(description__icontains=word))
+    return queryset.annotate(
+        rank=Case(
+            When(title__icontains=query, then=Value(3)),
+            When(Q(*(Q(title__icontains=word) for word in words)), then=Value(2)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    ).order_by("-rank", "-id")
@@ -1,10 +1,15 @@
-from rest_framework import serializers
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.serializer_helpers import ReturnList
+from . import counters, sync
 from .models import Task, Project, Sprint
-from users.serializers import UserProfileSerializer
+from users.profiles import profile_exists, profile_payloads, remember_profile
 
 
 class ProjectSerializer(serializers.ModelSerializer):
-    owner = serializers.ReadOnlyField(source="owner.id")
+    owner = serializers.ReadOnlyField(source="owner_id")
 
     class Meta:
         model = Project
@@ -12,6 +17,11 @@ class ProjectSerializer(serializers.ModelSerializer):
 
 
 class SprintSerializer(serializers.ModelSerializer):
+    # Read from the annotations SprintViewSet adds (counters.sprint_annotations),
+    # so listing sprints never fetches their tasks
+    task_counts = serializers.SerializerMethodField()
+    velocity = serializers.SerializerMethodField()
+
     class Meta:
         model = Sprint
         fields = [
@@ -23,38 +33,219 @@ class SprintSerializer(serializers.ModelSerializer):
             "end_date",
             "project",
             "created_at",
+            "task_counts",
+            "velocity",
         ]
 
+    def get_task_counts(self, sprint):
+        # A freshly created sprint isn't annotated and has no tasks yet
+        counts = {"total": getattr(sprint, "tasks_total", 0)}
+        for key, field in counters.STATUS_FIELDS.items():
+            counts[key] = getattr(sprint, f"tasks_{field}", 0)
+        return counts
+
+    def get_velocity(self, sprint):
+        """Done tasks per week between the start date and the end date (or today, if sooner)."""
+        if sprint.start_date is None:
+            return None
+        today = timezone.localdate()
+        end = min(sprint.end_date, today) if sprint.end_date else today
+        weeks = max((end - sprint.start_date).days + 1, 1) / 7
+        return round(getattr(sprint, f"tasks_{counters.STATUS_FIELDS['done']}", 0) / weeks, 2)
+
+
+class AssigneeField(serializers.Field):
+    """Read-only nested assignee profile, rendered through `users.profiles`.
+
+    A profile joined with `select_related("assigned_to__user")` is used as is;
+    otherwise the payload comes from the profile cache instead of a lazy load.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(source="*", read_only=True, **kwargs)
+
+    def to_representation(self, task):
+        if task.assigned_to_id is None:
+            return None
+        request = self.context.get("request")
+        if Task.assigned_to.is_cached(task):
+            return remember_profile(task.assigned_to, request)
+        return profile_payloads([task.assigned_to_id], request).get(task.assigned_to_id)
+
 
 class TaskSerializer(serializers.ModelSerializer):
     # Return nested profile details, but accept a simple id for writes
-    assigned_to = UserProfileSerializer(read_only=True)
+    assigned_to = AssigneeField()
     assigned_to_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
 
+    # Set by update(): whether this write moved the task into "done"
+    just_completed = False
+
     class Meta:
         model = Task
-        fields = "__all__"
+        # search_vector is an index column maintained by the database
+        exclude = ["search_vector"]
+
+    def __init__(self, *args, **kwargs):
+        # Optional projection: `fields` restricts which keys are serialized
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def _apply_assignee(self, instance_or_data, assigned_to_id):
         if assigned_to_id is None:
             return
-        from users.models import UserProfile
-        try:
-            assignee = UserProfile.objects.get(id=assigned_to_id)
-        except UserProfile.DoesNotExist:
+        if not profile_exists(assigned_to_id, self.context.get("request")):
             raise serializers.ValidationError({"assigned_to_id": "Invalid user profile id"})
+        # Only the id is written; the response renders the profile from the cache
         if isinstance(instance_or_data, Task):
-            instance_or_data.assigned_to = assignee
+            instance_or_data.assigned_to_id = assigned_to_id
         else:
-            instance_or_data["assigned_to"] = assignee
+            instance_or_data["assigned_to_id"] = assigned_to_id
 
     def create(self, validated_data):
         assigned_to_id = validated_data.pop("assigned_to_id", None)
         self._apply_assignee(validated_data, assigned_to_id)
-        return super().create(validated_data)
+        with transaction.atomic():
+            task = super().create(validated_data)
+            counters.apply_task_change(None, counters.snapshot(task))
+        return task
 
     def update(self, instance, validated_data):
+        # Single write path: the previous state comes from the instance the view
+        # already loaded, and status transitions are folded into one UPDATE.
         assigned_to_id = validated_data.pop("assigned_to_id", None)
+        update_fields = set(validated_data) | {"updated_at"}
         if assigned_to_id is not None:
             self._apply_assignee(instance, assigned_to_id)
-        return super().update(instance, validated_data)
\ No newline at end of file
+            update_fields.add("assigned_to")
+        before = counters.snapshot(instance)
+        was_done = instance.status == "done" or instance.completed
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        self.just_completed = (instance.status == "done" or instance.completed) and not was_done
+        if self.just_completed:
+            # Either signal completes the task: flag it and stamp completed_at, but
+            # leave status as sent (a PATCH of completed=True alone keeps its column)
+            instance.completed = True
+            if not instance.completed_at:
+                instance.completed_at = timezone.now()
+            update_fields.update(["completed", "completed_at"])
+        with transaction.atomic():
+            instance.save(update_fields=sorted(update_fields))
+            counters.apply_task_change(before, counters.snapshot(instance))
+            if before.project_id != instance.project_id or before.sprint_id != instance.sprint_id:
+                sync.record_removal(instance.id, before.project_id, before.sprint_id)
+        return instance
+
+
+class TaskRowSerializer:
+    """Read-only fast path producing exactly what TaskSerializer(many=True) would.
+
+    Rows come straight from `Task.objects.values(*TaskRowSerializer.columns(...))`
+    instead of model instances. Field formatting reuses TaskSerializer's own
+    bound fields (so dates, choices and avatar URLs match byte for byte),
+    but only where it isn't a no-op, and each distinct assignee is serialized
+    once per response.
+    """
+
+    # Field types whose to_representation() returns model values unchanged
+    PASSTHROUGH = (
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.BooleanField,
+        serializers.IntegerField,
+        serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init__(self, rows, fields=None, context=None):
+        self.rows = rows
+        self.template = TaskSerializer(fields=fields, context=context or {})
+
+    @staticmethod
+    def columns(fields=None):
+        """Model field names to pass to `.values()` for the given projection."""
+        names = [f.name for f in Task._meta.concrete_fields if f.name != "search_vector"]
+        return names if fields is None else [name for name in names if name in fields]
+
+    @staticmethod
+    def _datetime_converter(field):
+        """DateTimeField.to_representation with the current timezone looked up once, not per value."""
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if not isinstance(output_format, str) or output_format.lower() != ISO_8601:
+            return field.to_representation
+        field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if field_timezone is None:
+            return field.to_representation
+
+        def convert(value):
+            if value.utcoffset() is None:
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return convert
+
+    @property
+    def data(self):
+        rows = list(self.rows)
+        readable = list(self.template._readable_fields)
+        assignees = {}
+        assignee_field = self.template.fields.get("assigned_to")
+        if assignee_field is not None:
+            ids = {row["assigned_to"] for row in rows}
+            assignees = profile_payloads(ids, self.template.context.get("request"))
+
+        converters = []
+        for field in readable:
+            source = field.source
+            if field is assignee_field:
+                # AssigneeField reads the whole task; rows carry the id column
+                source, convert = "assigned_to", assignees.get
+            elif isinstance(field, self.PASSTHROUGH):
+                convert = None
+            elif isinstance(field, serializers.DateTimeField):
+                convert = self._datetime_converter(field)
+            else:
+                convert = field.to_representation
+            converters.append((field.field_name, source, convert))
+
+        out = []
+        for row in rows:
+            item = {}
+            for name, source, convert in converters:
+                value = row[source]
+                item[name] = value if convert is None or value is None else convert(value)
+            out.append(item)
+        return ReturnList(out, serializer=self.template)
+
+
+class TaskBulkChangeSerializer(serializers.Serializer):
+    """One entry of a bulk board mutation; omitted keys are left unchanged, null clears."""
+
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    sprint = serializers.IntegerField(required=False, allow_null=True)
+    assigned_to_id = serializers.IntegerField(required=False, allow_null=True)
+
+
+class TaskBulkAssignSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    user_profile_id = serializers.IntegerField()
+
+
+class TaskImportRowSerializer(serializers.Serializer):
+    """One row of a bulk import (see tasks.importer); other columns are ignored."""
+
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, default="")
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, default="todo")
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, default="medium")
+    due_date = serializers.DateField(allow_null=True, default=None)
+    completed_at = serializers.DateTimeField(allow_null=True, default=None)
+    sprint = serializers.IntegerField(allow_null=True, default=None)
+    assigned_to = serializers.IntegerField(allow_null=True, default=None)
+    assignee = serializers.CharField(allow_blank=True, default="")
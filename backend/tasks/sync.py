@@ -0,0 +1,63 @@
+"""Watermarks and tombstones for incremental (delta) task sync.
+
+Clients call `GET /api/tasks/changes/?since=<watermark>` and receive tasks
+updated since then plus the ids of tasks that left the scope (deleted, or
+moved to another project or out of a sprint, including by the sprint's
+deletion). Watermarks are opaque to clients. Each pull
+re-reads a short overlap window before the watermark so rows committed by
+slower, concurrent transactions are not missed; clients upsert by id, so
+the occasional repeat is harmless.
+"""
+
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import TaskTombstone
+
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def tombstone_retention():
+    return timedelta(days=getattr(settings, "TASK_TOMBSTONE_RETENTION_DAYS", 30))
+
+
+def encode_watermark(moment):
+    micros = int(moment.timestamp() * 1_000_000)
+    return base64.urlsafe_b64encode(f"v1:{micros}".encode()).decode().rstrip("=")
+
+
+def decode_watermark(token):
+    """Datetime for a watermark token; raises ValueError for anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid watermark")
+    version, _, micros = raw.partition(":")
+    if version != "v1" or not micros.isdigit():
+        raise ValueError("Invalid watermark")
+    return datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc)
+
+
+def record_removal(task_id, project_id, sprint_id=None):
+    """Remember that `task_id` left `project_id` (or its sprint `sprint_id`) so syncing clients drop it."""
+    record_removals([(task_id, project_id, sprint_id)])
+
+
+def record_removals(removals):
+    """`record_removal` for many (task_id, project_id, sprint_id) at once, in one INSERT."""
+    TaskTombstone.objects.bulk_create([
+        TaskTombstone(task_id=task_id, project_id=project_id, sprint_id=sprint_id)
+        for task_id, project_id, sprint_id in removals
+        if project_id is not None
+    ])
+
+
+def prune_tombstones(older_than=None):
+    """Delete tombstones past the retention window; clients that old get a full reset instead."""
+    cutoff = timezone.now() - (older_than or tombstone_retention())
+    deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
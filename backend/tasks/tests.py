@@ -1,3 +1,973 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APITestCase
+
+from analytics import rollups
+from analytics.models import AnalyticsRecord
+from backend.database import database_config
+from tasks import counters, export, instrumentation, sync
+from tasks.realtime import get_broker, project_channel
+from tasks.serializers import TaskRowSerializer, TaskSerializer
+from tasks.websocket import CLOSE_NOT_FOUND, CLOSE_UNAUTHORIZED, websocket_application
+from tasks.models import Project, Sprint, Task, TaskCounter
+from tasks.pagination import TaskCursorPagination
+from tasks.response_cache import get_response_cache
+from users.models import User, UserProfile
+from users.profiles import get_profile_cache
+
+
+class QueryBudgetTests(APITestCase):
+    """Every routed endpoint must stay within a fixed number of SQL queries.
+
+    The fixture has several projects, sprints, assignees and tasks, so an
+    N+1 regression on any list shows up as a budget overrun. Budgets include
+    the savepoints the views open for their transactions.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", password="pw-Secret-123")
+        cls.profile = UserProfile.objects.create(user=cls.user)
+        cls.other = User.objects.create_user("other", password="pw-Secret-123")
+        cls.other_profile = UserProfile.objects.create(user=cls.other)
+        cls.projects = [Project.objects.create(name=f"P{i}", owner=cls.user) for i in range(3)]
+        cls.project = cls.projects[0]
+        cls.sprints = [Sprint.objects.create(name=f"S{i}", project=cls.project) for i in range(3)]
+        cls.sprint = cls.sprints[0]
+        cls.tasks = [
+            Task.objects.create(
+                title=f"T{i}",
+                project=cls.project,
+                sprint=cls.sprints[i % 3],
+                status=["todo", "progress", "review", "done"][i % 4],
+                assigned_to=[cls.profile, cls.other_profile][i % 2],
+            )
+            for i in range(12)
+        ]
+        cls.task = cls.tasks[0]
+        for i in range(5):
+            AnalyticsRecord.objects.create(user=cls.profile, action="task_completed", details={"n": i})
+        # Measure steady state: counter rows normally exist before a write arrives
+        counters.rebuild([p.id for p in cls.projects])
+
+    def setUp(self):
+        # Budgets are for cold profile and response caches
+        get_profile_cache().clear()
+        get_response_cache().clear()
+        self.client.force_authenticate(self.user)
+
+    def assertWithinBudget(self, budget, method, url, data=None, status_code=200):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertEqual(response.status_code, status_code, response.content)
+        queries = [q["sql"] for q in ctx.captured_queries]
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{method.upper()} {url} ran {len(queries)} queries (budget {budget}):\n" + "\n".join(queries),
+        )
+        return response
+
+    def assertStreamWithinBudget(self, budget, url):
+        """Like assertWithinBudget for streaming responses, counting queries run while streaming."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+            body = b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(ctx.captured_queries), budget, "\n".join(q["sql"] for q in ctx.captured_queries))
+        return response, body
+
+    # Projects
+
+    def test_project_list(self):
+        # Cold response cache: one of these loads the user's project ids for the cache key
+        self.assertWithinBudget(3, "get", "/api/projects/")
+
+    def test_project_list_cached(self):
+        self.client.get("/api/projects/")
+        response = self.assertWithinBudget(0, "get", "/api/projects/")
+        self.assertEqual(response["X-Cache"], "hit")
+        self.assertEqual(self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/projects/{self.project.id}/", {"name": "Renamed"}, format="json")
+        response = self.client.get("/api/projects/")
+        self.assertEqual(response["X-Cache"], "miss")
+        self.assertIn("Renamed", {project["name"] for project in response.json()})
+
+    def test_project_detail(self):
+        self.assertWithinBudget(1, "get", f"/api/projects/{self.project.id}/")
+
+    def test_project_create(self):
+        self.assertWithinBudget(1, "post", "/api/projects/", {"name": "New"}, 201)
+
+    def test_project_update(self):
+        self.assertWithinBudget(2, "patch", f"/api/projects/{self.project.id}/", {"name": "Renamed"})
+
+    def test_project_delete(self):
+        project = Project.objects.create(name="Doomed", owner=self.user)
+        self.assertWithinBudget(10, "delete", f"/api/projects/{project.id}/", status_code=204)
+
+    # Tasks
+
+    def test_task_list(self):
+        self.assertWithinBudget(3, "get", f"/api/tasks/?project={self.project.id}")
+
+    @override_settings(PERF_INSTRUMENTATION={"SAMPLE_RATE": 1.0})
+    def test_task_list_sampled(self):
+        # Timing a request must not add queries of its own
+        instrumentation.registry.reset()
+        response = self.assertWithinBudget(3, "get", f"/api/tasks/?project={self.project.id}")
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn('view;dur=', response["Server-Timing"])
+        # A local address alone is not enough: scrapers need the token, people need staff
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="127.0.0.1").status_code, 401)
+        self.client.force_authenticate(None)
+        with override_settings(PERF_INSTRUMENTATION={"SAMPLE_RATE": 0.0, "METRICS_TOKEN": "scrape-secret"}):
+            self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+            metrics = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret").content.decode()
+        self.assertIn('taskflow_sampled_requests_total{endpoint="task.list",method="GET",status="200"} 1', metrics)
+        self.assertIn('taskflow_view_seconds_total{endpoint="task.list",method="GET",status="200"}', metrics)
+        self.client.force_authenticate(User.objects.create_user("ops", is_staff=True))
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    def test_task_list_sprint(self):
+        self.assertWithinBudget(3, "get", f"/api/tasks/?sprint={self.sprint.id}")
+
+    def test_task_list_projected_page(self):
+        self.assertWithinBudget(2, "get", f"/api/tasks/?project={self.project.id}&fields=title,status&page_size=5")
+
+    def test_task_detail(self):
+        self.assertWithinBudget(1, "get", f"/api/tasks/{self.task.id}/")
+
+    def test_task_create(self):
+        data = {"title": "New", "project": self.project.id, "sprint": self.sprint.id, "assigned_to_id": self.profile.id}
+        self.assertWithinBudget(11, "post", "/api/tasks/", data, 201)
+
+    def test_task_update(self):
+        self.assertWithinBudget(8, "patch", f"/api/tasks/{self.task.id}/", {"title": "Renamed", "status": "done"})
+
+    def test_task_delete(self):
+        self.assertWithinBudget(9, "delete", f"/api/tasks/{self.task.id}/", status_code=204)
+
+    def test_task_stats(self):
+        self.assertWithinBudget(2, "get", f"/api/tasks/stats/?project={self.project.id}")
+
+    def test_task_stats_all_projects(self):
+        self.assertWithinBudget(3, "get", "/api/tasks/stats/")
+
+    def test_task_stats_sprint(self):
+        self.assertWithinBudget(3, "get", f"/api/tasks/stats/?sprint={self.sprint.id}")
+
+    def test_task_stats_cached_until_task_write(self):
+        url = f"/api/tasks/stats/?project={self.project.id}"
+        before = self.client.get(url).json()
+        self.assertWithinBudget(0, "get", url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/tasks/", {"title": "New", "project": self.project.id}, format="json")
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "miss")
+        self.assertEqual(response.json()["total"], before["total"] + 1)
+
+    def test_async_reads_match_sync(self):
+        # Same budgets as the sync endpoints, and the same bytes
+        for url, budget in [
+            ("projects/", 3),
+            (f"tasks/?project={self.project.id}", 3),
+            (f"tasks/?sprint={self.sprint.id}&fields=title,assigned_to", 3),
+            ("tasks/stats/", 3),
+            (f"tasks/stats/?project={self.project.id}", 2),
+            (f"tasks/stats/?sprint={self.sprint.id}", 3),
+        ]:
+            with self.subTest(url=url):
+                get_profile_cache().clear()
+                response = self.assertWithinBudget(budget, "get", f"/api/async/{url}")
+                self.assertEqual(response.content, self.client.get(f"/api/{url}").content)
+
+    def test_async_reads_require_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get("/api/async/tasks/stats/").status_code, 401)
+
+    def test_task_bulk(self):
+        changes = [{"id": t.id, "status": "done", "sprint": self.sprints[1].id} for t in self.tasks]
+        # Includes one INSERT of the sprint tombstones for delta sync
+        self.assertWithinBudget(13, "post", "/api/tasks/bulk/", changes)
+
+    def test_task_assign(self):
+        data = {"task_id": self.task.id, "user_profile_id": self.other_profile.id}
+        self.assertWithinBudget(3, "post", "/api/tasks/assign/", data)
+
+    def test_task_bulk_assign(self):
+        data = {"task_ids": [t.id for t in self.tasks], "user_profile_id": self.other_profile.id}
+        response = self.assertWithinBudget(6, "post", "/api/tasks/bulk-assign/", data)
+        self.assertEqual({row["assigned_to"]["id"] for row in response.json()}, {self.other_profile.id})
+
+    def test_task_export(self):
+        _, body = self.assertStreamWithinBudget(1, f"/api/tasks/export/?project={self.project.id}&format=csv")
+        self.assertEqual(len(body.decode().splitlines()), len(self.tasks) + 1)
+
+    def test_task_export_gzip(self):
+        response, body = self.assertStreamWithinBudget(1, f"/api/tasks/export/?sprint={self.sprint.id}&format=jsonl&gzip=1")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(len(gzip.decompress(body).splitlines()), 4)
+
+    def test_task_export_streams_async_under_asgi(self):
+        tasks = Task.objects.filter(project=self.project).order_by("id")
+        response = export.stream_export(
+            tasks, ["id", "title"], "csv", "tasks", request=AsyncRequestFactory().get("/api/tasks/export/"),
+        )
+        self.assertTrue(response.is_async)
+
+        async def consume():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        expected = export.stream_export(tasks, ["id", "title"], "csv", "tasks", request=RequestFactory().get("/"))
+        self.assertFalse(expected.is_async)
+        self.assertEqual(async_to_sync(consume)(), b"".join(expected.streaming_content))
+
+    def test_task_import(self):
+        # Query count is independent of the number of rows
+        rows = [
+            {"title": f"Imported {i}", "status": "done", "sprint": self.sprints[i % 3].id, "assigned_to": self.profile.id}
+            for i in range(50)
+        ]
+        response = self.assertWithinBudget(13, "post", f"/api/tasks/import/?project={self.project.id}", rows, 201)
+        self.assertEqual(response.json()["created"], 50)
+
+    def test_task_import_invalidates_cached_sprints(self):
+        # Without counter rows the import's recount finds no drift to invalidate on
+        TaskCounter.objects.all().delete()
+        before = {sprint["id"]: sprint for sprint in self.client.get("/api/sprints/").json()}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/tasks/import/?project={self.project.id}", [{"title": "New", "sprint": self.sprint.id}],
+                format="json",
+            )
+        response = self.client.get("/api/sprints/")
+        self.assertEqual(response["X-Cache"], "miss")
+        after = {sprint["id"]: sprint for sprint in response.json()}
+        self.assertEqual(after[self.sprint.id]["task_counts"]["total"], before[self.sprint.id]["task_counts"]["total"] + 1)
+
+    def test_task_search(self):
+        response = self.assertWithinBudget(2, "get", f"/api/tasks/search/?q=T1&project={self.project.id}")
+        body = response.json()
+        self.assertEqual(body["count"], 3)
+        self.assertEqual(body["results"][0]["title"], "T11")
+        self.assertNotIn("search_vector", body["results"][0])
+
+    def test_task_changes(self):
+        self.assertWithinBudget(3, "get", f"/api/tasks/changes/?project={self.project.id}")
+
+    # Sprints
+
+    def test_sprint_list(self):
+        response = self.assertWithinBudget(3, "get", "/api/sprints/")
+        counts = {sprint["id"]: sprint["task_counts"] for sprint in response.json()}
+        self.assertEqual(counts[self.sprint.id], {"total": 4, "todo": 1, "progress": 1, "review": 1, "done": 1})
+
+    def test_sprint_detail(self):
+        self.assertWithinBudget(1, "get", f"/api/sprints/{self.sprint.id}/")
+
+    def test_sprint_create(self):
+        self.assertWithinBudget(2, "post", "/api/sprints/", {"name": "New", "project": self.project.id}, 201)
+
+    # Users, analytics and auth
+
+    def test_userprofile_list(self):
+        self.assertWithinBudget(1, "get", "/api/users/")
+
+    def test_analytics_list(self):
+        self.assertWithinBudget(1, "get", "/api/analytics/")
+
+    def test_analytics_export(self):
+        _, body = self.assertStreamWithinBudget(1, "/api/analytics/export/?format=jsonl")
+        self.assertEqual(len(body.splitlines()), 5)
+
+    def test_analytics_series(self):
+        rollups.apply_records(AnalyticsRecord.objects.all())
+        response = self.assertWithinBudget(2, "get", "/api/analytics/series/?granularity=hour")
+        self.assertEqual(response.json()["total"], 5)
+
+    def test_analytics_project_series(self):
+        self.assertWithinBudget(2, "get", f"/api/analytics/series/?project={self.project.id}")
+
+    def test_analytics_burndown(self):
+        self.assertWithinBudget(3, "get", f"/api/analytics/series/?metric=burndown&sprint={self.sprint.id}")
+
+    def test_auth_login(self):
+        self.client.force_authenticate(None)
+        self.assertWithinBudget(5, "post", "/api/auth/login/", {"username": "owner", "password": "pw-Secret-123"})
+
+    def test_auth_logout(self):
+        Token.objects.create(user=self.user)
+        self.assertWithinBudget(3, "post", "/api/auth/logout/", status_code=204)
+
+    def test_token_auth_is_cached(self):
+        token = Token.objects.create(user=self.user)
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.client.get(f"/api/projects/{self.project.id}/")
+        self.assertWithinBudget(1, "get", f"/api/projects/{self.project.id}/")
+
+
+class BenchmarkBaselineTests(TestCase):
+    """The bench_api scenarios stay within the committed queries-per-request baseline."""
+
+    def test_scenarios_within_query_baseline(self):
+        call_command("bench_api", tasks=400, events=400, iterations=3, queries_only=True, stdout=io.StringIO())
+
+
+class DatabaseConfigTests(TestCase):
+    def test_pool_settings_from_environment(self):
+        config = database_config({"DB_NAME": "tf", "DB_POOL": "1", "DB_POOL_MAX_SIZE": "4"})
+        self.assertEqual(config["NAME"], "tf")
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 4)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+
+        config = database_config({"DB_POOL": "0", "DB_CONN_MAX_AGE": "30"})
+        self.assertEqual(config["CONN_MAX_AGE"], 30)
+        self.assertNotIn("pool", config["OPTIONS"])
+
+    def test_no_default_password(self):
+        self.assertEqual(database_config({})["PASSWORD"], "")
+        self.assertEqual(database_config({"DB_PASSWORD": "s3cret"})["PASSWORD"], "s3cret")
+
+    def test_health_check(self):
+        response = self.client.get("/healthz")
+        self.assertEqual((response.status_code, response.json()), (200, {"status": "ok"}))
+
+    def test_health_check_failure_reveals_nothing(self):
+        with mock.patch.object(connection, "cursor", side_effect=OperationalError("password authentication failed")), \
+                self.assertLogs("backend.pool", "ERROR"):
+            response = self.client.get("/healthz")
+        self.assertEqual((response.status_code, response.json()), (503, {"status": "unavailable"}))
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "plans are read from SQLite's EXPLAIN QUERY PLAN")
+class IndexPlanTests(TestCase):
+    """The hot queries are answered from their composite indexes, sorted without a separate step."""
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_task_filters(self):
+        self.assertUsesIndex(Task.objects.filter(project_id=1, status="todo"), "task_project_status_idx")
+        self.assertUsesIndex(Task.objects.filter(sprint_id=1, status="todo"), "task_sprint_status_idx")
+        overdue = Task.objects.filter(project_id=1, due_date__lt=timezone.now().date()).exclude(status="done")
+        self.assertUsesIndex(overdue, "task_open_project_due_idx")
+
+    def test_newest_first_lists(self):
+        self.assertUsesIndex(Project.objects.filter(owner_id=1).order_by("-created_at"), "project_owner_created_idx")
+        self.assertUsesIndex(Sprint.objects.filter(project_id=1).order_by("-created_at"), "sprint_project_created_idx")
+        self.assertUsesIndex(
+            AnalyticsRecord.objects.filter(user_id=1).order_by("-timestamp"), "analytics_user_ts_idx"
+        )
+
+
+class DeltaSyncTests(APITestCase):
+    """`/api/tasks/changes/`: snapshots, deltas and tombstones for removed tasks."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="P", owner=self.user)
+        self.other_project = Project.objects.create(name="Q", owner=self.user)
+        self.sprint = Sprint.objects.create(name="S1", project=self.project)
+        self.next_sprint = Sprint.objects.create(name="S2", project=self.project)
+        self.moved = Task.objects.create(title="Moved", project=self.project, sprint=self.sprint)
+        self.kept = Task.objects.create(title="Kept", project=self.project, sprint=self.sprint)
+        # Old enough to fall outside the overlap window of a fresh watermark
+        Task.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def changes(self, **params):
+        response = self.client.get("/api/tasks/changes/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_snapshot_then_delta(self):
+        snapshot = self.changes(project=self.project.id)
+        self.assertTrue(snapshot["reset"])
+        self.assertEqual({row["id"] for row in snapshot["upserted"]}, {self.moved.id, self.kept.id})
+        self.client.patch(f"/api/tasks/{self.kept.id}/", {"title": "Renamed"}, format="json")
+        delta = self.changes(project=self.project.id, since=snapshot["watermark"])
+        self.assertFalse(delta["reset"])
+        self.assertEqual([row["title"] for row in delta["upserted"]], ["Renamed"])
+        self.assertEqual(delta["deleted"], [])
+
+    def test_delete_leaves_tombstone(self):
+        watermark = self.changes(project=self.project.id)["watermark"]
+        self.client.delete(f"/api/tasks/{self.moved.id}/")
+        delta = self.changes(project=self.project.id, since=watermark)
+        self.assertEqual(delta["deleted"], [self.moved.id])
+        self.assertEqual(delta["upserted"], [])
+
+    def test_move_to_other_project(self):
+        watermark = self.changes(project=self.project.id)["watermark"]
+        self.client.patch(f"/api/tasks/{self.moved.id}/", {"project": self.other_project.id, "sprint": None}, format="json")
+        self.assertEqual(self.changes(project=self.project.id, since=watermark)["deleted"], [self.moved.id])
+        delta = self.changes(project=self.other_project.id, since=watermark)
+        self.assertEqual([row["id"] for row in delta["upserted"]], [self.moved.id])
+
+    def test_move_out_of_sprint(self):
+        watermark = self.changes(sprint=self.sprint.id)["watermark"]
+        self.client.patch(f"/api/tasks/{self.moved.id}/", {"sprint": self.next_sprint.id}, format="json")
+        delta = self.changes(sprint=self.sprint.id, since=watermark)
+        self.assertEqual(delta, {**delta, "upserted": [], "deleted": [self.moved.id], "reset": False})
+        # Still in the project, so a project-scoped client sees an update, not a removal
+        delta = self.changes(project=self.project.id, since=watermark)
+        self.assertEqual(([row["id"] for row in delta["upserted"]], delta["deleted"]), ([self.moved.id], []))
+
+    def test_bulk_move_out_of_sprint(self):
+        watermark = self.changes(sprint=self.sprint.id)["watermark"]
+        self.client.post("/api/tasks/bulk/", [{"id": self.moved.id, "sprint": None}], format="json")
+        self.assertEqual(self.changes(sprint=self.sprint.id, since=watermark)["deleted"], [self.moved.id])
+
+    def test_sprint_delete(self):
+        watermark = self.changes(sprint=self.sprint.id)["watermark"]
+        self.client.delete(f"/api/sprints/{self.sprint.id}/")
+        delta = self.changes(sprint=self.sprint.id, since=watermark)
+        self.assertEqual(delta["deleted"], sorted([self.kept.id, self.moved.id]))
+
+    def test_expired_watermark_resets(self):
+        expired = sync.encode_watermark(timezone.now() - sync.tombstone_retention() - timedelta(days=1))
+        delta = self.changes(project=self.project.id, since=expired)
+        self.assertTrue(delta["reset"])
+        self.assertEqual(len(delta["upserted"]), 2)
+        self.assertEqual(self.client.get("/api/tasks/changes/", {"since": "garbage"}).status_code, 400)
+
+
+class StatsTests(APITestCase):
+    """`/api/tasks/stats/`: one flat payload per project or sprint, or every project keyed by id."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        self.client.force_authenticate(self.user)
+        self.projects = [Project.objects.create(name=f"P{i}", owner=self.user) for i in range(3)]
+        self.sprint = Sprint.objects.create(name="S1", project=self.projects[0])
+        for i, status in enumerate(["todo", "progress", "review", "done", "done"]):
+            Task.objects.create(title=f"T{i}", project=self.projects[0], status=status, sprint=self.sprint if i < 2 else None)
+        Task.objects.create(title="Other", project=self.projects[1], status="progress")
+        self.foreign = Project.objects.create(name="Theirs", owner=User.objects.create_user("stranger"))
+        Task.objects.create(title="Theirs", project=self.foreign)
+
+    def stats(self, **params):
+        response = self.client.get("/api/tasks/stats/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_every_owned_project_keyed_by_id(self):
+        stats = self.stats()
+        self.assertEqual(set(stats), {str(p.id) for p in self.projects})
+        first = stats[str(self.projects[0].id)]
+        self.assertEqual((first["total"], first["completed"], first["in_progress"], first["progress"]), (5, 2, 2, 40))
+        self.assertEqual(stats[str(self.projects[1].id)]["in_progress"], 1)
+        self.assertEqual(stats[str(self.projects[2].id)]["total"], 0)
+
+    def measure(self):
+        # Warm the counter rows, then count a cold response cache
+        self.stats()
+        get_response_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            stats = self.stats()
+        get_response_cache().clear()
+        return len(stats), len(queries)
+
+    def test_queries_do_not_grow_with_projects(self):
+        few = self.measure()
+        for i in range(10):
+            Task.objects.create(title="More", project=Project.objects.create(name=f"More {i}", owner=self.user))
+        get_response_cache().clear()
+        self.assertEqual(self.measure(), (13, few[1]))
+
+    def test_projects_param_narrows_to_owned_ids(self):
+        ids = f"{self.projects[1].id},{self.foreign.id}"
+        self.assertEqual(set(self.stats(projects=ids)), {str(self.projects[1].id)})
+        response = self.client.get("/api/tasks/stats/", {"projects": "1,x"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_single_project_and_sprint(self):
+        self.assertEqual(self.stats(project=self.projects[0].id)["total"], 5)
+        sprint = self.stats(sprint=self.sprint.id)
+        self.assertEqual((sprint["total"], sprint["by_status"]["progress"]), (2, 1))
+        self.assertEqual(self.client.get("/api/tasks/stats/", {"project": self.foreign.id}).status_code, 404)
+
+
+class TaskListTests(APITestCase):
+    """Task list: opt-in cursor pagination and `fields=` projection."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="P", owner=self.user)
+        self.tasks = [Task.objects.create(title=f"T{i}", description="long text", project=self.project) for i in range(7)]
+        foreign = Project.objects.create(name="Theirs", owner=User.objects.create_user("stranger"))
+        Task.objects.create(title="Theirs", project=foreign)
+
+    def test_unpaginated_without_cursor_params(self):
+        rows = self.client.get("/api/tasks/").json()
+        self.assertEqual([row["id"] for row in rows], [task.id for task in self.tasks])
+
+    def test_cursor_pages_cover_every_task_once(self):
+        url, seen = f"/api/tasks/?project={self.project.id}&page_size=3", []
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page["results"]), 3)
+            seen.extend(row["id"] for row in page["results"])
+            url = page["next"]
+        self.assertEqual(seen, [task.id for task in self.tasks])
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(TaskCursorPagination, "max_page_size", 4):
+            page = self.client.get("/api/tasks/", {"page_size": 100}).json()
+        self.assertEqual(len(page["results"]), 4)
+
+    def test_fields_limit_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get("/api/tasks/", {"fields": "title,status"}).json()
+        self.assertEqual(set(rows[0]), {"id", "title", "status"})
+        task_selects = [q["sql"] for q in queries if 'FROM "tasks_task"' in q["sql"]]
+        self.assertTrue(task_selects)
+        self.assertNotIn("description", " ".join(task_selects))
+
+    def test_fields_with_pagination(self):
+        page = self.client.get("/api/tasks/", {"fields": "title", "page_size": 2}).json()
+        self.assertEqual([set(row) for row in page["results"]], [{"id", "title"}] * 2)
+        self.assertIsNotNone(page["next"])
+
+
+@override_settings(ANALYTICS_BUFFER={"ENABLED": False})
+class TaskCompletionTests(APITestCase):
+    """PATCH completes a task on status=done or completed=true, in a single UPDATE of the task row."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        UserProfile.objects.create(user=self.user)
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="P", owner=self.user)
+        self.task = Task.objects.create(title="T", project=self.project)
+        counters.rebuild([self.project.id])
+
+    def patch(self, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f"/api/tasks/{self.task.id}/", data, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 1)
+        self.task.refresh_from_db()
+
+    def completions(self):
+        return AnalyticsRecord.objects.filter(action="task_completed").count()
+
+    def test_status_done(self):
+        self.patch({"status": "done"})
+        self.assertEqual((self.task.status, self.task.completed), ("done", True))
+        self.assertIsNotNone(self.task.completed_at)
+        self.assertEqual(self.completions(), 1)
+
+    def test_completed_flag_keeps_status(self):
+        self.patch({"completed": True})
+        self.assertEqual((self.task.status, self.task.completed), ("todo", True))
+        self.assertIsNotNone(self.task.completed_at)
+        self.assertEqual(self.completions(), 1)
+        self.assertEqual(counters.rebuild([self.project.id], check_only=True), [])
+
+    def test_keeps_existing_completed_at_and_reports_once(self):
+        stamped = timezone.now() - timedelta(days=2)
+        Task.objects.filter(pk=self.task.pk).update(completed_at=stamped)
+        self.patch({"status": "done"})
+        self.patch({"title": "Still done"})
+        self.assertEqual(self.task.completed_at, stamped)
+        self.assertEqual(self.completions(), 1)
+
+
+@override_settings(ANALYTICS_BUFFER={"ENABLED": False})
+class TaskBulkTests(APITestCase):
+    """`POST /api/tasks/bulk/`: all-or-nothing board changes for the user's own tasks."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        self.profile = UserProfile.objects.create(user=self.user)
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="P", owner=self.user)
+        self.other_project = Project.objects.create(name="Q", owner=self.user)
+        self.sprint = Sprint.objects.create(name="S1", project=self.project)
+        self.other_sprint = Sprint.objects.create(name="S2", project=self.other_project)
+        self.tasks = [Task.objects.create(title=f"T{i}", project=self.project) for i in range(3)]
+        self.done = Task.objects.create(title="Done", project=self.project, status="done", completed=True)
+        foreign = Project.objects.create(name="Theirs", owner=User.objects.create_user("stranger"))
+        self.foreign_task = Task.objects.create(title="Theirs", project=foreign)
+
+    def bulk(self, changes):
+        return self.client.post("/api/tasks/bulk/", changes, format="json")
+
+    def assertUnchanged(self):
+        self.assertEqual(
+            list(Task.objects.filter(project=self.project).values_list("status", "sprint_id", "assigned_to_id")),
+            [("todo", None, None)] * 3 + [("done", None, None)],
+        )
+
+    def test_applies_every_change(self):
+        response = self.bulk([
+            {"id": self.tasks[0].id, "status": "done", "sprint": self.sprint.id},
+            {"id": self.tasks[1].id, "priority": "high", "assigned_to_id": self.profile.id},
+            {"id": self.done.id, "status": "done"},
+        ])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([row["id"] for row in response.json()], sorted([self.tasks[0].id, self.tasks[1].id, self.done.id]))
+        first, second = Task.objects.get(pk=self.tasks[0].pk), Task.objects.get(pk=self.tasks[1].pk)
+        self.assertEqual((first.status, first.completed, first.sprint_id), ("done", True, self.sprint.id))
+        self.assertIsNotNone(first.completed_at)
+        self.assertEqual((second.priority, second.assigned_to_id, second.status), ("high", self.profile.id, "todo"))
+        # Only tasks that became done are reported, in one batch
+        events = AnalyticsRecord.objects.filter(action="task_completed")
+        self.assertEqual([event.details["task_id"] for event in events], [self.tasks[0].id])
+
+    def test_accepts_changes_envelope(self):
+        response = self.bulk({"changes": [{"id": self.tasks[0].id, "status": "review"}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.get(pk=self.tasks[0].pk).status, "review")
+        self.assertEqual(self.bulk([]).json(), [])
+
+    def test_foreign_or_missing_task_changes_nothing(self):
+        response = self.bulk([
+            {"id": self.tasks[0].id, "status": "done"},
+            {"id": self.foreign_task.id, "status": "done"},
+            {"id": 999999, "status": "done"},
+        ])
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["ids"], [self.foreign_task.id, 999999])
+        self.assertUnchanged()
+
+    def test_sprint_of_another_project_changes_nothing(self):
+        response = self.bulk([
+            {"id": self.tasks[0].id, "status": "done"},
+            {"id": self.tasks[1].id, "sprint": self.other_sprint.id},
+        ])
+        self.assertEqual(response.status_code, 403)
+        self.assertUnchanged()
+        self.assertFalse(AnalyticsRecord.objects.exists())
+
+    def test_rejects_invalid_input(self):
+        for changes in [
+            [{"id": self.tasks[0].id, "status": "done"}, {"id": self.tasks[0].id, "priority": "low"}],
+            [{"id": self.tasks[0].id, "assigned_to_id": 999999}],
+            [{"id": self.tasks[0].id, "status": "finished"}],
+        ]:
+            with self.subTest(changes=changes):
+                self.assertEqual(self.bulk(changes).status_code, 400)
+        self.assertUnchanged()
+
+
+class TaskCounterTests(APITestCase):
+    """TaskCounter rows follow every kind of task write and match a recount."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="P", owner=self.user)
+        self.other_project = Project.objects.create(name="Q", owner=self.user)
+        self.sprint = Sprint.objects.create(name="S1", project=self.project)
+        self.next_sprint = Sprint.objects.create(name="S2", project=self.project)
+        self.tasks = [
+            Task.objects.create(title=f"T{i}", project=self.project, sprint=self.sprint, status=status)
+            for i, status in enumerate(["todo", "progress", "done"])
+        ]
+        counters.rebuild([self.project.id, self.other_project.id])
+
+    def counts(self, **scope):
+        return TaskCounter.objects.get(**scope, **({} if "sprint" in scope else {"sprint": None}))
+
+    def assertNoDrift(self):
+        self.assertEqual(counters.rebuild([self.project.id, self.other_project.id], check_only=True), [])
+
+    def test_create(self):
+        self.client.post(
+            "/api/tasks/", {"title": "New", "project": self.project.id, "sprint": self.sprint.id}, format="json"
+        )
+        self.assertEqual(self.counts(project=self.project).total, 4)
+        self.assertEqual(self.counts(sprint=self.sprint).status_todo, 2)
+        self.assertNoDrift()
+
+    def test_update_status(self):
+        self.client.patch(f"/api/tasks/{self.tasks[0].id}/", {"status": "done"}, format="json")
+        row = self.counts(project=self.project)
+        self.assertEqual((row.status_todo, row.status_done), (0, 2))
+        self.assertNoDrift()
+
+    def test_move_between_sprints_and_projects(self):
+        self.client.patch(f"/api/tasks/{self.tasks[0].id}/", {"sprint": self.next_sprint.id}, format="json")
+        self.client.patch(
+            f"/api/tasks/{self.tasks[1].id}/", {"project": self.other_project.id, "sprint": None}, format="json"
+        )
+        self.assertEqual(self.counts(sprint=self.sprint).total, 1)
+        self.assertEqual(self.counts(sprint=self.next_sprint).total, 1)
+        self.assertEqual(self.counts(project=self.project).total, 2)
+        self.assertEqual(self.counts(project=self.other_project).status_progress, 1)
+        self.assertNoDrift()
+
+    def test_delete(self):
+        self.client.delete(f"/api/tasks/{self.tasks[2].id}/")
+        row = self.counts(project=self.project)
+        self.assertEqual((row.total, row.status_done), (2, 0))
+        self.assertNoDrift()
+
+    def test_bulk(self):
+        changes = [{"id": task.id, "status": "review", "sprint": self.next_sprint.id} for task in self.tasks[:2]]
+        self.client.post("/api/tasks/bulk/", changes, format="json")
+        self.assertEqual(self.counts(project=self.project).status_review, 2)
+        self.assertEqual(self.counts(sprint=self.next_sprint).total, 2)
+        self.assertNoDrift()
+
+    def test_sprint_delete(self):
+        self.client.delete(f"/api/sprints/{self.sprint.id}/")
+        self.assertFalse(TaskCounter.objects.filter(sprint_id=self.sprint.id).exists())
+        self.assertEqual(self.counts(project=self.project).total, 3)
+        self.assertNoDrift()
+
+    def test_write_rebuilds_missing_row(self):
+        TaskCounter.objects.filter(sprint=self.sprint).delete()
+        self.client.patch(f"/api/tasks/{self.tasks[0].id}/", {"status": "review"}, format="json")
+        row = self.counts(sprint=self.sprint)
+        self.assertEqual((row.total, row.status_todo, row.status_review), (3, 0, 1))
+        self.assertNoDrift()
+
+    def test_check_only_reports_drift_without_writing(self):
+        # Raw UPDATEs bypass apply_task_changes, like an import or a manual repair
+        Task.objects.filter(pk=self.tasks[0].pk).update(status="done")
+        drift = counters.rebuild([self.project.id], check_only=True)
+        self.assertIn((("project", self.project.id), "status_done", 1, 2), drift)
+        self.assertIn((("sprint", self.sprint.id), "status_todo", 1, 0), drift)
+        self.assertEqual(self.counts(project=self.project).status_done, 1)
+        self.assertEqual(counters.rebuild([self.project.id]), drift)
+        self.assertEqual(self.counts(project=self.project).status_done, 2)
+        self.assertNoDrift()
+
+    def test_stale_refresh_keeps_concurrent_write(self):
+        yesterday = timezone.now().date() - timedelta(days=1)
+        TaskCounter.objects.filter(project=self.project).update(overdue_as_of=yesterday)
+        stale = self.counts(project=self.project)
+        lock_projects = counters._lock_projects
+        waited = []
+
+        def lock_after_concurrent_write(project_ids):
+            # The refresh waits on the project lock while another transaction
+            # makes a task overdue and commits its increment
+            if not waited:
+                waited.append(set(project_ids))
+                task = self.tasks[0]
+                before = counters.snapshot(task)
+                task.due_date = yesterday
+                task.save()
+                counters.apply_task_change(before, counters.snapshot(task))
+            lock_projects(project_ids)
+
+        with mock.patch.object(counters, "_lock_projects", side_effect=lock_after_concurrent_write):
+            counters._refresh_stale([stale])
+        self.assertEqual(waited, [{self.project.id}])
+        self.assertEqual((stale.overdue, stale.total), (1, 3))
+        row = self.counts(project=self.project)
+        self.assertEqual((row.overdue, row.overdue_as_of), (1, timezone.now().date()))
+        self.assertNoDrift()
+
+    def test_stale_refresh_skips_rows_refreshed_meanwhile(self):
+        yesterday = timezone.now().date() - timedelta(days=1)
+        TaskCounter.objects.filter(project=self.project).update(overdue_as_of=yesterday)
+        stale = [self.counts(project=self.project), self.counts(sprint=self.sprint)]
+        # Another reader refreshed them first
+        TaskCounter.objects.filter(project=self.project).update(overdue_as_of=timezone.now().date(), overdue=7)
+        counters._refresh_stale(stale)
+        self.assertEqual([row.overdue for row in stale], [7, 7])
+        self.assertEqual(self.counts(project=self.project).overdue, 7)
+
+
+class TaskRowSerializerTests(TestCase):
+    """The list fast path renders the same bytes as TaskSerializer, for every projection."""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user("owner")
+        plain = UserProfile.objects.create(user=User.objects.create_user("plain"))
+        pictured = UserProfile.objects.create(user=User.objects.create_user("pictured"), avatar="avatars/me.png")
+        project = Project.objects.create(name="P", owner=owner)
+        sprint = Sprint.objects.create(name="S1", project=project)
+        now = timezone.now()
+        for assignee in (None, plain, pictured):
+            for dated in (False, True):
+                Task.objects.create(
+                    title=f"{assignee} {dated}", project=project, sprint=sprint if dated else None,
+                    status="done" if dated else "todo", assigned_to=assignee,
+                    due_date=now.date() if dated else None, completed_at=now if dated else None,
+                )
+
+    def render_both(self, fields):
+        get_profile_cache().clear()
+        context = {"request": Request(RequestFactory().get("/api/tasks/"))}
+        tasks = Task.objects.order_by("id")
+        full = TaskSerializer(tasks, many=True, fields=fields, context=context).data
+        fast = TaskRowSerializer(tasks.values(*TaskRowSerializer.columns(fields)), fields=fields, context=context).data
+        return JSONRenderer().render(full), JSONRenderer().render(fast)
+
+    def test_same_output(self):
+        for fields in [
+            None,
+            {"id", "title"},
+            {"id", "assigned_to"},
+            {"id", "due_date", "completed_at", "created_at", "updated_at"},
+            {"id", "status", "priority", "project", "sprint", "assigned_to"},
+        ]:
+            with self.subTest(fields=fields):
+                full, fast = self.render_both(fields)
+                self.assertEqual(fast, full)
+        # The fixture covers what the fast path special-cases
+        rows = json.loads(full)
+        self.assertIn(None, [row["assigned_to"] for row in rows])
+        self.assertTrue(any(row["assigned_to"] and row["assigned_to"]["avatar"] for row in rows))
+
+
+class FakeSocket:
+    """Drives `websocket_application` like an ASGI server would, for one connection."""
+
+    def __init__(self, path, token=""):
+        self.scope = {"type": "websocket", "path": path, "query_string": f"token={token}".encode()}
+        self.incoming = asyncio.Queue()
+        self.sent = asyncio.Queue()
+        self.incoming.put_nowait({"type": "websocket.connect"})
+        self.app = asyncio.ensure_future(websocket_application(self.scope, self.incoming.get, self.sent.put))
+
+    async def next(self):
+        return await asyncio.wait_for(self.sent.get(), 5)
+
+    async def close(self):
+        self.incoming.put_nowait({"type": "websocket.disconnect"})
+        await asyncio.wait_for(self.app, 5)
+
+
+class WebsocketTests(TestCase):
+    """Live board websockets: authorization at connect and on every event, and per-project fan-out."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        self.token = Token.objects.create(user=self.user)
+        self.project = Project.objects.create(name="P", owner=self.user)
+        self.other_project = Project.objects.create(name="Q", owner=self.user)
+        stranger = User.objects.create_user("stranger", password="pw-Secret-123")
+        self.foreign_project = Project.objects.create(name="Theirs", owner=stranger)
+
+    def connect(self, project_id, token=None):
+        return FakeSocket(f"/ws/projects/{project_id}/", self.token.key if token is None else token)
+
+    async def test_rejects_bad_token_foreign_project_and_unknown_path(self):
+        for socket, code in [
+            (self.connect(self.project.id, token=""), CLOSE_UNAUTHORIZED),
+            (self.connect(self.project.id, token="not-a-token"), CLOSE_UNAUTHORIZED),
+            (self.connect(self.foreign_project.id), CLOSE_UNAUTHORIZED),
+            (FakeSocket("/ws/elsewhere/", self.token.key), CLOSE_NOT_FOUND),
+        ]:
+            with self.subTest(path=socket.scope["path"]):
+                self.assertEqual(await socket.next(), {"type": "websocket.close", "code": code})
+                await asyncio.wait_for(socket.app, 5)
+
+    async def test_fans_out_to_the_project_subscribers_only(self):
+        sockets = [self.connect(self.project.id), self.connect(self.project.id), self.connect(self.other_project.id)]
+        for socket in sockets:
+            self.assertEqual(await socket.next(), {"type": "websocket.accept"})
+        event = {"type": "task.updated", "project": self.project.id, "task": {"id": 1}}
+        self.assertEqual(get_broker().publish(project_channel(self.project.id), event), 2)
+        for socket in sockets[:2]:
+            message = await socket.next()
+            self.assertEqual(json.loads(message["text"]), event)
+        self.assertTrue(sockets[2].sent.empty())
+        for socket in sockets:
+            await socket.close()
+        self.assertFalse(get_broker().has_subscribers(project_channel(self.project.id)))
+
+    async def test_revoked_token_closes_on_next_event(self):
+        socket = self.connect(self.project.id)
+        self.assertEqual(await socket.next(), {"type": "websocket.accept"})
+        await sync_to_async(self.token.delete)()
+        get_broker().publish(project_channel(self.project.id), {"type": "task.deleted", "task": {"id": 1}})
+        self.assertEqual(await socket.next(), {"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        await asyncio.wait_for(socket.app, 5)
+
+    async def test_project_handed_over_closes_on_next_event(self):
+        socket = self.connect(self.project.id)
+        self.assertEqual(await socket.next(), {"type": "websocket.accept"})
+        await Project.objects.filter(pk=self.project.pk).aupdate(owner=self.foreign_project.owner)
+        get_broker().publish(project_channel(self.project.id), {"type": "task.deleted", "task": {"id": 1}})
+        self.assertEqual(await socket.next(), {"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        await asyncio.wait_for(socket.app, 5)
+
+
+class ConditionalGetTests(APITestCase):
+    """ETag / If-None-Match on task and sprint lists and details."""
+
+    def setUp(self):
+        get_profile_cache().clear()
+        get_response_cache().clear()
+        self.user = User.objects.create_user("owner", password="pw-Secret-123")
+        self.profile = UserProfile.objects.create(user=self.user)
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name="P", owner=self.user)
+        self.sprint = Sprint.objects.create(name="S1", project=self.project)
+        self.task = Task.objects.create(title="T", project=self.project, sprint=self.sprint, assigned_to=self.profile)
+
+    def assertRevalidates(self, url, change):
+        """304 for the current ETag; 200 with a new ETag once `change()` has run."""
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response
+
+    def rename_task(self):
+        self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "Renamed"}, format="json")
+
+    def test_task_list(self):
+        self.assertRevalidates(f"/api/tasks/?project={self.project.id}", self.rename_task)
+
+    def test_task_detail(self):
+        self.assertRevalidates(f"/api/tasks/{self.task.id}/", self.rename_task)
+
+    def test_task_list_assignee_renamed(self):
+        def rename_assignee():
+            self.user.username = "renamed"
+            self.user.save()
+
+        response = self.assertRevalidates(f"/api/tasks/?project={self.project.id}", rename_assignee)
+        self.assertEqual(response.json()[0]["assigned_to"]["user"]["username"], "renamed")
+        self.assertRevalidates(f"/api/tasks/{self.task.id}/", rename_assignee)
+        self.assertRevalidates(f"/api/async/tasks/?project={self.project.id}", rename_assignee)
+
+    def test_sprint_list(self):
+        self.assertRevalidates("/api/sprints/", self.rename_task)
+
+    def test_sprint_detail(self):
+        def rename_sprint():
+            self.client.patch(f"/api/sprints/{self.sprint.id}/", {"name": "Renamed"}, format="json")
+
+        self.assertRevalidates(f"/api/sprints/{self.sprint.id}/", rename_sprint)
@@ -1,41 +1,121 @@
+import csv
+from functools import partial
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
 from django.utils import timezone
-from .models import Task, Project, Sprint
-from .serializers import TaskSerializer, ProjectSerializer
-from analytics.models import AnalyticsRecord
+from . import counters, importer, realtime, search, sync
+from .conditional import ConditionalGetMixin
+from .export import CSVRenderer, JSONLinesRenderer, stream_export, wants_gzip
+from .models import Task, Project, Sprint, TaskTombstone
+from .pagination import TaskCursorPagination, TaskSearchPagination
+from .response_cache import CachedResponseMixin
+from .serializers import (
+    TaskSerializer, ProjectSerializer, SprintSerializer, TaskBulkAssignSerializer, TaskBulkChangeSerializer,
+    TaskRowSerializer,
+)
+from analytics.events import record_event, record_events
+from users.profiles import profile_exists, profile_generation, profile_payloads
+
+
+EXPORT_COLUMNS = [
+    "id", "title", "description", "status", "priority", "due_date", "completed", "completed_at",
+    "created_at", "updated_at", "project", "sprint", "assigned_to", "assignee",
+]
+
+
+def _query_flag(request, name):
+    return request.query_params.get(name, "").lower() in ("1", "true", "yes")
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
+    """Writes need the requesting user to own the (task's or sprint's) project.
+
+    Compares ids only, so no related rows are fetched: viewsets already
+    restrict their querysets to the user's projects and `select_related`
+    the project for tasks and sprints.
+    """
+
     def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
         if isinstance(obj, Project):
-            return obj.owner == request.user or request.method in permissions.SAFE_METHODS
-        if isinstance(obj, Sprint):
-            return obj.project and obj.project.owner == request.user or request.method in permissions.SAFE_METHODS
-        if isinstance(obj, Task):
-            return obj.project and obj.project.owner == request.user or request.method in permissions.SAFE_METHODS
+            return obj.owner_id == request.user.id
+        if isinstance(obj, (Sprint, Task)):
+            return obj.project_id is not None and obj.project.owner_id == request.user.id
         return False
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
 
     def get_queryset(self):
         return Project.objects.filter(owner=self.request.user).order_by("-created_at")
 
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, partial(super().list, request, *args, **kwargs))
+
+    def cache_projects(self, request):
+        # Project rows only; their writes bump the owner's generation
+        return []
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = TaskCursorPagination
+
+    def get_requested_fields(self):
+        """Field names from `?fields=a,b,c` on list requests, or None for the full payload."""
+        raw = self.request.query_params.get("fields")
+        if not raw or self.action not in ("list", "changes"):
+            return None
+        requested = {name.strip() for name in raw.split(",") if name.strip()}
+        requested.add("id")
+        return requested
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        if self.action == "list":
+            # Rows are plain dicts from get_queryset(); see TaskRowSerializer
+            return TaskRowSerializer(args[0], fields=fields, context=self.get_serializer_context())
+        return super().get_serializer(*args, **kwargs)
 
     def get_queryset(self):
         # Only list tasks within a project owned by the user, optionally scoped to sprint
-        qs = Task.objects.select_related("project", "assigned_to__user", "sprint")
+        fields = self.get_requested_fields()
+        if self.action == "list":
+            # Read-only fast path: no model instances, no joins
+            qs = Task.objects.values(*TaskRowSerializer.columns(fields))
+        elif fields is None:
+            qs = Task.objects.select_related("project", "assigned_to__user", "sprint").defer("search_vector")
+        else:
+            # Load only the requested columns; project/sprint render as ids so no joins are needed
+            qs = Task.objects.only(*TaskRowSerializer.columns(fields))
+            if "assigned_to" in fields:
+                qs = qs.select_related("assigned_to__user")
+        return self.scope_queryset(qs)
+
+    def collection_version(self, queryset):
+        # Rows embed assignee profiles, which change without touching the tasks
+        return (*super().collection_version(queryset), profile_generation())
+
+    def object_version(self, instance):
+        return (*super().object_version(instance), profile_generation())
+
+    def scope_queryset(self, qs):
+        """Apply the `project` / `sprint` params and restrict to the user's projects."""
         project_id = self.request.query_params.get("project")
         sprint_id = self.request.query_params.get("sprint")
         if project_id:
@@ -48,45 +128,242 @@ class TaskViewSet(viewsets.ModelViewSet):
         # Require project to scope tasks and ensure visibility per-project
         project = serializer.validated_data.get("project")
         sprint = serializer.validated_data.get("sprint")
-        if not project or project.owner != self.request.user:
-            raise permissions.PermissionDenied("Invalid or unauthorized project.")
-        if sprint:
-            # Ensure sprint belongs to same project and owner
-            if sprint.project_id != project.id or sprint.project.owner_id != self.request.user.id:
-                raise permissions.PermissionDenied("Invalid sprint for this project.")
-        serializer.save()
+        if not project or project.owner_id != self.request.user.id:
+            raise PermissionDenied("Invalid or unauthorized project.")
+        # The sprint must belong to the same (already owner-checked) project
+        if sprint and sprint.project_id != project.id:
+            raise PermissionDenied("Invalid sprint for this project.")
+        task = serializer.save()
+        realtime.publish_task_event("created", task.project_id, lambda: TaskSerializer(task).data)
 
     def perform_update(self, serializer):
-        prev: Task = self.get_object()
+        prev: Task = serializer.instance
+        prev_project_id = prev.project_id
         # Validate sprint change if present
         sprint = serializer.validated_data.get("sprint")
         project = serializer.validated_data.get("project") or prev.project
-        if sprint:
-            if sprint.project_id != project.id or sprint.project.owner_id != self.request.user.id:
-                raise permissions.PermissionDenied("Invalid sprint for this project.")
+        # Moving a task is only allowed into another project the user owns
+        if project.owner_id != self.request.user.id:
+            raise PermissionDenied("Invalid or unauthorized project.")
+        if sprint and sprint.project_id != project.id:
+            raise PermissionDenied("Invalid sprint for this project.")
+        # TaskSerializer.update handles completion timestamps in the same UPDATE
         updated: Task = serializer.save()
-        # Handle completion tracking and timestamps
-        was_done = prev.status == "done" or prev.completed
-        is_done = updated.status == "done" or updated.completed
-        if is_done and not was_done:
-            # set completed_at if missing
-            if not updated.completed_at:
-                updated.completed_at = timezone.now()
-                updated.completed = True
-                updated.save(update_fields=["completed_at", "completed", "updated_at"])
-            # write analytics record
+        if prev_project_id != updated.project_id:
+            realtime.publish_task_event("deleted", prev_project_id, lambda: {"id": updated.id})
+        if serializer.just_completed:
+            # write analytics record (buffered when ANALYTICS_BUFFER is enabled)
+            record_event(
+                getattr(self.request.user, "userprofile", None),
+                "task_completed",
+                {
+                    "task_id": updated.id,
+                    "title": updated.title,
+                    "project_id": updated.project_id,
+                    "sprint_id": updated.sprint_id,
+                },
+            )
+        realtime.publish_task_event("updated", updated.project_id, lambda: TaskSerializer(updated).data)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            before = counters.snapshot(instance)
+            task_id, project_id = instance.id, instance.project_id
+            instance.delete()
+            counters.apply_task_change(before, None)
+            sync.record_removal(task_id, project_id, before.sprint_id)
+            realtime.publish_task_event("deleted", project_id, lambda: {"id": task_id})
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Apply many status/sprint/assignee/priority changes in one transaction.
+
+        Body: a list of changes (or {"changes": [...]}), each with a task `id`.
+        Ownership, sprints and assignees are validated with one query each.
+        """
+        payload = request.data.get("changes") if isinstance(request.data, dict) else request.data
+        serializer = TaskBulkChangeSerializer(data=payload, many=True)
+        serializer.is_valid(raise_exception=True)
+        changes = {c["id"]: c for c in serializer.validated_data}
+        if len(changes) != len(serializer.validated_data):
+            return Response({"detail": "Duplicate task ids"}, status=status.HTTP_400_BAD_REQUEST)
+        if not changes:
+            return Response([])
+
+        sprint_ids = {c["sprint"] for c in changes.values() if c.get("sprint") is not None}
+        sprint_projects = dict(
+            Sprint.objects.filter(id__in=sprint_ids, project__owner=request.user).values_list("id", "project_id")
+        )
+        if len(sprint_projects) != len(sprint_ids):
+            raise PermissionDenied("Invalid sprint for this project.")
+        assignee_ids = {c["assigned_to_id"] for c in changes.values() if c.get("assigned_to_id") is not None}
+        if len(profile_payloads(assignee_ids, request)) != len(assignee_ids):
+            return Response({"assigned_to_id": "Invalid user profile id"}, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        completed = []
+        with transaction.atomic():
+            tasks = list(Task.objects.select_for_update().filter(id__in=changes, project__owner=request.user))
+            if len(tasks) != len(changes):
+                missing = sorted(set(changes) - {t.id for t in tasks})
+                return Response({"detail": "Task not found", "ids": missing}, status=404)
+            before = {t.id: counters.snapshot(t) for t in tasks}
+            fields = {"updated_at"}
+            for task in tasks:
+                change = changes[task.id]
+                was_done = task.status == "done" or task.completed
+                if "sprint" in change:
+                    sprint_id = change["sprint"]
+                    if sprint_id is not None and sprint_projects[sprint_id] != task.project_id:
+                        raise PermissionDenied("Invalid sprint for this project.")
+                    task.sprint_id = sprint_id
+                    fields.add("sprint")
+                if "assigned_to_id" in change:
+                    task.assigned_to_id = change["assigned_to_id"]
+                    fields.add("assigned_to")
+                if "priority" in change:
+                    task.priority = change["priority"]
+                    fields.add("priority")
+                if "status" in change:
+                    task.status = change["status"]
+                    fields.add("status")
+                    if task.status == "done" and not was_done:
+                        task.mark_completed()
+                        fields.update(["completed", "completed_at"])
+                        completed.append(task)
+                task.updated_at = now
+            Task.objects.bulk_update(tasks, sorted(fields))
+            counters.apply_task_changes([(before[t.id], counters.snapshot(t)) for t in tasks])
+            sync.record_removals([
+                (t.id, t.project_id, before[t.id].sprint_id) for t in tasks if before[t.id].sprint_id != t.sprint_id
+            ])
+            record_events(
+                getattr(request.user, "userprofile", None),
+                "task_completed",
+                [
+                    {"task_id": t.id, "title": t.title, "project_id": t.project_id, "sprint_id": t.sprint_id}
+                    for t in completed
+                ],
+            )
+        updated = TaskSerializer(self.get_queryset().filter(id__in=changes).order_by("id"), many=True).data
+        for row in updated:
+            realtime.publish_task_event("updated", row["project"], lambda row=row: row)
+        return Response(updated)
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """Tasks changed since `?since=<watermark>` plus ids of removed tasks.
+
+        Accepts the same `project`, `sprint` and `fields` params as the list.
+        Without `since`, or when the watermark predates the tombstone
+        retention window, a full snapshot is returned with `reset: true`.
+        """
+        now = timezone.now()
+        tasks = self.get_queryset()
+        removed = TaskTombstone.objects.filter(project__owner=request.user)
+        project_id = request.query_params.get("project")
+        sprint_id = request.query_params.get("sprint")
+        if project_id:
+            removed = removed.filter(project_id=project_id)
+        if sprint_id:
+            # Tasks that left the sprint, whether deleted, moved or un-assigned
+            removed = removed.filter(sprint_id=sprint_id)
+
+        reset = True
+        since = request.query_params.get("since")
+        if since:
             try:
-                AnalyticsRecord.objects.create(
-                    user=getattr(self.request.user, "userprofile", None),
-                    action="task_completed",
-                    details={
-                        "task_id": updated.id,
-                        "title": updated.title,
-                        "project_id": updated.project_id,
-                    },
-                )
-            except Exception:
-                pass
+                since_at = sync.decode_watermark(since)
+            except ValueError:
+                return Response({"detail": "Invalid since watermark"}, status=status.HTTP_400_BAD_REQUEST)
+            if since_at >= now - sync.tombstone_retention():
+                reset = False
+                cutoff = since_at - sync.SYNC_OVERLAP
+                tasks = tasks.filter(updated_at__gte=cutoff)
+                removed = removed.filter(deleted_at__gte=cutoff)
+
+        upserted = self.get_serializer(tasks.order_by("id"), many=True).data
+        deleted = set() if reset else set(removed.values_list("task_id", flat=True))
+        # A task that moved back into scope is current, not deleted
+        deleted -= {row["id"] for row in upserted}
+        return Response({
+            "upserted": upserted,
+            "deleted": sorted(deleted),
+            "watermark": sync.encode_watermark(now),
+            "reset": reset,
+        })
+
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=[CSVRenderer, JSONLinesRenderer])
+    def export(self, request):
+        """Stream every matching task as CSV (`?format=csv`) or JSON Lines (`?format=jsonl`).
+
+        Takes the list's `project` / `sprint` filters; `?gzip=1` compresses
+        the download on the fly.
+        """
+        if not all(request.query_params.get(name, "0").isdigit() for name in ("project", "sprint")):
+            return Response({"detail": "project and sprint must be ids"}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = self.scope_queryset(Task.objects.annotate(assignee=F("assigned_to__user__username"))).order_by("id")
+        scope = "-".join(
+            f"{name}-{request.query_params[name]}" for name in ("project", "sprint") if request.query_params.get(name)
+        )
+        return stream_export(
+            tasks, EXPORT_COLUMNS, request.accepted_renderer.format,
+            filename="tasks" + (f"-{scope}" if scope else ""), gzip=wants_gzip(request), request=request,
+        )
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """Tasks matching `?q=`, best first, in pages of 25 (`page`, `page_size`).
+
+        Takes the list's `project` / `sprint` filters; see tasks.search for
+        the query syntax and ranking.
+        """
+        query = search.normalize(request.query_params.get("q"))
+        if not query:
+            return Response({"detail": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+        if not all(request.query_params.get(name, "0").isdigit() for name in ("project", "sprint")):
+            return Response({"detail": "project and sprint must be ids"}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = self.scope_queryset(Task.objects.select_related("assigned_to__user").defer("search_vector"))
+        paginator = TaskSearchPagination()
+        page = paginator.paginate_queryset(search.search_tasks(tasks, query), request, view=self)
+        serializer = TaskSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser, JSONParser])
+    def bulk_import(self, request):
+        """Import many tasks into `?project=<id>` (see tasks.importer).
+
+        Upload `file` (CSV, JSON or JSON Lines) as multipart, or post a JSON
+        list / {"tasks": [...]} for small batches. `?skip_invalid=1` imports
+        the valid rows even if others fail; `?dry_run=1` only validates.
+        """
+        project_id = request.query_params.get("project") or request.data.get("project")
+        if not str(project_id or "").isdigit():
+            return Response({"detail": "project is required"}, status=status.HTTP_400_BAD_REQUEST)
+        project = Project.objects.filter(id=project_id, owner=request.user).first()
+        if project is None:
+            return Response({"detail": "Project not found"}, status=404)
+
+        upload = request.FILES.get("file")
+        if upload is not None:
+            rows = importer.read_rows(upload.file, upload.name)
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            rows = request.data.get("tasks")
+            if not isinstance(rows, list):
+                return Response({"detail": "Send a file or a list of tasks"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = importer.import_tasks(
+                project, rows,
+                skip_invalid=_query_flag(request, "skip_invalid"), dry_run=_query_flag(request, "dry_run"),
+            )
+        except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+            return Response({"detail": f"Could not read the file: {exc}"}, status=status.HTTP_400_BAD_REQUEST)
+        body = result._asdict()
+        if result.created:
+            return Response(body, status=status.HTTP_201_CREATED)
+        return Response(body, status=status.HTTP_400_BAD_REQUEST if result.error_count else status.HTTP_200_OK)
 
     @action(detail=False, methods=["post"], url_path="assign")
     def assign(self, request):
@@ -96,72 +373,142 @@ class TaskViewSet(viewsets.ModelViewSet):
             task = Task.objects.get(id=task_id, project__owner=request.user)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found"}, status=404)
-        from users.models import UserProfile
         try:
-            assignee = UserProfile.objects.get(id=user_profile_id)
-        except UserProfile.DoesNotExist:
+            user_profile_id = int(user_profile_id)
+        except (TypeError, ValueError):
+            return Response({"detail": "User profile not found"}, status=404)
+        if not profile_exists(user_profile_id, request):
             return Response({"detail": "User profile not found"}, status=404)
-        task.assigned_to = assignee
-        task.save()
-        return Response(TaskSerializer(task).data)
+        # Reassigning touches nothing else, so don't rewrite every column
+        task.assigned_to_id = user_profile_id
+        task.save(update_fields=["assigned_to", "updated_at"])
+        data = TaskSerializer(task).data
+        realtime.publish_task_event("updated", task.project_id, lambda: data)
+        return Response(data)
+
+    @action(detail=False, methods=["post"], url_path="bulk-assign")
+    def bulk_assign(self, request):
+        """Assign many tasks to one profile with a single UPDATE.
+
+        Body: {"task_ids": [...], "user_profile_id": id}. Either every task
+        is reassigned or, if any is missing, none are.
+        """
+        serializer = TaskBulkAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        task_ids = set(serializer.validated_data["task_ids"])
+        user_profile_id = serializer.validated_data["user_profile_id"]
+        if not profile_exists(user_profile_id, request):
+            return Response({"detail": "User profile not found"}, status=404)
+        with transaction.atomic():
+            found = set(
+                Task.objects.select_for_update()
+                .filter(id__in=task_ids, project__owner=request.user)
+                .values_list("id", flat=True)
+            )
+            if found != task_ids:
+                return Response({"detail": "Task not found", "ids": sorted(task_ids - found)}, status=404)
+            Task.objects.filter(id__in=task_ids).update(assigned_to_id=user_profile_id, updated_at=timezone.now())
+        updated = TaskSerializer(Task.objects.filter(id__in=task_ids).order_by("id"), many=True).data
+        for row in updated:
+            realtime.publish_task_event("updated", row["project"], lambda row=row: row)
+        return Response(updated)
 
     @action(detail=False, methods=["get"], url_path="stats")
     def stats(self, request):
+        return self.cached_response(request, partial(self._stats, request))
+
+    def cache_projects(self, request):
+        # stats?project=<id> only depends on that project; not-owned ids 404 and aren't stored
+        project_id = request.query_params.get("project", "")
+        if self.action == "stats" and project_id.isdigit() and not request.query_params.get("sprint"):
+            return [int(project_id)]
+        return None
+
+    def _stats(self, request):
+        # Counts come from the denormalised TaskCounter rows, so this is O(1) in
+        # the number of tasks. `sprint` or `project` return one flat payload;
+        # otherwise every owned project (optionally narrowed by `projects=1,2,3`)
+        # is returned keyed by project id.
         project_id = request.query_params.get("project")
-        if not project_id:
-            return Response({"detail": "project query param required"}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            project = Project.objects.get(id=project_id, owner=request.user)
-        except Project.DoesNotExist:
-            return Response({"detail": "Project not found"}, status=404)
-        qs = project.tasks.all()
-        total = qs.count()
-        completed = qs.filter(status="done").count()
-        in_progress = qs.filter(status__in=["progress", "review"]).count()
-        progress = int(round((completed / total) * 100)) if total else 0
-        # Team members count: default 4 as provided
-        team_members = 4
-        return Response({
-            "total": total,
-            "completed": completed,
-            "in_progress": in_progress,
-            "progress": progress,
-            "team_members": team_members,
-        })
+        sprint_id = request.query_params.get("sprint")
+        if sprint_id:
+            try:
+                sprint = Sprint.objects.get(id=sprint_id, project__owner=request.user)
+            except Sprint.DoesNotExist:
+                return Response({"detail": "Sprint not found"}, status=404)
+            return Response(counters.counts_payload(counters.sprint_counter(sprint)))
+        owned = Project.objects.filter(owner=request.user)
+        if project_id:
+            ids = list(owned.filter(id=project_id).values_list("id", flat=True))
+            if not ids:
+                return Response({"detail": "Project not found"}, status=404)
+            return Response(counters.counts_payload(counters.project_counters(ids)[ids[0]]))
+        project_ids = request.query_params.get("projects")
+        if project_ids:
+            try:
+                requested = [int(pk) for pk in project_ids.split(",") if pk.strip()]
+            except ValueError:
+                return Response({"detail": "projects must be a comma-separated list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+            owned = owned.filter(id__in=requested)
+        ids = list(owned.order_by("-created_at").values_list("id", flat=True))
+        rows = counters.project_counters(ids)
+        return Response({str(pid): counters.counts_payload(rows[pid]) for pid in ids})
 
 
-class SprintViewSet(viewsets.ModelViewSet):
+class SprintViewSet(CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Sprint.objects.all()
+    serializer_class = SprintSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
 
-    class SerializerClassPlaceholder:
-        pass
-
-    def get_serializer_class(self):
-        # lightweight inline serializer to avoid creating a new file
-        from rest_framework import serializers
-
-        class SprintSerializer(serializers.ModelSerializer):
-            class Meta:
-                model = Sprint
-                fields = [
-                    "id",
-                    "name",
-                    "goal",
-                    "status",
-                    "start_date",
-                    "end_date",
-                    "project",
-                    "created_at",
-                ]
-
-        return SprintSerializer
-
     def get_queryset(self):
-        return Sprint.objects.filter(project__owner=self.request.user).select_related("project").order_by("-created_at")
+        # Per-status counts come from one GROUP BY over the join, not a task query per sprint
+        return (
+            Sprint.objects.filter(project__owner=self.request.user)
+            .select_related("project")
+            .annotate(**counters.sprint_annotations())
+            .order_by("-created_at")
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, partial(super().list, request, *args, **kwargs))
+
+    def collection_version(self, queryset):
+        # The embedded counts change with the sprints' tasks, not just the sprints
+        summary = queryset.aggregate(
+            latest=Max("updated_at"), count=Count("pk"),
+            tasks=Sum("tasks_total"), tasks_latest=Max("tasks_updated_at"),
+        )
+        return (
+            summary["count"], summary["latest"] and summary["latest"].isoformat(),
+            summary["tasks"], summary["tasks_latest"] and summary["tasks_latest"].isoformat(),
+        )
+
+    def object_version(self, instance):
+        tasks_latest = instance.tasks_updated_at
+        return (
+            *super().object_version(instance),
+            instance.tasks_total, tasks_latest and tasks_latest.isoformat(),
+        )
 
     def perform_create(self, serializer):
         project = serializer.validated_data.get("project")
-        if not project or project.owner != self.request.user:
-            raise permissions.PermissionDenied("Invalid or unauthorized project.")
-        serializer.save()
\ No newline at end of file
+        if not project or project.owner_id != self.request.user.id:
+            raise PermissionDenied("Invalid or unauthorized project.")
+        serializer.save()
+
+    def perform_update(self, serializer):
+        project = serializer.validated_data.get("project")
+        if project and project.owner_id != self.request.user.id:
+            raise PermissionDenied("Invalid or unauthorized project.")
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # Deleting a sprint un-assigns its tasks with a raw SET NULL; touch
+            # them first so conditional GETs and delta sync see the change, and
+            # leave tombstones for clients syncing just this sprint
+            sync.record_removals(
+                (task_id, instance.project_id, instance.id) for task_id in instance.tasks.values_list("id", flat=True)
+            )
+            instance.tasks.update(updated_at=timezone.now())
+            instance.delete()
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""ASGI websocket endpoint streaming live task events for one project.
+
+Route: ``/ws/projects/<project_id>/?token=<auth token>``. The token is the
+same one used for the REST API (browsers can't set headers on websockets).
+Each connection receives JSON messages of the form
+``{"type": "task.created" | "task.updated" | "task.deleted", "project": id, "task": {...}}``.
+A connection that falls too far behind is closed with code 4429; the client
+should reconnect and catch up through ``/api/tasks/changes/``.
+
+The token and project ownership are checked again before every event is
+sent, so a connection stops receiving as soon as its token is revoked
+(logout, deactivation) or the project changes hands: it is closed with
+code 4401 instead. The token lookup goes through the same cache as the
+REST API, which drops revoked tokens straight away.
+"""
+
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+
+from users.authentication import CachedTokenAuthentication
+
+from .models import Project
+from .realtime import get_broker, project_channel
+
+PATH_RE = re.compile(r"^/ws/projects/(?P<project_id>\d+)/?$")
+
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+CLOSE_LAGGING = 4429
+
+
+@sync_to_async
+def _authorize(token, project_id):
+    """The user for `token` if they own the project, else None."""
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(token)
+    except AuthenticationFailed:
+        return None
+    if not Project.objects.filter(id=project_id, owner_id=user.id).exists():
+        return None
+    return user
+
+
+async def websocket_application(scope, receive, send):
+    match = PATH_RE.match(scope["path"])
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    if match is None:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+    project_id = int(match["project_id"])
+    token = parse_qs(scope.get("query_string", b"").decode()).get("token", [""])[0]
+    if not token or await _authorize(token, project_id) is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    broker = get_broker()
+    sub = broker.subscribe(project_channel(project_id))
+    await send({"type": "websocket.accept"})
+
+    async def watch_client():
+        # Clients only listen; the only message we care about is the disconnect
+        while (await receive())["type"] != "websocket.disconnect":
+            pass
+
+    client = asyncio.ensure_future(watch_client())
+    lagging = asyncio.ensure_future(sub.overflowed.wait())
+    try:
+        while True:
+            event = asyncio.ensure_future(sub.get())
+            done, _ = await asyncio.wait({event, client, lagging}, return_when=asyncio.FIRST_COMPLETED)
+            if event in done:
+                if await _authorize(token, project_id) is None:
+                    await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+                    return
+                await send({"type": "websocket.send", "text": json.dumps(event.result(), default=str)})
+                continue
+            event.cancel()
+            if lagging in done:
+                await send({"type": "websocket.close", "code": CLOSE_LAGGING})
+            return
+    finally:
+        broker.unsubscribe(sub)
+        client.cancel()
+        lagging.cancel()
@@ -0,0 +1,125 @@
+"""Token authentication with cached token -> user resolution.
+
+Resolved tokens are kept in a bounded, TTL-based LRU local to the process,
+or in a Django cache (`settings.TOKEN_AUTH_CACHE["CACHE_ALIAS"]`) when
+several processes must share invalidations. Entries are dropped as soon as
+a token is deleted (logout) or its user changes in any way that matters
+for authorization (deactivation, staff/superuser flags, groups and
+permissions), and again when that write commits; a login, which only
+writes `last_login`, keeps them.
+"""
+
+import copy
+import hashlib
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .cache import TTLCache
+from .models import User
+
+DEFAULTS = {
+    "MAX_SIZE": 10000,
+    "TTL": 300,
+    "CACHE_ALIAS": None,
+}
+
+
+class TokenCache(TTLCache):
+    """Token key -> (user, token)."""
+
+    key_prefix = "authtoken"
+
+    def _shared_key(self, key):
+        # Never put raw token keys into a shared cache
+        return f"{self.key_prefix}:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                conf = {**DEFAULTS, **getattr(settings, "TOKEN_AUTH_CACHE", {})}
+                _token_cache = TokenCache(conf["MAX_SIZE"], conf["TTL"], conf["CACHE_ALIAS"])
+    return _token_cache
+
+
+def invalidate_tokens(*keys):
+    """Evict now, and again once the current transaction commits.
+
+    A request arriving before the commit still reads the committed user and
+    would otherwise re-cache it for a whole TTL.
+    """
+    if keys:
+        cache = get_token_cache()
+        cache.delete(*keys)
+        transaction.on_commit(partial(cache.delete, *keys))
+
+
+def invalidate_user_tokens(user):
+    invalidate_tokens(*Token.objects.filter(user=user).values_list("key", flat=True))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for TokenAuthentication that skips the Token/User lookup on cache hits."""
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cached = cache.get(key)
+        if cached is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user__userprofile").get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+            cached = (token.user, token)
+            cache.set(key, cached)
+        # Hand each request its own instances so per-request mutations don't leak
+        user, token = (copy.copy(obj) for obj in cached)
+        token.user = user
+        return (user, token)
+
+
+@receiver(post_delete, sender=Token)
+def _token_deleted(sender, instance, **kwargs):
+    invalidate_tokens(instance.key)
+
+
+@receiver(post_save, sender=User)
+def _user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Requests must see deactivation or lost privileges straight away
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    invalidate_user_tokens(instance)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def _user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_user_tokens(instance)
+    elif pk_set:
+        # Changed from the group/permission side: every affected user
+        invalidate_tokens(*Token.objects.filter(user_id__in=pk_set).values_list("key", flat=True))
+    else:
+        # group.user_set.clear(): affected users aren't listed
+        cache = get_token_cache()
+        cache.clear()
+        transaction.on_commit(cache.clear)
@@ -0,0 +1,75 @@
+"""A small TTL + LRU cache for per-process lookups.
+
+Entries live in a bounded, thread-safe LRU local to the process, or in a
+Django cache (`cache_alias`) when several processes must share
+invalidations. Subclasses pick the key namespace used in the shared cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+
+class TTLCache:
+    """Thread-safe LRU of key -> value, with per-entry expiry."""
+
+    key_prefix = "ttlcache"
+
+    def __init__(self, max_size=10000, ttl=300, cache_alias=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache_alias = cache_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared_key(self, key):
+        return f"{self.key_prefix}:{key}"
+
+    def get(self, key):
+        if self.cache_alias:
+            return caches[self.cache_alias].get(self._shared_key(key))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key, value):
+        if self.cache_alias:
+            caches[self.cache_alias].set(self._shared_key(key), value, self.ttl)
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        if self.cache_alias:
+            caches[self.cache_alias].delete_many([self._shared_key(k) for k in keys])
+            return
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        if self.cache_alias:
+            # Shared entries expire on their own TTL; only local state can be wiped wholesale
+            return
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,147 @@
+"""Cached user profile payloads for task assignees.
+
+Assigning a task only needs to know that a profile exists, and rendering a
+task only needs the profile's serialized form, so both are answered from a
+per-request memo, then a short-TTL cache shared by the process (or a Django
+cache alias, `settings.PROFILE_CACHE["CACHE_ALIAS"]`), and only then the
+database. Entries are dropped when the profile or its user changes, and
+again when that write commits.
+
+Payloads are cached without request context; `avatar` is made absolute per
+request exactly as `ImageField.to_representation` would.
+
+`profile_generation()` changes whenever any profile payload does, so ETags
+of responses that embed profiles (task lists and details) can include it.
+"""
+
+import secrets
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import TTLCache
+from .models import User, UserProfile
+from .serializers import UserProfileSerializer, UserSerializer
+
+DEFAULTS = {
+    "MAX_SIZE": 10000,
+    "TTL": 60,
+    "CACHE_ALIAS": None,
+}
+
+
+class ProfileCache(TTLCache):
+    """Profile id -> serialized profile (relative avatar URL), with per-entry expiry."""
+
+    key_prefix = "userprofile"
+
+
+_profile_cache = None
+_profile_cache_lock = threading.Lock()
+
+
+def get_profile_cache():
+    global _profile_cache
+    if _profile_cache is None:
+        with _profile_cache_lock:
+            if _profile_cache is None:
+                conf = {**DEFAULTS, **getattr(settings, "PROFILE_CACHE", {})}
+                _profile_cache = ProfileCache(conf["MAX_SIZE"], conf["TTL"], conf["CACHE_ALIAS"])
+    return _profile_cache
+
+
+GENERATION_KEY = "userprofile:generation"
+
+
+def _generation_cache():
+    return caches[get_profile_cache().cache_alias or "default"]
+
+
+def profile_generation():
+    """Token that changes whenever any cached profile payload is invalidated."""
+    cache = _generation_cache()
+    token = cache.get(GENERATION_KEY)
+    if token is None:
+        token = secrets.token_hex(8)
+        # Another request may have minted one first; use the winner's
+        if not cache.add(GENERATION_KEY, token, timeout=None):
+            token = cache.get(GENERATION_KEY) or token
+    return token
+
+
+def _evict_profiles(ids):
+    get_profile_cache().delete(*ids)
+    _generation_cache().delete(GENERATION_KEY)
+
+
+def _profiles_changed(*ids):
+    # Evict now, and again once the write commits: a request in between still
+    # reads the committed row and would re-cache it for a whole TTL
+    _evict_profiles(ids)
+    transaction.on_commit(partial(_evict_profiles, ids))
+
+
+def _localize(payload, request):
+    payload = dict(payload)
+    if request is not None and payload.get("avatar") is not None:
+        payload["avatar"] = request.build_absolute_uri(payload["avatar"])
+    return payload
+
+
+def _request_memo(request):
+    # Keep the memo on the Django request so every DRF wrapper of it shares one
+    if request is None:
+        return {}
+    request = getattr(request, "_request", request)
+    memo = getattr(request, "_profile_payloads", None)
+    if memo is None:
+        memo = request._profile_payloads = {}
+    return memo
+
+
+def remember_profile(profile, request=None):
+    """Serialize an already loaded profile (with its user), cache it and return the payload."""
+    memo = _request_memo(request)
+    if profile.id not in memo:
+        payload = UserProfileSerializer(profile).data
+        get_profile_cache().set(profile.id, dict(payload))
+        memo[profile.id] = _localize(payload, request)
+    return memo[profile.id]
+
+
+def profile_payloads(ids, request=None):
+    """{profile_id: payload} for the ids that exist; at most one query for uncached ids."""
+    ids = {pk for pk in ids if pk is not None}
+    memo = _request_memo(request)
+    missing = ids - set(memo)
+    if missing:
+        for pk, payload in get_profile_cache().get_many(missing).items():
+            memo[pk] = _localize(payload, request)
+        missing -= set(memo)
+    if missing:
+        for profile in UserProfile.objects.select_related("user").filter(id__in=missing):
+            remember_profile(profile, request)
+    return {pk: memo[pk] for pk in ids if pk in memo}
+
+
+def profile_exists(pk, request=None):
+    return pk in profile_payloads([pk], request)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def _profile_changed(sender, instance, **kwargs):
+    _profiles_changed(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def _user_changed(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only touch last_login, which profile payloads don't include
+    if created or (update_fields is not None and not set(update_fields) & set(UserSerializer.Meta.fields)):
+        return
+    _profiles_changed(*UserProfile.objects.filter(user_id=instance.pk).values_list("id", flat=True))
@@ -1,3 +1,80 @@
+from django.contrib.auth.models import Group
 from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .authentication import get_token_cache
+from .models import User, UserProfile
+from .profiles import get_profile_cache, profile_generation
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """Cached tokens stop working, or lose privileges, as soon as the user changes."""
+
+    def setUp(self):
+        get_token_cache().clear()
+        self.user = User.objects.create_user("staff", password="pw-Secret-123", is_staff=True)
+        UserProfile.objects.create(user=self.user)
+        UserProfile.objects.create(user=User.objects.create_user("other"))
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        # Warm the cache
+        self.assertEqual(self.client.get("/api/users/").status_code, 200)
+        self.assertIsNotNone(get_token_cache().get(self.token.key))
+
+    def test_logout_revokes_cached_token(self):
+        self.assertEqual(self.client.post("/api/auth/logout/").status_code, 204)
+        self.assertEqual(self.client.get("/api/users/").status_code, 401)
+
+    def test_deactivation_revokes_cached_token(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/users/").status_code, 401)
+
+    def test_deactivation_evicts_again_on_commit(self):
+        cached = get_token_cache().get(self.token.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            # A request before the commit still sees the active user and re-caches it
+            get_token_cache().set(self.token.key, cached)
+        self.assertIsNone(get_token_cache().get(self.token.key))
+        self.assertEqual(self.client.get("/api/users/").status_code, 401)
+
+    def test_losing_staff_takes_effect_immediately(self):
+        self.assertEqual(len(self.client.get("/api/users/").json()), 2)
+        self.user.is_staff = False
+        self.user.save(update_fields=["is_staff"])
+        self.assertEqual(len(self.client.get("/api/users/").json()), 1)
+
+    def test_group_change_evicts_cached_token(self):
+        group = Group.objects.create(name="team")
+        self.user.groups.add(group)
+        self.assertIsNone(get_token_cache().get(self.token.key))
+        self.client.get("/api/users/")
+        group.user_set.remove(self.user)
+        self.assertIsNone(get_token_cache().get(self.token.key))
+
+    def test_login_keeps_cached_token(self):
+        self.user.save(update_fields=["last_login"])
+        self.assertIsNotNone(get_token_cache().get(self.token.key))
+
+
+class ProfileCacheTests(TestCase):
+    """Cached profile payloads and the profile generation change with the profile's user."""
+
+    def setUp(self):
+        get_profile_cache().clear()
+        self.profile = UserProfile.objects.create(user=User.objects.create_user("member"))
+
+    def test_change_evicts_again_on_commit(self):
+        generation = profile_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.user.first_name = "Renamed"
+            self.profile.user.save()
+            # A request before the commit re-caches the committed payload
+            get_profile_cache().set(self.profile.pk, {"id": self.profile.pk})
+            before_commit = profile_generation()
+        self.assertIsNone(get_profile_cache().get(self.profile.pk))
+        self.assertNotEqual(profile_generation(), generation)
+        self.assertNotEqual(profile_generation(), before_commit)
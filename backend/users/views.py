@@ -48,5 +48,6 @@ class AuthViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=["post"], url_path="logout", permission_classes=[permissions.IsAuthenticated])
     def logout(self, request):
+        # Deleting the tokens evicts them from the auth cache (post_delete signal)
         Token.objects.filter(user=request.user).delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -3,8 +3,11 @@ import { Button } from "@/components/ui/button";
 import { LineChart, Line, XAxis, YAxis, ResponsiveContainer, PieChart, Pie, Cell } from "recharts";
 import { TrendingUp, Clock, Lightbulb, Play } from "lucide-react";
 import mascotImage from "@/assets/taskflow-mascot.png";
+import { useEffect, useState } from "react";
 
-const taskCompletionData = [
+const API = 'http://127.0.0.1:8000/api';
+
+const sampleCompletionData = [
   { day: 'Mon', completed: 4 },
   { day: 'Tue', completed: 6 },
   { day: 'Wed', completed: 8 },
@@ -31,6 +34,35 @@ const focusTips = [
 
 export function AnalyticsPanel({ onStartFocusSession }) {
   const currentTip = focusTips[Math.floor(Math.random() * focusTips.length)];
+  const [taskCompletionData, setTaskCompletionData] = useState(sampleCompletionData);
+
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!token) return;
+    let cancelled = false;
+    const fetchSeries = async () => {
+      try {
+        // Last 7 days of completions, pre-bucketed by the server's rollups
+        const start = new Date(Date.now() - 6 * 24 * 60 * 60 * 1000).toISOString().slice(0, 10);
+        const res = await fetch(`${API}/analytics/series/?granularity=day&start=${start}`, {
+          headers: { Authorization: `Token ${token}` },
+        });
+        if (!res.ok) return;
+        const body = await res.json();
+        const data = body.series.map(({ bucket, count }) => ({
+          day: new Date(bucket).toLocaleDateString(undefined, { weekday: 'short', timeZone: 'UTC' }),
+          completed: count,
+        }));
+        if (!cancelled) setTaskCompletionData(data);
+      } catch {
+        // keep the sample data
+      }
+    };
+    fetchSeries();
+    return () => { cancelled = true; };
+  }, []);
+
+  const completedThisWeek = taskCompletionData.reduce((sum, d) => sum + d.completed, 0);
 
   return (
     <div className="w-80 h-screen p-6 border-l border-border/50 overflow-y-auto gradient-warm">
@@ -63,7 +95,7 @@ export function AnalyticsPanel({ onStartFocusSession }) {
             </ResponsiveContainer>
           </div>
           <p className="text-xs text-muted-foreground">
-            <span className="text-primary font-semibold">37 tasks</span> completed this week
+            <span className="text-primary font-semibold">{completedThisWeek} tasks</span> completed this week
           </p>
         </Card>
 
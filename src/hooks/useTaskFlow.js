@@ -2,6 +2,7 @@ import { useEffect, useState } from 'react';
 import { toast } from '@/hooks/use-toast';
 
 const API = 'http://127.0.0.1:8000/api';
+const WS = 'ws://127.0.0.1:8000/ws';
 
 // Dummy seed data (restored)
 const DUMMY_PROJECTS = [
@@ -185,6 +186,25 @@ export function useTaskFlow() {
   useEffect(() => { fetchProjects(); }, [token]);
   useEffect(() => { if (activeProject?.id && !String(activeProject.id).startsWith('tmp-')) fetchTasks(activeProject.id); }, [activeProject, token]);
   useEffect(() => { if (activeSprint?.id && Number.isFinite(Number(activeSprint.id))) fetchTasksBySprint(activeSprint.id); }, [activeSprint, token]);
+
+  // Live board updates pushed by the backend (ASGI only); falls back silently to fetch-on-change
+  useEffect(() => {
+    const projectId = activeProject?.id;
+    if (!token || !projectId || String(projectId).startsWith('tmp-') || typeof WebSocket === 'undefined') return;
+    const socket = new WebSocket(`${WS}/projects/${projectId}/?token=${encodeURIComponent(token)}`);
+    socket.onmessage = (event) => {
+      let message;
+      try { message = JSON.parse(event.data); } catch { return; }
+      const incoming = message.task;
+      if (!incoming?.id) return;
+      setTasks(prev => {
+        if (message.type === 'task.deleted') return prev.filter(t => t.id !== incoming.id);
+        const task = normalizeTask(incoming);
+        return prev.some(t => t.id === task.id) ? prev.map(t => (t.id === task.id ? task : t)) : [...prev, task];
+      });
+    };
+    return () => socket.close();
+  }, [activeProject?.id, token]);
   
   // Fetch per-project totals (backlog + sprint) from backend stats; fallback to local counts
   useEffect(() => {
@@ -192,12 +212,11 @@ export function useTaskFlow() {
     const loadStats = async () => {
       if (!projects.length) { setProjectTaskTotals({}); return; }
       try {
-        const entries = await Promise.all(projects.map(async (p) => {
-          const res = await fetch(`${API}/tasks/stats/?project=${p.id}`, { headers: { ...authHeaders } });
-          if (!res.ok) throw new Error('stats failed');
-          const data = await res.json();
-          return [p.id, data.total || 0];
-        }));
+        // One batched request returns stats for every owned project keyed by id
+        const res = await fetch(`${API}/tasks/stats/`, { headers: { ...authHeaders } });
+        if (!res.ok) throw new Error('stats failed');
+        const data = await res.json();
+        const entries = projects.map(p => [p.id, data[p.id]?.total || 0]);
         if (!cancelled) setProjectTaskTotals(Object.fromEntries(entries));
       } catch (_) {
         const entries = projects.map(p => [p.id, tasks.filter(t => t.project === p.id).length]);
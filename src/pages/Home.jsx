@@ -41,18 +41,20 @@ const Home = () => {
       const headers = {};
       const token = localStorage.getItem('token');
       if (token) headers['Authorization'] = `Token ${token}`;
-      const entries = await Promise.all(projects.map(async (p) => {
-        try {
-          const res = await fetch(`${API}/tasks/stats/?project=${p.id}`, { headers });
-          if (!res.ok) throw new Error('stats failed');
-          const data = await res.json();
-          return [p.id, data.total || 0];
-        } catch {
-          // fallback: count by project from local state (project-only tasks)
-          const localCount = tasks.filter(t => t.project === p.id).length;
-          return [p.id, localCount];
-        }
-      }));
+      let stats = null;
+      try {
+        // Single batched request: stats for every owned project keyed by id
+        const res = await fetch(`${API}/tasks/stats/`, { headers });
+        if (!res.ok) throw new Error('stats failed');
+        stats = await res.json();
+      } catch {
+        stats = null;
+      }
+      const entries = projects.map((p) => {
+        if (stats && stats[p.id]) return [p.id, stats[p.id].total || 0];
+        // fallback: count by project from local state (project-only tasks)
+        return [p.id, tasks.filter(t => t.project === p.id).length];
+      });
       if (!cancelled) setProjectCounts(Object.fromEntries(entries));
     };
     if (projects.length) fetchCounts();